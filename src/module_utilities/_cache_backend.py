@@ -0,0 +1,539 @@
+"""Persistent storage backends for :func:`module_utilities.cached.meth`."""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import pickle  # ruff:ignore[suspicious-pickle-import]
+import sqlite3
+import sys
+import threading
+from contextlib import suppress
+from multiprocessing import resource_tracker, shared_memory, util
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any, Protocol, cast, runtime_checkable
+
+if TYPE_CHECKING:
+    from ._typing_compat import Self
+
+
+# Errors from loading or storing values in a backend, which fall back to
+# computing (or caching in memory only).  Pickling raises any of the builtin
+# errors, depending on the object.
+BACKEND_ERRORS: tuple[type[Exception], ...] = (
+    sqlite3.Error,
+    pickle.PickleError,
+    OSError,
+    EOFError,
+    TypeError,
+    ValueError,
+    AttributeError,
+    ImportError,
+)
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """
+    Protocol for persistent storage of cached method results.
+
+    Keys are hex digests from :func:`~module_utilities._cache_keys.stable_hash`.
+    ``__getitem__`` should raise :class:`KeyError` for missing keys.  Any
+    mapping from :class:`str` to values (for example, a :class:`dict`)
+    satisfies the protocol.  Errors loading or storing values (for example,
+    :class:`sqlite3.Error`, or values which cannot be pickled) are treated as
+    misses, so that results are computed and only cached in memory.
+
+    Backends may also define ``release(key)``, which is called if computing
+    a value fails after a lookup of ``key`` missed.  Backends which claim
+    keys on lookup (see :class:`SharedMemoryBackend`) release the claim.
+    """
+
+    def __getitem__(self, key: str, /) -> Any: ...
+
+    def __setitem__(self, key: str, value: Any, /) -> None: ...
+
+    def __delitem__(self, key: str, /) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class SQLiteBackend:
+    """
+    Store pickled values in an SQLite database.
+
+    Safe to share between threads and processes, including forked worker
+    processes.  Each thread (and process) opens its own connection.  The
+    database uses write-ahead logging, so readers do not block writers.
+
+    Values are loaded with :mod:`pickle`, so only use databases from trusted
+    sources.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Path to database file.  Created if it does not exist.
+    table : str, default="cache"
+        Name of table in database.
+    timeout : float, default=30.0
+        Seconds to wait for a lock held by another connection.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as d:
+    ...     with SQLiteBackend(f"{d}/cache.sqlite") as backend:
+    ...         backend["a"] = [1, 2]
+    ...         print(backend["a"], len(backend))
+    [1, 2] 1
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        table: str = "cache",
+        timeout: float = 30.0,
+    ) -> None:
+        if not table.isidentifier():
+            msg = f"table must be a valid identifier.  Passed {table=}"
+            raise ValueError(msg)
+        self.path = os.fspath(path)
+        self.table = table
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[tuple[int, sqlite3.Connection]] = []
+        _ = self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        # autocommit.  Each statement is its own transaction.
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        _ = conn.execute("PRAGMA journal_mode=WAL")
+        _ = conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value BLOB)"
+        )
+        pid = os.getpid()
+        self._local.conn, self._local.pid = conn, pid
+        with self._lock:
+            self._connections.append((pid, conn))
+        return conn
+
+    def __getitem__(self, key: str) -> Any:
+        row = (
+            self
+            ._connection()
+            .execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,))  # ruff:ignore[hardcoded-sql-expression]
+            .fetchone()
+        )
+        if row is None:
+            raise KeyError(key)
+        return pickle.loads(row[0])  # ruff:ignore[suspicious-pickle-usage]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        _ = self._connection().execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",  # ruff:ignore[hardcoded-sql-expression]
+            (key, data),
+        )
+
+    def __delitem__(self, key: str) -> None:
+        cursor = self._connection().execute(
+            f"DELETE FROM {self.table} WHERE key = ?",  # ruff:ignore[hardcoded-sql-expression]
+            (key,),
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __len__(self) -> int:
+        (count,) = (
+            self
+            ._connection()
+            .execute(f"SELECT COUNT(*) FROM {self.table}")  # ruff:ignore[hardcoded-sql-expression]
+            .fetchone()
+        )
+        return int(count)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        _ = self._connection().execute(f"DELETE FROM {self.table}")  # ruff:ignore[hardcoded-sql-expression]
+
+    def close(self) -> None:
+        """Close all connections opened by this process."""
+        pid = os.getpid()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        self._local.conn = None
+        for conn_pid, conn in connections:
+            # connections inherited from a parent process must not be used.
+            if conn_pid == pid:
+                conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r}, table={self.table!r})"
+
+
+# * Shared memory --------------------------------------------------------------
+
+# segments are zero filled on creation, so state is 0 until written.
+_READY = 1
+# marker for values which are not buffer backed, so computed by each process.
+_SKIP = 2
+# result of lookups of values not yet published.
+_PENDING = object()
+# state byte, then 8 byte metadata length, then metadata.  Data is aligned.
+_META_START = 16
+_ALIGN = 64
+
+
+class _Segment(shared_memory.SharedMemory):
+    """
+    Shared memory segment which may outlive :meth:`close`.
+
+    Arrays viewing the segment keep the memory map open (``close`` raises
+    :class:`BufferError`) until they are released.
+    """
+
+    def __del__(self) -> None:
+        # AttributeError if ``__init__`` failed.
+        with suppress(BufferError, OSError, AttributeError):
+            self.close()
+
+
+if sys.version_info >= (3, 13):
+
+    def _attach(name: str) -> _Segment:
+        return _Segment(name=name, track=False)
+
+else:  # pragma: no cover
+
+    def _attach(name: str) -> _Segment:
+        shm = _Segment(name=name)
+        if os.name == "posix":
+            # Only the creating process should unlink the segment.
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+def _untrack(shm: _Segment) -> None:
+    # unlinked by another process, so the resource tracker should not.
+    if os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+
+
+def _unlink(shm: _Segment) -> None:
+    """Unlink segment created by this process."""
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        _untrack(shm)
+
+
+def _abandoned(name: str) -> bool:
+    """Whether claim ``name`` was left by a process which has exited."""
+    try:
+        shm = _attach(name)
+    except FileNotFoundError:
+        return False
+    pid = int.from_bytes(cast("memoryview", shm.buf)[:8], "little")
+    shm.close()
+    # On Windows, segments are removed with the last process using them.
+    if not pid or os.name != "posix":
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+def _to_buffer(value: Any) -> tuple[dict[str, Any], memoryview] | None:
+    """Metadata and data for buffer backed ``value``, or `None`."""
+    if isinstance(value, (bytes, bytearray)):
+        return {"kind": type(value).__name__}, memoryview(value)
+
+    numpy = sys.modules.get("numpy")
+    if (
+        numpy is not None
+        and isinstance(value, numpy.ndarray)
+        and not value.dtype.hasobject
+    ):
+        data = numpy.ascontiguousarray(value)
+        meta = {"kind": "ndarray", "dtype": data.dtype, "shape": data.shape}
+        return meta, memoryview(data.reshape(-1).view(numpy.uint8))
+    return None
+
+
+def _from_buffer(meta: dict[str, Any], buf: memoryview, offset: int) -> Any:
+    nbytes = meta["nbytes"]
+    if meta["kind"] == "ndarray":
+        import numpy as np
+
+        # NumPy does not hold an export of ``buf``, so view through ctypes,
+        # which keeps the memory map open while the array is alive.
+        raw = (ctypes.c_char * nbytes).from_buffer(buf, offset)
+        out = np.frombuffer(raw, dtype=meta["dtype"]).reshape(meta["shape"])
+        out.flags.writeable = False
+        return out
+
+    data = buf[offset : offset + nbytes]
+    return bytes(data) if meta["kind"] == "bytes" else bytearray(data)
+
+
+def _close_segments(segments: dict[str, _Segment], created: set[str], pid: int) -> None:
+    if os.getpid() != pid:  # pragma: no cover
+        return
+    for name, shm in segments.items():
+        # segments with values still in use stay mapped until released.
+        with suppress(BufferError):
+            shm.close()
+        if name in created:
+            _unlink(shm)
+    segments.clear()
+    created.clear()
+
+
+class SharedMemoryBackend:
+    """
+    Share NumPy array and bytes results between processes on one machine.
+
+    Results are published to :mod:`multiprocessing.shared_memory` segments
+    named from the cache key, so other processes (for example, workers of a
+    :class:`~concurrent.futures.ProcessPoolExecutor`) attach to the segment
+    instead of recomputing the result.  NumPy arrays are returned as
+    read-only, zero-copy views of the segment.  Bytes are copied.  Other
+    values are not shared, so are computed by each process and only cached
+    in the instance ``_cache``.
+
+    A lookup which misses claims the key, until a value is stored or
+    :meth:`release` is called.  Lookups of a key claimed by another process
+    wait up to ``timeout`` seconds for its value, so that a result is
+    computed once.  Claims of processes which have exited are taken over.
+
+    The process which creates a segment owns it, and unlinks it when the
+    backend is closed or garbage collected, or the process exits (including
+    worker processes of :mod:`multiprocessing`).  Only the creating process
+    registers segments with the :mod:`multiprocessing` resource tracker,
+    which unlinks segments of processes killed before they could.  Processes
+    already attached to an unlinked segment, and arrays viewing it, remain
+    valid, while later lookups recompute and republish the value.
+
+    Parameters
+    ----------
+    prefix : str, default="mu_"
+        Prefix of segment names.  Processes share segments with the same
+        prefix and cache key.
+    timeout : float, default=60.0
+        Seconds to wait for a value being computed by another process,
+        before computing it anyway.
+
+    Examples
+    --------
+    >>> import os
+    >>> import numpy as np
+    >>> with SharedMemoryBackend(prefix=f"mu_doc_{os.getpid()}_") as backend:
+    ...     backend["a" * 32] = np.arange(3)
+    ...     print(backend["a" * 32])
+    [0 1 2]
+    """
+
+    def __init__(self, prefix: str = "mu_", *, timeout: float = 60.0) -> None:
+        self.prefix = prefix
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        # open segments of this process, and names of those created by it.
+        self._segments: dict[str, _Segment] = {}
+        self._created: set[str] = set()
+        # run on exit of forked workers, which skip ``atexit`` callbacks.
+        self._finalizer = util.Finalize(
+            self,
+            _close_segments,
+            args=(self._segments, self._created, self._pid),
+            exitpriority=0,
+        )
+
+    def _check_pid(self) -> None:
+        # segments opened by a parent process are not ours to close.
+        if self._pid != os.getpid():  # pragma: no cover
+            self._finalizer.cancel()
+            self._reset()
+
+    def _name(self, key: str) -> str:
+        # short names, as some platforms limit name length to 31 characters.
+        return f"{self.prefix}{key[:24]}"
+
+    def _claim_name(self, key: str) -> str:
+        # keys are hex digests, so cannot contain "_".
+        return f"{self.prefix}_{key[:23]}"
+
+    def _open(self, key: str) -> _Segment:
+        self._check_pid()
+        name = self._name(key)
+        with self._lock:
+            if (shm := self._segments.get(name)) is not None:
+                return shm
+            try:
+                shm = _attach(name)
+            except FileNotFoundError:
+                raise KeyError(key) from None
+            self._segments[name] = shm
+            return shm
+
+    def _load(self, key: str) -> Any:
+        """Published value, or :data:`_PENDING` if not (yet) published."""
+        try:
+            buf = cast("memoryview", self._open(key).buf)
+        except KeyError:
+            return _PENDING
+        if buf[0] == _SKIP:
+            raise KeyError(key)
+        if buf[0] != _READY:
+            # still being written by another process.
+            return _PENDING
+        meta_end = _META_START + int.from_bytes(buf[8:_META_START], "little")
+        meta = pickle.loads(buf[_META_START:meta_end])  # ruff:ignore[suspicious-pickle-usage]
+        return _from_buffer(meta, buf, meta["offset"])
+
+    def _claim(self, key: str) -> bool:
+        """Claim computing the value of ``key``.  `False` if claimed elsewhere."""
+        name = self._claim_name(key)
+        try:
+            shm = _Segment(name=name, create=True, size=8)
+        except FileExistsError:
+            # Claims of this process are not waited on, as a thread could
+            # otherwise wait on itself.
+            if name in self._created:
+                return True
+            if not _abandoned(name):
+                return False
+            with suppress(FileNotFoundError):
+                _attach(name).unlink()
+            return self._claim(key)
+        cast("memoryview", shm.buf)[:8] = os.getpid().to_bytes(8, "little")
+        with self._lock:
+            self._segments[name] = shm
+            self._created.add(name)
+        return True
+
+    def release(self, key: str) -> None:
+        """Release claim on ``key`` taken by a lookup which missed, if any."""
+        name = self._claim_name(key)
+        with self._lock:
+            if name not in self._created:
+                return
+            self._created.discard(name)
+            shm = self._segments.pop(name)
+        shm.close()
+        _unlink(shm)
+
+    def __getitem__(self, key: str) -> Any:
+        self._check_pid()
+        deadline = monotonic() + self.timeout
+        delay = 0.001
+        while (value := self._load(key)) is _PENDING:
+            if self._claim(key):
+                # published between load and claim?
+                if (value := self._load(key)) is _PENDING:
+                    raise KeyError(key)
+                self.release(key)
+                return value
+            if monotonic() > deadline:
+                raise KeyError(key)
+            sleep(delay)
+            delay = min(2 * delay, 0.05)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        try:
+            self._publish(key, value)
+        finally:
+            self.release(key)
+
+    def _publish(self, key: str, value: Any) -> None:
+        if (encoded := _to_buffer(value)) is None:
+            meta_bytes, offset, data = b"", _META_START, memoryview(b"")
+        else:
+            meta, data = encoded
+            meta["nbytes"] = data.nbytes
+            meta["offset"] = 0
+            # offset depends on length of metadata, so encode twice.
+            meta_bytes = pickle.dumps(meta)
+            offset = -(-(_META_START + len(meta_bytes) + 16) // _ALIGN) * _ALIGN
+            meta["offset"] = offset
+            meta_bytes = pickle.dumps(meta)
+
+        self._check_pid()
+        name = self._name(key)
+        try:
+            shm = _Segment(name=name, create=True, size=offset + data.nbytes)
+        except FileExistsError:
+            # published by another process.
+            return
+
+        buf = cast("memoryview", shm.buf)
+        buf[8:_META_START] = len(meta_bytes).to_bytes(8, "little")
+        buf[_META_START : _META_START + len(meta_bytes)] = meta_bytes
+        buf[offset : offset + data.nbytes] = data
+        buf[0] = _READY if encoded is not None else _SKIP
+        with self._lock:
+            if (old := self._segments.pop(name, None)) is not None:  # pragma: no cover
+                with suppress(BufferError):
+                    old.close()
+            self._segments[name] = shm
+            self._created.add(name)
+
+    def __delitem__(self, key: str) -> None:
+        shm = self._open(key)
+        name = self._name(key)
+        with self._lock:
+            _ = self._segments.pop(name, None)
+            created = name in self._created
+            self._created.discard(name)
+        with suppress(BufferError):
+            shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            if created:
+                _untrack(shm)
+            raise KeyError(key) from None
+
+    def clear(self) -> None:
+        """Close all segments, and unlink those (and claims) of this process."""
+        self._check_pid()
+        with self._lock:
+            _close_segments(self._segments, self._created, self._pid)
+
+    def close(self) -> None:
+        """Alias to :meth:`clear`."""
+        self.clear()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(prefix={self.prefix!r})"
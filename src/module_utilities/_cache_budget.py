@@ -0,0 +1,245 @@
+"""Process wide memory budget for values cached by :mod:`~module_utilities.cached`."""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import weakref
+from functools import partial
+from typing import TYPE_CHECKING, NamedTuple
+
+from ._cache_store import parse_bytes, sizeof
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Hashable
+    from typing import Any
+
+
+class BudgetInfo(NamedTuple):
+    """Usage of a :class:`MemoryBudget`."""
+
+    nbytes: int
+    """Budget in bytes."""
+    used: int
+    """Approximate bytes currently held by tracked entries."""
+    entries: int
+    """Number of tracked entries."""
+    evictions: int
+    """Number of entries evicted to stay within the budget."""
+
+
+# Marks an entry stored directly in ``_cache`` (properties and methods without
+# arguments), rather than in a per method store.
+NO_SUBKEY: Any = object()
+
+
+def _drop(instance: Any, key: str, subkey: Hashable) -> None:
+    """Remove an entry from ``instance._cache``, if present."""
+    cache = getattr(instance, "_cache", None)
+    if cache is None:
+        return
+    if subkey is NO_SUBKEY:
+        _ = cache.pop(key, None)
+    elif (store := cache.get(key)) is not None:
+        _ = store.pop(subkey, None)
+
+
+class MemoryBudget:
+    """
+    Process wide budget for cached values.
+
+    Tracks the approximate size of values stored in ``_cache`` of instances
+    by cached properties and methods.  Instances are referenced weakly, and
+    their entries are forgotten when they are garbage collected.  Once the
+    total exceeds ``nbytes``, entries are evicted from the ``_cache`` of
+    whichever instances hold them.  A value larger than ``nbytes`` is removed
+    from the cache (counted as an eviction) without evicting other entries.
+
+    Sizes are only recorded when a value is computed.  Entries evicted from
+    bounded per method stores, or removed by
+    :func:`~module_utilities.cached.clear` and ``cache_clear``, are
+    forgotten.  Entries removed by other means (for example, deleted from
+    ``_cache`` directly) are still counted until evicted, so usage is an
+    upper bound.  Instances which
+    cannot be weakly referenced are not tracked.
+
+    Parameters
+    ----------
+    nbytes : int or str
+        Budget in bytes, or a string like ``"2GB"``.
+    policy : {"lru", "cost"}
+        Evict the least recently used entry (``"lru"``), or the entry with
+        the least compute time per byte, aged as for
+        :class:`~module_utilities.cached.GreedyDualSizeCache` (``"cost"``).
+    sizer : callable, optional
+        Function returning the size of a value in bytes.  Defaults to
+        :func:`~module_utilities.cached.sizeof`.
+    """
+
+    def __init__(
+        self,
+        nbytes: int | str,
+        policy: str = "lru",
+        sizer: Callable[[Any], int] | None = None,
+    ) -> None:
+        self.nbytes = parse_bytes(nbytes)
+        if self.nbytes <= 0:
+            msg = f"nbytes must be positive.  Passed {nbytes=}"
+            raise ValueError(msg)
+        if policy not in {"lru", "cost"}:
+            msg = f"policy must be one of 'lru' or 'cost'.  Passed {policy=}"
+            raise ValueError(msg)
+        self.policy = policy
+        self.sizer = sizeof if sizer is None else sizer
+
+        self._lock = threading.RLock()
+        self._used = 0
+        self._evictions = 0
+        # (id(instance), key, subkey) -> [size, credit, priority, counter]
+        self._entries: dict[tuple[int, str, Hashable], list[Any]] = {}
+        # (priority, counter, entry key).  Priorities may be stale (too low).
+        self._heap: list[tuple[float, int, tuple[int, str, Hashable]]] = []
+        self._counter = 0
+        # Clock for lru, inflation value for cost.
+        self._clock = 0.0
+        # id(instance) -> (weak reference, keys of entries)
+        self._instances: dict[int, tuple[weakref.ref[Any], set[Any]]] = {}
+
+    def info(self) -> BudgetInfo:
+        """Current usage."""
+        return BudgetInfo(self.nbytes, self._used, len(self._entries), self._evictions)
+
+    def _priority(self, credit: float) -> float:
+        if self.policy == "lru":
+            self._clock += 1.0
+            return self._clock
+        return self._clock + credit
+
+    def _push(self, key: tuple[int, str, Hashable], record: list[Any]) -> None:
+        self._counter += 1
+        record[3] = self._counter
+        heapq.heappush(self._heap, (record[2], self._counter, key))
+
+    def add(
+        self, instance: Any, key: str, subkey: Hashable, value: Any, cost: float
+    ) -> None:
+        """Record ``value`` stored for ``instance``, evicting if over budget."""
+        size = self.sizer(value)
+        ident = id(instance)
+        entry_key = (ident, key, subkey)
+        with self._lock:
+            if size > self.nbytes:
+                # Too large to keep.  Other entries are not evicted for it.
+                if entry_key in self._entries:
+                    self._remove(entry_key)
+                self._evictions += 1
+                _drop(instance, key, subkey)
+                return
+
+            if (tracked := self._instances.get(ident)) is None:
+                try:
+                    ref = weakref.ref(instance, partial(self._forget, ident))
+                except TypeError:
+                    return
+                tracked = self._instances[ident] = (ref, set())
+
+            if (old := self._entries.get(entry_key)) is not None:
+                self._used -= old[0]
+            credit = cost / max(size, 1)
+            record = [size, credit, self._priority(credit), 0]
+            self._entries[entry_key] = record
+            tracked[1].add(entry_key)
+            self._used += size
+            self._push(entry_key, record)
+
+            while self._used > self.nbytes and self._entries:
+                self._evict()
+            if len(self._heap) > 2 * len(self._entries) + 8:
+                self._compact()
+
+    def forget(self, ident: int, key: str, subkey: Hashable) -> None:
+        """
+        Forget an entry already removed from its cache.
+
+        ``ident`` is the ``id`` of the instance holding the entry.
+        """
+        with self._lock:
+            if (ident, key, subkey) in self._entries:
+                self._remove((ident, key, subkey))
+
+    def forget_instance(self, ident: int, keys: Container[str] | None = None) -> None:
+        """
+        Forget entries of an instance already removed from its cache.
+
+        ``ident`` is the ``id`` of the instance.  If passed, only entries of
+        cache keys in ``keys`` are forgotten.
+        """
+        with self._lock:
+            if (tracked := self._instances.get(ident)) is None:
+                return
+            for entry_key in [k for k in tracked[1] if keys is None or k[1] in keys]:
+                self._remove(entry_key)
+
+    def touch(self, instance: Any, key: str, subkey: Hashable) -> None:
+        """Mark entry as used.  Does not lock, so recency is approximate."""
+        record = self._entries.get((id(instance), key, subkey))
+        if record is not None:
+            # Priority only increases, so the heap is updated lazily.
+            record[2] = self._priority(record[1])
+
+    def _evict(self) -> None:
+        while True:
+            priority, counter, entry_key = heapq.heappop(self._heap)
+            record = self._entries.get(entry_key)
+            if record is None or record[3] != counter:
+                continue
+            if record[2] > priority:
+                self._push(entry_key, record)
+                continue
+            break
+
+        if self.policy == "cost":
+            self._clock = priority
+        ident, key, subkey = entry_key
+        self._remove(entry_key)
+        self._evictions += 1
+
+        ref, _ = self._instances[ident]
+        _drop(ref(), key, subkey)
+
+    def _remove(self, entry_key: tuple[int, str, Hashable]) -> None:
+        record = self._entries.pop(entry_key)
+        self._used -= record[0]
+        self._instances[entry_key[0]][1].discard(entry_key)
+
+    def _compact(self) -> None:
+        heap: list[tuple[float, int, tuple[int, str, Hashable]]] = []
+        for entry_key, record in self._entries.items():
+            self._counter += 1
+            record[3] = self._counter
+            heap.append((record[2], self._counter, entry_key))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def _forget(self, ident: int, ref: weakref.ref[Any]) -> None:
+        with self._lock:
+            tracked = self._instances.get(ident)
+            if tracked is None or tracked[0] is not ref:
+                return
+            for entry_key in list(tracked[1]):
+                self._remove(entry_key)
+            del self._instances[ident]
+
+    def clear(self) -> None:
+        """Forget all tracked entries.  Cached values are not removed."""
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+            self._instances.clear()
+            self._used = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(nbytes={self.nbytes}, policy={self.policy!r}, "
+            f"used={self._used})"
+        )
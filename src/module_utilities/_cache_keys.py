@@ -0,0 +1,412 @@
+"""Argument key construction for :func:`module_utilities.cached.meth`."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import singledispatch
+from hashlib import blake2b
+from inspect import Parameter
+from keyword import iskeyword
+from typing import TYPE_CHECKING, Any, TypeVar, overload
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Mapping
+    from inspect import Signature
+    from typing import TypeAlias
+
+    ArgKey: TypeAlias = tuple[tuple[Any, ...], frozenset[tuple[str, Any]]]
+    KeyBuilder: TypeAlias = Callable[..., ArgKey]
+
+
+T = TypeVar("T")
+
+_EMPTY: frozenset[Any] = frozenset()
+
+
+def bind_key_builder(sig: Signature) -> KeyBuilder:
+    """
+    Key builder using :meth:`inspect.Signature.bind`.
+
+    The key is ``(args, frozenset(kwargs.items()))`` from the bound arguments
+    (with defaults applied), excluding the first (``self``) argument.
+    """
+    bind = sig.bind
+
+    def make_key(*args: Any, **kwargs: Any) -> ArgKey:
+        params = bind(*args, **kwargs)
+        params.apply_defaults()
+        return (params.args[1:], frozenset(params.kwargs.items()))
+
+    return make_key
+
+
+def _key_source(params: list[Parameter], namespace: dict[str, Any]) -> tuple[str, str]:
+    """
+    Source for the parameter list and returned key of a key builder.
+
+    Default values are added to ``namespace``.
+    """
+    signature_parts: list[str] = []
+    positional: list[str] = []
+    keyword: list[str] = []
+    var_keyword: str | None = None
+    has_var_positional = False
+
+    for i, p in enumerate(params):
+        if p.kind == Parameter.KEYWORD_ONLY and not has_var_positional and not keyword:
+            signature_parts.append("*")
+
+        if p.kind == Parameter.VAR_POSITIONAL:
+            has_var_positional = True
+            signature_parts.append(f"*{p.name}")
+            positional.append(f"*{p.name}")
+        elif p.kind == Parameter.VAR_KEYWORD:
+            var_keyword = p.name
+            signature_parts.append(f"**{p.name}")
+        else:
+            part = p.name
+            if p.default is not Parameter.empty:
+                namespace[f"__d{i}"] = p.default
+                part = f"{part}=__d{i}"
+            signature_parts.append(part)
+
+            if p.kind == Parameter.KEYWORD_ONLY:
+                keyword.append(f"{p.name!r}: {p.name}")
+            elif i > 0:
+                positional.append(p.name)
+
+        if p.kind == Parameter.POSITIONAL_ONLY and (
+            i + 1 == len(params) or params[i + 1].kind != Parameter.POSITIONAL_ONLY
+        ):
+            signature_parts.append("/")
+
+    args_src = f"({', '.join(positional)},)" if positional else "()"
+    if var_keyword is not None:
+        keyword.append(f"**{var_keyword}")
+    kwargs_src = (
+        f"__frozenset({{{', '.join(keyword)}}}.items())" if keyword else "__empty"
+    )
+    return ", ".join(signature_parts), f"({args_src}, {kwargs_src})"
+
+
+def key_builder(sig: Signature, name: str = "make_key") -> KeyBuilder:
+    """
+    Create a specialized key builder for signature ``sig``.
+
+    The returned function accepts the same arguments as ``sig`` and returns
+    the same key as :func:`bind_key_builder`, but is generated as plain python
+    source, so that calling it costs about the same as calling a function with
+    this signature.  Falls back to :func:`bind_key_builder` for signatures
+    which cannot be expressed this way.
+
+    Parameters
+    ----------
+    sig : Signature
+        Signature of the cached method, including ``self``.
+    name : str
+        Name of the generated function.  Used in error messages for bad
+        arguments, so should be the name of the cached method.
+
+    Examples
+    --------
+    >>> from inspect import signature
+    >>> def meth(self, x, y=2, *, z=3): ...
+    >>> make_key = key_builder(signature(meth))
+    >>> make_key(None, 1)
+    ((1, 2), frozenset({('z', 3)}))
+    >>> make_key(None, y=3, x=1) == bind_key_builder(signature(meth))(None, y=3, x=1)
+    True
+    """
+    params = list(sig.parameters.values())
+    namespace: dict[str, Any] = {"__empty": _EMPTY, "__frozenset": frozenset}
+
+    if not name.isidentifier() or iskeyword(name):
+        name = "make_key"
+
+    if (
+        not params
+        or params[0].kind
+        not in {Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD}
+        or any(p.name in namespace or p.name.startswith("__") for p in params)
+    ):
+        return bind_key_builder(sig)
+
+    signature_src, key_src = _key_source(params, namespace)
+    src = f"def {name}({signature_src}):\n    return {key_src}\n"
+    exec(src, namespace)  # pylint: disable=exec-used  # ruff:ignore[exec-builtin]
+    return namespace[name]  # type: ignore[no-any-return]
+
+
+# * Key adapters ---------------------------------------------------------------
+
+
+def _digest(data: memoryview) -> bytes:
+    return blake2b(data, digest_size=16).digest()
+
+
+class _FrozenTag:
+    """Type of :data:`_FROZEN`."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<frozen>"
+
+    def __reduce__(self) -> str:
+        # Copies and unpickled keys keep the same tag.
+        return "_FROZEN"
+
+
+# First item of keys from :func:`freeze`, so that they cannot equal tuples
+# passed by users.
+_FROZEN = _FrozenTag()
+
+
+@singledispatch
+def freeze(value: Any) -> Any:
+    """
+    Hashable equivalent of ``value`` for use in cache keys.
+
+    Hashable values are returned unchanged.  Lists, dicts, sets and
+    bytearrays are converted recursively, tagged with a private marker and
+    their type so that, for example, ``[1, 2]``, ``(1, 2)`` and
+    ``(list, (1, 2))`` give different keys.  NumPy arrays and other objects
+    supporting the buffer protocol are keyed by type, format, shape, and a
+    digest of their data.  Objects with no adapter are returned unchanged.
+    Register adapters for other types with :func:`register_key_adapter`.
+
+    Examples
+    --------
+    >>> freeze([1, {"a": 2}])
+    (<frozen>, <class 'list'>, (1, (<frozen>, <class 'dict'>, frozenset({('a', 2)}))))
+    """
+    if type(value).__hash__ is not None:
+        return value
+
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return _freeze_ndarray(value, numpy)
+
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return value
+    with view:
+        if not view.c_contiguous:
+            return value
+        return (_FROZEN, type(value), view.format, view.shape, _digest(view.cast("B")))
+
+
+def _freeze_ndarray(value: Any, numpy: Any) -> Any:
+    if value.dtype.hasobject:
+        return value
+    # zero copy for contiguous arrays.
+    data = numpy.ascontiguousarray(value).reshape(-1).view(numpy.uint8)
+    return (_FROZEN, type(value), value.dtype, value.shape, _digest(memoryview(data)))
+
+
+@freeze.register(tuple)
+def _(value: tuple[Any, ...]) -> Any:
+    return tuple(freeze(v) for v in value)
+
+
+@freeze.register(list)
+def _(value: list[Any]) -> Any:
+    return (_FROZEN, type(value), tuple(freeze(v) for v in value))
+
+
+@freeze.register(set)
+def _(value: set[Any]) -> Any:
+    return (_FROZEN, type(value), frozenset(freeze(v) for v in value))
+
+
+@freeze.register(dict)
+def _(value: dict[Any, Any]) -> Any:
+    return (_FROZEN, type(value), frozenset((k, freeze(v)) for k, v in value.items()))
+
+
+@freeze.register(bytearray)
+def _(value: bytearray) -> Any:
+    return (_FROZEN, type(value), bytes(value))
+
+
+@overload
+def register_key_adapter(
+    cls: type[T], func: None = None
+) -> Callable[[Callable[[T], Hashable]], Callable[[T], Hashable]]: ...
+
+
+@overload
+def register_key_adapter(
+    cls: type[T], func: Callable[[T], Hashable]
+) -> Callable[[T], Hashable]: ...
+
+
+def register_key_adapter(
+    cls: type[T], func: Callable[[T], Hashable] | None = None
+) -> (
+    Callable[[T], Hashable]
+    | Callable[[Callable[[T], Hashable]], Callable[[T], Hashable]]
+):
+    """
+    Register function to convert unhashable arguments of type ``cls`` to keys.
+
+    Adapters are only used when a cached method is called with arguments
+    which cannot be hashed.  Adapters apply to subclasses of ``cls``, and
+    can be used as a decorator.
+
+    Parameters
+    ----------
+    cls : type
+        Type of argument.
+    func : callable, optional
+        Function ``func(value) -> key`` returning a hashable key.  The key
+        should include ``type(value)`` or similar, so it does not collide with
+        keys from other types.
+
+    Examples
+    --------
+    >>> class Point:
+    ...     __hash__ = None
+    ...
+    ...     def __init__(self, x, y):
+    ...         self.x, self.y = x, y
+    >>> _ = register_key_adapter(Point, lambda p: (Point, p.x, p.y))
+    >>> freeze(Point(1, 2)) == (Point, 1, 2)
+    True
+    """
+    if func is None:
+        return lambda f: register_key_adapter(cls, f)
+    return freeze.register(cls, func)
+
+
+def adapted_key(
+    make_key: Callable[..., Hashable],
+    self: Any,
+    args: tuple[Any, ...],
+    kwargs: Mapping[str, Any],
+) -> Hashable | None:
+    """
+    Key from arguments converted with :func:`freeze`.
+
+    Returns `None` if the key is still not hashable.
+    """
+    key = make_key(
+        self, *(freeze(v) for v in args), **{k: freeze(v) for k, v in kwargs.items()}
+    )
+    try:
+        _ = hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+# * Stable hashes --------------------------------------------------------------
+
+
+def _frame(tag: bytes, payload: bytes) -> bytes:
+    return tag + len(payload).to_bytes(8, "little") + payload
+
+
+@singledispatch
+def _encode(value: Any) -> bytes:
+    frozen = freeze(value)
+    if frozen is not value:
+        # buffers, and types with a key adapter.
+        return _encode(frozen)
+
+    if is_dataclass(value):
+        # by field, as nested sets would pickle in hash seed dependent order.
+        return _frame(
+            b"c",
+            _encode(type(value))
+            + b"".join(_encode(getattr(value, f.name)) for f in fields(value)),
+        )
+
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(value, (numpy.dtype, numpy.generic)):
+        return _frame(b"n", f"{type(value).__qualname__}:{value!r}".encode())
+
+    msg = (
+        f"Cannot compute a stable hash of {type(value).__qualname__} objects.  "
+        "Register a key adapter with `register_key_adapter`."
+    )
+    raise TypeError(msg)
+
+
+@_encode.register(type)
+def _(value: type) -> bytes:
+    return _frame(b"y", f"{value.__module__}:{value.__qualname__}".encode())
+
+
+@_encode.register(Enum)
+def _(value: Enum) -> bytes:
+    return _frame(b"e", _encode(type(value)) + value.name.encode())
+
+
+@_encode.register(type(None))
+@_encode.register(bool)
+@_encode.register(int)
+@_encode.register(float)
+@_encode.register(complex)
+@_encode.register(str)
+def _(value: Any) -> bytes:
+    return _frame(b"s", f"{type(value).__qualname__}:{value!r}".encode())
+
+
+@_encode.register(bytes)
+def _(value: bytes) -> bytes:
+    return _frame(b"b", value)
+
+
+@_encode.register(_FrozenTag)
+def _(value: _FrozenTag) -> bytes:  # ruff:ignore[unused-function-argument]
+    return _frame(b"z", b"")
+
+
+@_encode.register(tuple)
+@_encode.register(list)
+def _(value: tuple[Any, ...] | list[Any]) -> bytes:
+    tag = b"t" if isinstance(value, tuple) else b"l"
+    return _frame(tag, b"".join(_encode(v) for v in value))
+
+
+@_encode.register(frozenset)
+@_encode.register(set)
+def _(value: frozenset[Any] | set[Any]) -> bytes:
+    # sort encoded items, as iteration order depends on hash seed.
+    return _frame(b"f", b"".join(sorted(_encode(v) for v in value)))
+
+
+@_encode.register(dict)
+def _(value: dict[Any, Any]) -> bytes:
+    items = sorted(_encode(k) + _encode(v) for k, v in value.items())
+    return _frame(b"d", b"".join(items))
+
+
+def stable_hash(value: Any) -> str:
+    """
+    Hash of ``value`` which is the same across processes and restarts.
+
+    Unlike :func:`hash`, does not depend on ``PYTHONHASHSEED``.  Builtin
+    scalars, strings, bytes, containers of these, dataclasses, and NumPy
+    arrays and scalars are encoded by value, with sets and dicts in sorted
+    order.  Types and enum members are encoded by qualified name.  Objects
+    with a key adapter (see :func:`register_key_adapter`) are encoded by
+    their adapted key.  Any other object raises :class:`TypeError`, as there
+    is no encoding of it which is stable across processes.
+
+    Examples
+    --------
+    >>> stable_hash(("a", frozenset({1, 2}))) == stable_hash(("a", frozenset({2, 1})))
+    True
+    >>> stable_hash((1,)) == stable_hash([1])
+    False
+    >>> stable_hash(object())
+    Traceback (most recent call last):
+    ...
+    TypeError: Cannot compute a stable hash of object objects.  Register a key adapter with `register_key_adapter`.
+    """
+    return blake2b(_encode(value), digest_size=16).hexdigest()
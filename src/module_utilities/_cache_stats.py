@@ -0,0 +1,162 @@
+"""Statistics for cached properties and methods."""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING, NamedTuple
+from weakref import WeakSet
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from typing import Any
+
+
+class CacheInfo(NamedTuple):
+    """Statistics for a single cached attribute."""
+
+    hits: int
+    """Number of lookups served from the cache."""
+    misses: int
+    """Number of lookups which called the underlying function."""
+    evictions: int
+    """Number of entries removed to satisfy a size limit."""
+    compute_time: float
+    """Total time in seconds spent in the underlying function."""
+    max_compute_time: float
+    """Maximum time in seconds of a single call to the underlying function."""
+    evicted_compute_time: float = 0.0
+    """
+    Total compute time in seconds of evicted entries.  Only recorded by cost
+    aware eviction (``policy="cost"``).
+    """
+    rejections: int = 0
+    """
+    Number of computed results not stored, as they failed admission
+    (``min_compute_time`` or ``admit``), or were larger than ``max_bytes``.
+    """
+
+
+class CacheStats:
+    """
+    Mutable statistics for a cached attribute.
+
+    Counters are updated without locking, so may be approximate if updated
+    from multiple threads.
+
+    Parameters
+    ----------
+    owner : str
+        Qualified name of class defining the attribute.
+    key : str
+        Cache key of the attribute.
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "compute_time",
+        "evicted_compute_time",
+        "evictions",
+        "hits",
+        "key",
+        "max_compute_time",
+        "misses",
+        "owner",
+        "rejections",
+    )
+
+    def __init__(self, owner: str, key: str) -> None:
+        self.owner = owner
+        self.key = key
+        self.reset()
+        _registry.add(self)
+
+    def reset(self) -> None:
+        """Reset counters to zero."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+        self.evicted_compute_time = 0.0
+        self.compute_time = 0.0
+        self.max_compute_time = 0.0
+
+    def add_miss(self, elapsed: float, count: int = 1) -> None:
+        """
+        Record a call to the underlying function taking ``elapsed`` seconds.
+
+        The call computed ``count`` missing values.
+        """
+        self.misses += count
+        self.compute_time += elapsed
+        self.max_compute_time = max(elapsed, self.max_compute_time)
+
+    def call(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Call ``func`` and record as a miss."""
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.add_miss(perf_counter() - start)
+
+    async def acall(
+        self, func: Callable[..., Awaitable[Any]], /, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Await ``func`` and record as a miss."""
+        start = perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self.add_miss(perf_counter() - start)
+
+    def info(self) -> CacheInfo:
+        """Current statistics."""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            compute_time=self.compute_time,
+            max_compute_time=self.max_compute_time,
+            evicted_compute_time=self.evicted_compute_time,
+            rejections=self.rejections,
+        )
+
+
+_registry: WeakSet[CacheStats] = WeakSet()
+
+
+def _combine(a: CacheInfo, b: CacheInfo) -> CacheInfo:
+    return CacheInfo(
+        hits=a.hits + b.hits,
+        misses=a.misses + b.misses,
+        evictions=a.evictions + b.evictions,
+        compute_time=a.compute_time + b.compute_time,
+        max_compute_time=max(a.max_compute_time, b.max_compute_time),
+        evicted_compute_time=a.evicted_compute_time + b.evicted_compute_time,
+        rejections=a.rejections + b.rejections,
+    )
+
+
+def stats(reset: bool = False) -> dict[str, CacheInfo]:
+    """
+    Statistics for all cached attributes in the process with statistics enabled.
+
+    Parameters
+    ----------
+    reset : bool, default=False
+        If `True`, reset all counters after reporting.
+
+    Returns
+    -------
+    dict of str to CacheInfo
+        Mapping from ``"{module}.{class}.{key}"`` to statistics.  Attributes
+        with the same name (for example, from classes created in a function)
+        are combined.
+    """
+    out: dict[str, CacheInfo] = {}
+    for s in list(_registry):
+        name = f"{s.owner}.{s.key}"
+        info = s.info()
+        out[name] = _combine(out[name], info) if name in out else info
+        if reset:
+            s.reset()
+    return dict(sorted(out.items()))
@@ -0,0 +1,849 @@
+"""Storage for caches used by :mod:`~module_utilities.cached`."""
+
+from __future__ import annotations
+
+import heapq
+import re
+import sys
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import singledispatch
+from typing import TYPE_CHECKING, TypeVar, cast, overload
+
+from ._typing_compat import override
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterator
+    from typing import Any
+
+    from ._cache_stats import CacheStats
+    from ._typing_compat import Self
+
+
+K = TypeVar("K", bound="Hashable")
+V = TypeVar("V")
+T = TypeVar("T")
+
+
+def _validate_maxsize(maxsize: Any) -> int:
+    if not isinstance(maxsize, int) or maxsize < 1:
+        msg = f"maxsize must be a positive integer or None.  Passed {maxsize=}"
+        raise ValueError(msg)
+    return maxsize
+
+
+_UNITS = {"": 1, "k": 10**3, "m": 10**6, "g": 10**9, "t": 10**12}
+_BYTES_PATTERN = re.compile(
+    r"\s*(\d+(?:\.\d*)?|\.\d+)\s*([kmgt]?)(i?)b?\s*", re.IGNORECASE
+)
+
+
+def parse_bytes(value: str | float) -> int:
+    """
+    Number of bytes from a string like ``"2GB"``.
+
+    Units ``kB``, ``MB``, ``GB`` and ``TB`` are powers of 1000, and ``KiB``,
+    ``MiB``, ``GiB`` and ``TiB`` powers of 1024.
+
+    Examples
+    --------
+    >>> parse_bytes("2GB"), parse_bytes("1.5 KiB"), parse_bytes(100)
+    (2000000000, 1536, 100)
+    """
+    if not isinstance(value, str):
+        return int(value)
+    match = _BYTES_PATTERN.fullmatch(value)
+    if match is None or (match.group(3) and not match.group(2)):
+        msg = f"Could not parse number of bytes from {value!r}"
+        raise ValueError(msg)
+    number, prefix, binary = match.groups()
+    prefix = prefix.lower()
+    scale = 1024 ** ("kmgt".index(prefix) + 1) if binary else _UNITS[prefix]
+    return int(float(number) * scale)
+
+
+def _validate_limits(
+    maxsize: Any, max_bytes: int | str | None
+) -> tuple[int | None, int | None]:
+    if max_bytes is not None:
+        max_bytes = parse_bytes(max_bytes)
+        if max_bytes <= 0:
+            msg = f"max_bytes must be positive.  Passed {max_bytes=}"
+            raise ValueError(msg)
+    elif maxsize is None:
+        msg = "At least one of maxsize or max_bytes must be passed"
+        raise ValueError(msg)
+    return (None if maxsize is None else _validate_maxsize(maxsize)), max_bytes
+
+
+@singledispatch
+def sizeof(value: Any) -> int:
+    """
+    Estimated size of ``value`` in bytes.
+
+    Uses, in order, a sizer registered for the type of ``value`` with
+    :func:`register_sizer`, an integer ``nbytes`` attribute (for example,
+    NumPy arrays), the length of the buffer of objects supporting the buffer
+    protocol, and finally :func:`sys.getsizeof`.
+
+    Examples
+    --------
+    >>> sizeof(bytearray(1000))
+    1000
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return sys.getsizeof(value)
+    with view:
+        return view.nbytes
+
+
+@overload
+def register_sizer(
+    cls: type[T], func: None = None
+) -> Callable[[Callable[[T], int]], Callable[[T], int]]: ...
+
+
+@overload
+def register_sizer(cls: type[T], func: Callable[[T], int]) -> Callable[[T], int]: ...
+
+
+def register_sizer(
+    cls: type[T], func: Callable[[T], int] | None = None
+) -> Callable[[T], int] | Callable[[Callable[[T], int]], Callable[[T], int]]:
+    """
+    Register function to estimate the size in bytes of values of type ``cls``.
+
+    Used by :func:`sizeof` for ``cls`` and its subclasses.  Can be used as a
+    decorator.
+
+    Parameters
+    ----------
+    cls : type
+        Type of value.
+    func : callable, optional
+        Function ``func(value) -> int`` returning the size in bytes.
+
+    Examples
+    --------
+    >>> class Table:
+    ...     def __init__(self, rows):
+    ...         self.rows = rows
+    >>> _ = register_sizer(Table, lambda t: 8 * len(t.rows))
+    >>> sizeof(Table([1, 2, 3]))
+    24
+    """
+    if func is None:
+
+        def decorator(f: Callable[[T], int]) -> Callable[[T], int]:
+            return register_sizer(cls, f)
+
+        return decorator
+    return sizeof.register(cls, func)
+
+
+_MISSING = object()
+
+
+class WeakrefDict(dict[K, V]):  # ruff:ignore[subclass-builtin]
+    """:class:`dict` supporting weak references."""
+
+    __slots__ = ("__weakref__",)
+
+
+class LRUCache(OrderedDict[K, V]):
+    """
+    Mapping with least recently used eviction.
+
+    Lookups mark an entry as most recently used.  Inserting a new entry
+    beyond ``maxsize`` entries, or ``max_bytes`` total size, evicts least
+    recently used entries.  An entry larger than ``max_bytes`` is not stored,
+    and does not evict other entries.  All operations are O(1) (amortized, with ``max_bytes``).
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of entries.
+    stats : CacheStats, optional
+        If passed, count evictions, and values not stored as larger than
+        ``max_bytes`` as rejections.  Not retained when copied or pickled.
+    max_bytes : int or str, optional
+        Maximum total size of values in bytes, or a string like ``"2GB"``.
+        At least one of ``maxsize`` or ``max_bytes`` must be passed.
+    sizer : callable, optional
+        Function returning the size of a value in bytes.  Defaults to
+        :func:`sizeof`.
+    on_evict : callable, optional
+        Called with the key of each entry evicted, or removed for a value
+        too large to store.  Not retained when copied or pickled.
+
+    Examples
+    --------
+    >>> c = LRUCache(2)
+    >>> c["a"] = 1
+    >>> c["b"] = 2
+    >>> c["a"]
+    1
+    >>> c["c"] = 3
+    >>> list(c)
+    ['a', 'c']
+
+    Limit total size
+
+    >>> c = LRUCache(max_bytes=100)
+    >>> c["a"] = bytes(60)
+    >>> c["b"] = bytes(30)
+    >>> c["c"] = bytes(20)
+    >>> list(c), c.nbytes
+    (['b', 'c'], 50)
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        stats: CacheStats | None = None,
+        max_bytes: int | str | None = None,
+        sizer: Callable[[Any], int] | None = None,
+        on_evict: Callable[[K], None] | None = None,
+    ) -> None:
+        super().__init__()
+        self.maxsize, self.max_bytes = _validate_limits(maxsize, max_bytes)
+        self.stats = stats
+        self.sizer = sizeof if sizer is None else sizer
+        self.on_evict = on_evict
+        # Sizes of values.  Only tracked with ``max_bytes``.
+        self._sizes: dict[K, int] | None = None if self.max_bytes is None else {}
+        self.nbytes = 0
+
+    @override
+    def __getitem__(self, key: K) -> V:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    @override
+    def __setitem__(self, key: K, value: V) -> None:
+        if self._sizes is not None:
+            self.set(key, value, self.sizer(value))
+            return
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if self.maxsize is not None and len(self) > self.maxsize:
+            self._evict()
+
+    def set(self, key: K, value: V, size: int) -> None:
+        """Set ``key`` to ``value`` with size ``size`` in bytes."""
+        if self._sizes is None:
+            self[key] = value
+            return
+        if size > cast("int", self.max_bytes):
+            self._reject(key)
+            return
+        self.nbytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while self.nbytes > cast("int", self.max_bytes) or (
+            self.maxsize is not None and len(self) > self.maxsize
+        ):
+            self._evict()
+
+    def _evict(self) -> None:
+        key, _ = self.popitem(last=False)
+        if self.stats is not None:
+            self.stats.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+    def _reject(self, key: K) -> None:
+        # Value too large to keep.  Other entries are not evicted for it, and
+        # any previous value of ``key`` is outdated.
+        if key in self:
+            del self[key]
+            if self.on_evict is not None:
+                self.on_evict(key)
+        if self.stats is not None:
+            self.stats.rejections += 1
+
+    def _forget(self, key: K) -> None:
+        if self._sizes is not None:
+            self.nbytes -= self._sizes.pop(key, 0)
+
+    @override
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        self._forget(key)
+
+    @override
+    def pop(self, key: K, default: Any = _MISSING) -> Any:
+        if key not in self:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = super().pop(key)
+        self._forget(key)
+        return value
+
+    @override
+    def popitem(self, last: bool = True) -> tuple[K, V]:
+        key, value = super().popitem(last)
+        self._forget(key)
+        return key, value
+
+    @override
+    def clear(self) -> None:
+        super().clear()
+        if self._sizes is not None:
+            self._sizes.clear()
+        self.nbytes = 0
+
+    def _limits(self) -> tuple[Any, ...]:
+        sizer = None if self.sizer is sizeof else self.sizer
+        return (self.maxsize, None, self.max_bytes, sizer)
+
+    @override
+    def copy(self) -> Self:
+        """Shallow copy with the same limits.  ``stats`` is not retained."""
+        out = type(self)(*self._limits())
+        out.update(self.items())
+        return out
+
+    @override
+    def __reduce__(self) -> Any:
+        # Items must be restored after ``maxsize`` is set.
+        return (type(self), self._limits(), None, None, iter(self.items()))
+
+    @override
+    def __repr__(self) -> str:
+        limits = "" if self.max_bytes is None else f", max_bytes={self.max_bytes}"
+        return f"{type(self).__name__}({self.maxsize}, {dict(self.items())!r}{limits})"
+
+
+class GenerationCache(MutableMapping[K, V]):
+    """
+    Mapping with O(1) invalidation by generation counters.
+
+    Use as ``_cache`` of an instance to make :func:`~module_utilities.cached.clear`
+    O(1).  Each entry is stamped with the generation at insertion.
+    :meth:`clear` starts a new generation, and entries with an older stamp
+    are treated as missing.  Deleted entries are set aside.  Both are only
+    freed by :meth:`sweep`, including when the key is set again in the
+    meantime.  So neither invalidation nor the recomputation that follows
+    frees (possibly large) values in the middle of latency sensitive code.
+
+    :meth:`sweep` should be called periodically at a convenient time, or
+    submitted to an executor to run in the background.  A sweep racing with
+    an update may drop the new entry, which only causes a recomputation.
+
+    Examples
+    --------
+    >>> c = GenerationCache()
+    >>> c["a"] = 1
+    >>> c["b"] = 2
+    >>> del c["a"]
+    >>> list(c)
+    ['b']
+    >>> c.clear()
+    >>> c["b"] = 3
+    >>> len(c), c.stale
+    (1, 2)
+    >>> c.sweep()
+    2
+    """
+
+    __slots__ = ("_data", "_generation", "_pending")
+
+    def __init__(self) -> None:
+        self._data: dict[K, tuple[int, V]] = {}
+        # Entries stamped before ``_generation`` are stale.
+        self._generation = 0
+        # Entries deleted, or stale entries replaced, freed by ``sweep``.
+        self._pending: list[tuple[int, V]] = []
+
+    @override
+    def __getitem__(self, key: K) -> V:
+        stamp, value = self._data[key]
+        if stamp >= self._generation:
+            return value
+        raise KeyError(key)
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(cast("K", key))
+        return entry is not None and entry[0] >= self._generation
+
+    @override
+    def __setitem__(self, key: K, value: V) -> None:
+        old = self._data.get(key)
+        if old is not None and old[0] < self._generation:
+            self._pending.append(old)
+        self._data[key] = (self._generation, value)
+
+    @override
+    def __delitem__(self, key: K) -> None:
+        _ = self.pop(key)
+
+    @override
+    def pop(self, key: K, default: Any = _MISSING) -> Any:
+        # The entry is kept until reclaimed, so dropping the returned value
+        # does not free it.
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._pending.append(entry)
+            if entry[0] >= self._generation:
+                return entry[1]
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    @override
+    def __iter__(self) -> Iterator[K]:
+        generation = self._generation
+        return (k for k, (stamp, _) in list(self._data.items()) if stamp >= generation)
+
+    @override
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @override
+    def clear(self) -> None:
+        """Invalidate all entries in O(1)."""
+        self._generation += 1
+
+    @property
+    def stale(self) -> int:
+        """Number of invalidated entries not yet reclaimed."""
+        return len(self._data) - len(self) + len(self._pending)
+
+    def sweep(self) -> int:
+        """Reclaim invalidated entries.  Returns the number reclaimed."""
+        pending, self._pending = self._pending, []
+        generation = self._generation
+        stale = [
+            (k, entry) for k, entry in list(self._data.items()) if entry[0] < generation
+        ]
+        for k, entry in stale:
+            if self._data.get(k) is entry:
+                del self._data[k]
+        return len(stale) + len(pending)
+
+    @override
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class GreedyDualSizeCache(MutableMapping[K, V]):
+    """
+    Mapping with cost aware (GreedyDual-Size) eviction.
+
+    Each entry has credit ``cost / size``, where ``cost`` is usually the time
+    taken to compute the value, and ``size`` its size in bytes.  An entry's
+    priority is its credit plus the inflation value ``L`` at its last use.
+    Inserting beyond ``maxsize`` evicts the entry with the lowest priority,
+    and sets ``L`` to that priority.  So cheap or large entries are evicted
+    first, but unused expensive entries age out as ``L`` grows.  Lookups are
+    O(1), and insertions amortized O(log n).
+
+    Use :meth:`set` to pass ``cost`` and ``size``.  Plain assignment uses
+    zero cost, which gives least recently used eviction among such entries.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of entries.
+    stats : CacheStats, optional
+        If passed, count evictions and the compute time they discard, and
+        entries larger than ``max_bytes`` as rejections.
+    max_bytes : int or str, optional
+        Maximum total ``size`` of entries, or a string like ``"2GB"``.  An
+        entry larger than ``max_bytes`` is not stored.  At least one of
+        ``maxsize`` or ``max_bytes`` must be passed.
+    on_evict : callable, optional
+        Called with the key of each entry evicted, or removed for a value
+        too large to store.
+
+    Examples
+    --------
+    >>> c = GreedyDualSizeCache(2)
+    >>> c.set("slow", 1, cost=1.0, size=1)
+    >>> c.set("fast", 2, cost=0.001, size=1)
+    >>> c.set("new", 3, cost=0.01, size=1)
+    >>> sorted(c)
+    ['new', 'slow']
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "_counter",
+        "_data",
+        "_heap",
+        "_inflation",
+        "max_bytes",
+        "maxsize",
+        "nbytes",
+        "on_evict",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        stats: CacheStats | None = None,
+        max_bytes: int | str | None = None,
+        on_evict: Callable[[K], None] | None = None,
+    ) -> None:
+        self.maxsize, self.max_bytes = _validate_limits(maxsize, max_bytes)
+        self.stats = stats
+        self.on_evict = on_evict
+        self.nbytes = 0
+        # key -> [value, priority, credit, cost, counter of heap item, size]
+        self._data: dict[K, list[Any]] = {}
+        # (priority, counter, key).  Priorities may be stale (too low).
+        self._heap: list[tuple[float, int, K]] = []
+        self._inflation = 0.0
+        self._counter = 0
+
+    def _push(self, key: K, entry: list[Any]) -> None:
+        self._counter += 1
+        entry[4] = self._counter
+        heapq.heappush(self._heap, (entry[1], self._counter, key))
+
+    @override
+    def __getitem__(self, key: K) -> V:
+        entry = self._data[key]
+        # Priority only increases, so the heap is updated lazily on eviction.
+        entry[1] = self._inflation + entry[2]
+        return entry[0]  # type: ignore[no-any-return]
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def set(self, key: K, value: V, cost: float = 0.0, size: int = 1) -> None:
+        """Set ``key`` to ``value`` which cost ``cost`` to compute."""
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Too large to keep.  Other entries are not evicted for it.
+            if (old := self._data.pop(key, None)) is not None:
+                self.nbytes -= old[5]
+                if self.on_evict is not None:
+                    self.on_evict(key)
+            if self.stats is not None:
+                self.stats.rejections += 1
+            return
+        credit = cost / max(size, 1)
+        entry = [value, self._inflation + credit, credit, cost, 0, size]
+        if (old := self._data.get(key)) is not None:
+            self.nbytes -= old[5]
+        self._data[key] = entry
+        self.nbytes += size
+        self._push(key, entry)
+        while (self.maxsize is not None and len(self._data) > self.maxsize) or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes
+        ):
+            self._evict()
+        if len(self._heap) > 2 * len(self._data) + 8:
+            self._compact()
+
+    @override
+    def __setitem__(self, key: K, value: V) -> None:
+        self.set(key, value, size=1 if self.max_bytes is None else sizeof(value))
+
+    def _evict(self) -> None:
+        while True:
+            priority, counter, key = heapq.heappop(self._heap)
+            entry = self._data.get(key)
+            if entry is None or entry[4] != counter:
+                continue
+            if entry[1] > priority:
+                self._push(key, entry)
+                continue
+            del self._data[key]
+            self.nbytes -= entry[5]
+            self._inflation = priority
+            if self.stats is not None:
+                self.stats.evictions += 1
+                self.stats.evicted_compute_time += entry[3]
+            if self.on_evict is not None:
+                self.on_evict(key)
+            return
+
+    def _compact(self) -> None:
+        heap: list[tuple[float, int, K]] = []
+        for key, entry in self._data.items():
+            self._counter += 1
+            entry[4] = self._counter
+            heap.append((entry[1], self._counter, key))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    @override
+    def __delitem__(self, key: K) -> None:
+        self.nbytes -= self._data.pop(key)[5]
+
+    @override
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._data)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @override
+    def clear(self) -> None:
+        self._data.clear()
+        self._heap.clear()
+        self.nbytes = 0
+
+    @override
+    def __repr__(self) -> str:
+        # Not using ``items()``, which would count as use.
+        values = {key: entry[0] for key, entry in self._data.items()}
+        return f"{type(self).__name__}({self.maxsize}, {values!r})"
+
+
+_MAX_COUNT = 15
+# Translation table halving each byte, used to age sketch counters.
+_HALVE = bytes(i >> 1 for i in range(256))
+_MASK64 = (1 << 64) - 1
+# Odd multipliers for hashing a key into each row of the sketch.
+_ROW_MULTIPLIERS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+)
+_DOOR_MULTIPLIER = 0x94D049BB133111EB
+
+
+class CountMinSketch:
+    """
+    Approximate counts of keys, in a fixed amount of memory.
+
+    Uses four rows of one byte counters, saturating at 15.  The count of a
+    key is the minimum of its counters, so it may be overestimated when
+    keys collide.  The first occurrence of a key is only recorded in a
+    "doorkeeper" row of flags, so that keys seen once do not pollute the
+    counters.  After ``50 * size`` increments, all counters are halved and
+    the doorkeeper is reset, so that counts reflect recent history.
+
+    Parameters
+    ----------
+    size : int
+        Expected number of distinct keys of interest.
+
+    Examples
+    --------
+    >>> s = CountMinSketch(16)
+    >>> for key in [1, 1, 2]:
+    ...     s.increment(key)
+    >>> s.count(1), s.count(2), s.count(3)
+    (2, 1, 0)
+    """
+
+    __slots__ = (
+        "_additions",
+        "_doorkeeper",
+        "_sample_size",
+        "_shift",
+        "_table",
+        "_width",
+    )
+
+    def __init__(self, size: int) -> None:
+        bits = max(8 * size - 1, 15).bit_length()
+        self._width = 1 << bits
+        # Rows are indexed by the top ``bits`` of 64 bit multiplicative hashes.
+        self._shift = 64 - bits
+        self._table = bytearray(len(_ROW_MULTIPLIERS) * self._width)
+        self._doorkeeper = bytearray(self._width)
+        self._sample_size = 50 * max(size, 1)
+        self._additions = 0
+
+    def _indices(self, h: int) -> list[int]:
+        return [
+            row * self._width + (((h * multiplier) & _MASK64) >> self._shift)
+            for row, multiplier in enumerate(_ROW_MULTIPLIERS)
+        ]
+
+    def _door(self, h: int) -> int:
+        return ((h * _DOOR_MULTIPLIER) & _MASK64) >> self._shift
+
+    def count(self, key: Hashable) -> int:
+        """Estimated count of ``key``."""
+        h = hash(key)
+        table = self._table
+        return self._doorkeeper[self._door(h)] + min(table[i] for i in self._indices(h))
+
+    def increment(self, key: Hashable) -> None:
+        """Add one to the count of ``key``."""
+        h = hash(key)
+        door = self._door(h)
+        if not self._doorkeeper[door]:
+            self._doorkeeper[door] = 1
+        else:
+            table = self._table
+            indices = self._indices(h)
+            current = min(table[i] for i in indices)
+            if current < _MAX_COUNT:
+                # Conservative update: only raise the counters at the minimum.
+                for i in indices:
+                    if table[i] == current:
+                        table[i] = current + 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = self._table.translate(_HALVE)
+            self._doorkeeper = bytearray(self._width)
+            self._additions //= 2
+
+
+class TinyLFUCache(MutableMapping[K, V]):
+    """
+    Mapping with scan resistant (W-TinyLFU) eviction.
+
+    New entries go to a small least recently used window (about 1% of
+    ``maxsize``).  An entry leaving the window is admitted to the main
+    region only if it was looked up more often than the least recently
+    used entry of the main region, which it then replaces.  Frequencies of
+    lookups (including misses) are estimated by a compact count-min sketch,
+    and decay over time.  So a stream of keys used once (a scan) passes
+    through the window without evicting frequently used entries.  All
+    operations are O(1).
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries.
+    stats : CacheStats, optional
+        If passed, count evictions, including entries not admitted to the
+        main region.
+    on_evict : callable, optional
+        Called with the key of each entry evicted, or not admitted to the
+        main region.
+
+    Notes
+    -----
+    Hit rates of ``cached.meth(maxsize=100)`` with each policy, from
+    ``python tools/bench_cached.py policy``, over 200,000 lookups.  Keys are
+    drawn from a Zipf distribution (exponent 1) over 10,000 keys.  The scan
+    trace alternates blocks of 500 such keys with 500 keys used only once.
+
+    ==================  =======  ===========
+    trace               ``lru``  ``tinylfu``
+    ==================  =======  ===========
+    zipf                0.389    0.515
+    zipf + scans (50%)  0.181    0.244
+    ==================  =======  ===========
+
+    With scans, at most half of lookups can hit.
+
+    Examples
+    --------
+    >>> c = TinyLFUCache(2)
+    >>> for key in ["a", "b", "a"]:
+    ...     c[key] = key
+    ...     _ = c[key]
+    >>> c["c"] = "c"
+    >>> sorted(c)
+    ['a', 'c']
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "_main",
+        "_main_size",
+        "_sketch",
+        "_window",
+        "_window_size",
+        "maxsize",
+        "on_evict",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        maxsize: int,
+        stats: CacheStats | None = None,
+        on_evict: Callable[[K], None] | None = None,
+    ) -> None:
+        self.maxsize = _validate_maxsize(maxsize)
+        self.stats = stats
+        self.on_evict = on_evict
+        self._window_size = max(1, maxsize // 100)
+        self._main_size = maxsize - self._window_size
+        self._window: OrderedDict[K, V] = OrderedDict()
+        self._main: OrderedDict[K, V] = OrderedDict()
+        self._sketch = CountMinSketch(maxsize)
+
+    @override
+    def __getitem__(self, key: K) -> V:
+        self._sketch.increment(key)
+        if key in self._main:
+            self._main.move_to_end(key)
+            return self._main[key]
+        value = self._window[key]
+        self._window.move_to_end(key)
+        return value
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return key in self._main or key in self._window
+
+    @override
+    def __setitem__(self, key: K, value: V) -> None:
+        if key in self._main:
+            self._main[key] = value
+            self._main.move_to_end(key)
+            return
+        self._window[key] = value
+        self._window.move_to_end(key)
+        if len(self._window) > self._window_size:
+            self._admit(*self._window.popitem(last=False))
+
+    def _admit(self, candidate: K, value: V) -> None:
+        """Move ``candidate`` from the window to the main region, if worthwhile."""
+        main = self._main
+        if len(main) < self._main_size:
+            main[candidate] = value
+            return
+        evicted = candidate
+        if main:
+            victim = next(iter(main))
+            if self._sketch.count(candidate) > self._sketch.count(victim):
+                del main[victim]
+                main[candidate] = value
+                evicted = victim
+        if self.stats is not None:
+            self.stats.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(evicted)
+
+    @override
+    def __delitem__(self, key: K) -> None:
+        try:
+            del self._main[key]
+        except KeyError:
+            del self._window[key]
+
+    @override
+    def __iter__(self) -> Iterator[K]:
+        yield from self._main
+        yield from self._window
+
+    @override
+    def __len__(self) -> int:
+        return len(self._main) + len(self._window)
+
+    @override
+    def clear(self) -> None:
+        # Frequencies are kept, as they describe the workload.
+        self._main.clear()
+        self._window.clear()
+
+    @override
+    def __repr__(self) -> str:
+        values = {**self._main, **self._window}
+        return f"{type(self).__name__}({self.maxsize}, {values!r})"
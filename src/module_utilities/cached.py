@@ -8,18 +8,73 @@ Routines to define cached properties/methods in a class.
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
-from functools import update_wrapper, wraps
-from inspect import signature
-from operator import delitem
-from typing import TYPE_CHECKING, Generic, cast, overload
-
+import sys
+import threading
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache, partial, update_wrapper, wraps
+from inspect import (
+    CO_VARARGS,
+    CO_VARKEYWORDS,
+    Parameter,
+    get_annotations,
+    getattr_static,
+    iscoroutinefunction,
+    signature,
+    unwrap,
+)
+from operator import attrgetter, itemgetter
+from time import monotonic, perf_counter
+from types import CodeType, FunctionType, MemberDescriptorType
+from typing import TYPE_CHECKING, Generic, NamedTuple, TypeVar, cast, overload
+from weakref import WeakKeyDictionary, ref
+
+from ._cache_backend import (
+    BACKEND_ERRORS,
+    CacheBackend,
+    SharedMemoryBackend,
+    SQLiteBackend,
+)
+from ._cache_budget import NO_SUBKEY, BudgetInfo, MemoryBudget
+from ._cache_keys import (
+    adapted_key,
+    freeze,
+    key_builder,
+    register_key_adapter,
+    stable_hash,
+)
+from ._cache_stats import CacheInfo, CacheStats, stats
+from ._cache_store import (
+    GenerationCache,
+    GreedyDualSizeCache,
+    LRUCache,
+    TinyLFUCache,
+    WeakrefDict,
+    _validate_limits,
+    _validate_maxsize,
+    register_sizer,
+    sizeof,
+)
+from ._typing_compat import override
+from .options import CACHE_BUDGET, CACHE_STATS
 from .typing import R, S
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import (
+        Awaitable,
+        Callable,
+        Collection,
+        Hashable,
+        Iterable,
+        MutableMapping,
+    )
+    from concurrent.futures import Executor
+    from inspect import Signature
     from typing import (
         Any,
+        Concatenate,
         Literal,
     )
 
@@ -27,13 +82,1077 @@ if TYPE_CHECKING:
     from .typing import C_meth, C_prop, P
 
 
-__all__ = ["CachedProperty", "clear", "decorate", "meth", "prop"]
+T = TypeVar("T")
+
+
+__all__ = [
+    "AsyncCachedProperty",
+    "BudgetInfo",
+    "CacheBackend",
+    "CacheInfo",
+    "CachedProperty",
+    "CachedSlotProperty",
+    "GenerationCache",
+    "GreedyDualSizeCache",
+    "LRUCache",
+    "MemoryBudget",
+    "SQLiteBackend",
+    "SharedMemoryBackend",
+    "TinyLFUCache",
+    "auto_clear",
+    "batch_meth",
+    "classmeth",
+    "clear",
+    "clear_class",
+    "decorate",
+    "func",
+    "get_budget",
+    "info",
+    "meth",
+    "prop",
+    "register_key_adapter",
+    "register_sizer",
+    "set_budget",
+    "sizeof",
+    "slot_prop",
+    "stable_hash",
+    "stats",
+    "warm",
+]
+
+
+def _validate_policy(
+    policy: Any,
+) -> type[LRUCache[Any, Any] | GreedyDualSizeCache[Any, Any] | TinyLFUCache[Any, Any]]:
+    if policy == "lru":
+        return LRUCache
+    if policy == "cost":
+        return GreedyDualSizeCache
+    if policy == "tinylfu":
+        return TinyLFUCache
+    msg = f"policy must be one of 'lru', 'cost' or 'tinylfu'.  Passed {policy=}"
+    raise ValueError(msg)
+
+
+def _validate_ttl(ttl: Any) -> float | None:
+    if ttl is None:
+        return None
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0:
+        msg = f"ttl must be a positive number of seconds or None.  Passed {ttl=}"
+        raise ValueError(msg)
+    return float(ttl)
+
+
+def _validate_stale(value: Any, ttl: float | None) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        msg = (
+            "stale_while_revalidate must be a positive number of seconds or None.  "
+            f"Passed stale_while_revalidate={value!r}"
+        )
+        raise ValueError(msg)
+    if ttl is None:
+        msg = "stale_while_revalidate requires ttl"
+        raise ValueError(msg)
+    return float(value)
+
+
+def _validate_min_compute_time(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        msg = (
+            "min_compute_time must be a non-negative number of seconds or None.  "
+            f"Passed min_compute_time={value!r}"
+        )
+        raise ValueError(msg)
+    return float(value)
+
+
+def _admission(
+    min_compute_time: float | None,
+    admit: Callable[[Any], bool] | None,
+    cache_stats: CacheStats | None,
+    max_bytes: int | None = None,
+) -> Callable[[float, Any], bool] | None:
+    """
+    Function ``admitted(start, value)`` deciding whether to store a result.
+
+    Results larger than ``max_bytes`` are not stored.  Returns `None` if all
+    results are stored.  Rejections are counted in ``cache_stats``.
+    """
+    if min_compute_time is None and admit is None and max_bytes is None:
+        return None
+
+    def admitted(start: float, value: Any) -> bool:
+        ok = (
+            min_compute_time is None or perf_counter() - start > min_compute_time
+        ) and (admit is None or admit(value))
+        if ok and (max_bytes is None or sizeof(value) <= max_bytes):
+            return True
+        if cache_stats is not None:
+            cache_stats.rejections += 1
+        return False
+
+    return admitted
+
+
+def _validate_names(value: Any, name: str) -> tuple[str, ...]:
+    msg = f"{name} must be a string or iterable of strings.  Passed {name}={value!r}"
+    if isinstance(value, str):
+        return (value,)
+    try:
+        names = tuple(value)
+    except TypeError as e:
+        raise TypeError(msg) from e
+    if not all(isinstance(name, str) for name in names):
+        raise TypeError(msg)
+    return names
+
+
+class _CacheSpec(NamedTuple):
+    """Description of a cached attribute, used to inspect classes."""
+
+    key: str
+    stats: CacheStats | None
+    depends_on: tuple[str, ...] = ()
+    slot: str | None = None
+    tags: tuple[str, ...] = ()
+    ttl: float | None = None
+    max_bytes: int | None = None
+    admitted: Callable[[float, Any], bool] | None = None
+
+
+def _make_stats(
+    func: Callable[..., Any], key: str, stats: bool | None
+) -> CacheStats | None:
+    if stats is None:
+        stats = CACHE_STATS
+    if not stats:
+        return None
+    owner = ".".join([func.__module__, *func.__qualname__.split(".")[:-1]])
+    return CacheStats(owner=owner, key=key)
+
+
+def _get_spec(attr: Any) -> _CacheSpec | None:
+    if isinstance(attr, property):
+        attr = attr.fget
+    elif isinstance(attr, (classmethod, staticmethod)):
+        attr = attr.__func__  # pyright: ignore[reportUnknownMemberType]
+    return getattr(attr, "_cache_spec", None)
+
+
+def _class_specs(cls: type[Any]) -> dict[str, _CacheSpec]:
+    """Mapping from attribute name to spec for cached attributes of ``cls``."""
+    out: dict[str, _CacheSpec] = {}
+    for base in reversed(cls.__mro__):
+        for name, attr in vars(base).items():
+            if (spec := _get_spec(attr)) is not None:
+                out[name] = spec
+            else:
+                _ = out.pop(name, None)
+    return out
+
+
+_dependents: WeakKeyDictionary[type[Any], dict[str, frozenset[str]]] = (
+    WeakKeyDictionary()
+)
+
+
+def _functions(attr: Any) -> list[FunctionType]:
+    """Functions (and the functions they wrap) implementing class attribute ``attr``."""
+    if isinstance(attr, property):
+        attrs = [attr.fget, attr.fset, attr.fdel]
+    elif isinstance(attr, (classmethod, staticmethod)):
+        attrs = [attr.__func__]  # pyright: ignore[reportUnknownMemberType]
+    elif isinstance(attr, (CachedProperty, CachedSlotProperty)):
+        attrs = [attr._prop]  # pyright: ignore[reportUnknownMemberType]
+    else:
+        attrs = [attr]
+    out: list[FunctionType] = []
+    for func in attrs:
+        if isinstance(func, FunctionType):
+            out.append(func)
+            if (inner := unwrap(func)) is not func and isinstance(inner, FunctionType):
+                out.append(inner)
+    return out
+
+
+def _known_names(cls: type[Any]) -> set[str]:
+    """
+    Names of attributes of ``cls``.
+
+    These are names in the class bodies (including annotations), and
+    attribute names used by their functions, such as ``self.x = x`` in
+    ``__init__``.
+    """
+    out: set[str] = set()
+    codes: list[CodeType] = []
+    for base in cls.__mro__[:-1]:
+        out.update(vars(base), get_annotations(base))
+        for attr in vars(base).values():
+            codes.extend(func.__code__ for func in _functions(attr))
+    while codes:
+        code = codes.pop()
+        out.update(code.co_names)
+        codes.extend(c for c in code.co_consts if isinstance(c, CodeType))
+    return out
+
+
+def _check_depends_on(cls: type[Any], specs: dict[str, _CacheSpec]) -> None:
+    """Raise :class:`ValueError` for ``depends_on`` names not known to ``cls``."""
+    if not any(spec.depends_on for spec in specs.values()):
+        return
+    known = _known_names(cls).union(spec.key for spec in specs.values())
+    for attr, spec in specs.items():
+        for name in spec.depends_on:
+            if name not in known:
+                msg = (
+                    f"{cls.__qualname__}.{attr} depends on {name!r}, which is not "
+                    f"an attribute or cache key of {cls.__qualname__}.  Attributes "
+                    "only set outside the class must be declared in the class "
+                    "body (for example, with an annotation)."
+                )
+                raise ValueError(msg)
+
+
+def _build_dependents(cls: type[Any]) -> dict[str, frozenset[str]]:
+    """
+    Mapping from name to cache keys of ``cls`` which transitively depend on it.
+
+    Names in ``depends_on`` which are cached attributes are replaced by their
+    cache key.  Other names (plain attributes) are used as is.  Raises
+    :class:`ValueError` for unknown names in ``depends_on`` and for cyclic
+    dependencies.
+    """
+    specs = _class_specs(cls)
+    _check_depends_on(cls, specs)
+    key_of = {name: spec.key for name, spec in specs.items()}
+    direct: dict[str, set[str]] = {}
+    for spec in specs.values():
+        for name in spec.depends_on:
+            direct.setdefault(key_of.get(name, name), set()).add(spec.key)
+
+    out: dict[str, frozenset[str]] = {}
+    path: list[str] = []
+
+    def visit(name: str) -> frozenset[str]:
+        if name in out:
+            return out[name]
+        if name in path:
+            cycle = " -> ".join([*path[path.index(name) :], name])
+            msg = f"Cyclic cache dependencies in {cls.__qualname__}: {cycle}"
+            raise ValueError(msg)
+        path.append(name)
+        dependents: set[str] = set()
+        for dependent in direct.get(name, ()):
+            dependents.add(dependent)
+            dependents.update(visit(dependent))
+        _ = path.pop()
+        out[name] = frozenset(dependents)
+        return out[name]
+
+    for name in direct:
+        _ = visit(name)
+    return out
+
+
+def _get_dependents(cls: type[Any]) -> dict[str, frozenset[str]]:
+    """
+    Cached :func:`_build_dependents`.
+
+    Built on creation of classes with cached properties, or :func:`auto_clear`
+    classes, so that bad dependencies raise there, and otherwise on first use.
+    """
+    try:
+        return _dependents[cls]
+    except KeyError:
+        out = _dependents[cls] = _build_dependents(cls)
+        return out
+
+
+def _expand_keys(cls: type[Any], keys: tuple[str, ...]) -> frozenset[str]:
+    """Keys together with all their transitive dependents."""
+    dependents = _get_dependents(cls)
+    out = set(keys)
+    for name in keys:
+        out.update(dependents.get(name, ()))
+    return frozenset(out)
+
+
+_tag_index: WeakKeyDictionary[type[Any], dict[str, frozenset[str]]] = (
+    WeakKeyDictionary()
+)
+
+
+def _get_tag_index(cls: type[Any]) -> dict[str, frozenset[str]]:
+    """
+    Mapping from tag to cache keys of ``cls`` to clear for that tag.
+
+    Includes the transitive dependents of tagged keys.  Built on first use for
+    each class.
+    """
+    try:
+        return _tag_index[cls]
+    except KeyError:
+        tagged: dict[str, list[str]] = {}
+        for spec in _class_specs(cls).values():
+            for tag in spec.tags:
+                tagged.setdefault(tag, []).append(spec.key)
+        out = _tag_index[cls] = {
+            tag: _expand_keys(cls, tuple(keys)) for tag, keys in tagged.items()
+        }
+        return out
+
+
+_slots: WeakKeyDictionary[type[Any], dict[str, MemberDescriptorType]] = (
+    WeakKeyDictionary()
+)
+
+
+def _get_slots(cls: type[Any]) -> dict[str, MemberDescriptorType]:
+    """Mapping from cache key to slot for slot backed properties of ``cls``."""
+    try:
+        return _slots[cls]
+    except KeyError:
+        out = _slots[cls] = {
+            spec.key: getattr(cls, spec.slot)
+            for spec in _class_specs(cls).values()
+            if spec.slot is not None
+        }
+        return out
+
+
+_byte_groups: WeakKeyDictionary[type[Any], tuple[_CacheSpec, ...]] = WeakKeyDictionary()
+
+
+def _get_byte_group(cls: type[Any]) -> tuple[_CacheSpec, ...]:
+    """Specs of properties of ``cls`` with ``max_bytes``."""
+    try:
+        return _byte_groups[cls]
+    except KeyError:
+        out = _byte_groups[cls] = tuple(
+            spec for spec in _class_specs(cls).values() if spec.max_bytes is not None
+        )
+        return out
+
+
+def _discard(instance: Any, keys: Collection[str]) -> None:
+    """Remove cached values of ``keys`` from ``instance._cache`` or slots."""
+    slots = _get_slots(type(instance))
+    cache = getattr(instance, "_cache", None)
+    for key in keys:
+        if (slot := slots.get(key)) is not None:
+            with contextlib.suppress(AttributeError):
+                slot.__delete__(instance)
+        elif cache is not None:
+            _ = cache.pop(key, None)
+    _forget_cleared(instance, keys)
+
+
+def _forget_cleared(instance: Any, keys: Collection[str] | None = None) -> None:
+    """Forget entries of ``keys`` (default all) cleared from ``instance`` in the budget."""
+    if _budget is not None:
+        _budget.forget_instance(id(instance), keys)
+
+
+def info(obj: Any) -> dict[str, CacheInfo]:
+    """
+    Statistics for cached attributes of an object or class.
+
+    Only attributes with statistics enabled (``stats=True``) are included.
+    Statistics are shared by all instances of the class defining the
+    attribute.
+
+    Parameters
+    ----------
+    obj : object, type or callable
+        Instance or class with cached attributes, or function decorated with
+        :func:`func` or :func:`classmeth`.
+
+    Returns
+    -------
+    dict of str to CacheInfo
+        Mapping from cache key to statistics.
+
+    See Also
+    --------
+    stats : statistics for all cached attributes in the process
+
+    Examples
+    --------
+    >>> class Example:
+    ...     @prop(stats=True)
+    ...     def a(self):
+    ...         return 1
+    >>> x = Example()
+    >>> x.a, x.a
+    (1, 1)
+    >>> info(x)["a"][:3]
+    (1, 1, 0)
+    """
+    if not isinstance(obj, type) and (spec := _get_spec(obj)) is not None:
+        return {} if spec.stats is None else {spec.key: spec.stats.info()}
+
+    cls = obj if isinstance(obj, type) else type(obj)
+    return {
+        spec.key: spec.stats.info()
+        for spec in _class_specs(cls).values()
+        if spec.stats is not None
+    }
+
+
+def _get_entry(
+    cache: MutableMapping[Any, Any], key: Hashable, ttl: float | None
+) -> Any:
+    """Cached value for ``key``.  Raises ``KeyError`` if missing or expired."""
+    if ttl is None:
+        return cache[key]
+    value, expires = cache[key]
+    if monotonic() < expires:
+        return value
+    raise KeyError(key)
+
+
+def _get_stale_entry(
+    cache: MutableMapping[Any, Any], key: Hashable, window: float
+) -> tuple[Any, bool]:
+    """
+    Cached value for ``key``, and whether it has expired.
+
+    Values expired less than ``window`` seconds ago are returned.  Raises
+    ``KeyError`` if missing, or expired for longer.
+    """
+    value, expires = cache[key]
+    now = monotonic()
+    if now < expires:
+        return value, False
+    if now < expires + window:
+        return value, True
+    raise KeyError(key)
+
+
+def _make_entry(value: Any, ttl: float | None) -> Any:
+    return value if ttl is None else (value, monotonic() + ttl)
+
+
+def _put(
+    instance: Any,
+    store: MutableMapping[Any, Any],
+    key_name: str,
+    subkey: Hashable,
+    value: Any,
+    ttl: float | None,
+    start: float,
+) -> None:
+    """
+    Store ``value`` computed since ``start`` (from :func:`~time.perf_counter`).
+
+    ``store`` is ``instance._cache`` if ``subkey`` is ``NO_SUBKEY``, and the
+    store of method ``key_name`` otherwise.
+    """
+    entry = _make_entry(value, ttl)
+    key = key_name if subkey is NO_SUBKEY else subkey
+    if isinstance(store, GreedyDualSizeCache):
+        store.set(key, entry, cost=perf_counter() - start, size=sizeof(value))
+    elif isinstance(store, LRUCache) and store.max_bytes is not None:
+        store.set(key, entry, store.sizer(value))
+    else:
+        store[key] = entry
+    # Values too large for a bounded store are not stored.
+    if _budget is not None and (subkey is NO_SUBKEY or subkey in store):
+        _budget.add(instance, key_name, subkey, value, perf_counter() - start)
+
+
+def _put_limited(instance: Any, spec: _CacheSpec, value: Any, start: float) -> None:
+    """
+    Store property ``value`` within the ``max_bytes`` limit of ``spec``.
+
+    The largest other values of properties of the instance with
+    ``max_bytes`` are removed until the total size is within the limit.
+    """
+    limit = cast("int", spec.max_bytes)
+    size = sizeof(value)
+    if size > limit:
+        if spec.stats is not None:
+            spec.stats.rejections += 1
+        return
+
+    cache = instance._cache
+    others: list[tuple[int, _CacheSpec]] = []
+    for other in _get_byte_group(type(instance)):
+        if other.key == spec.key or (entry := cache.get(other.key)) is None:
+            continue
+        other_size = sizeof(entry if other.ttl is None else entry[0])
+        others.append((other_size, other))
+        size += other_size
+    others.sort(key=itemgetter(0))
+    while size > limit:
+        other_size, other = others.pop()
+        _ = cache.pop(other.key, None)
+        size -= other_size
+        if other.stats is not None:
+            other.stats.evictions += 1
+    _put(instance, cache, spec.key, NO_SUBKEY, value, spec.ttl, start)
+
+
+def _store_value(instance: Any, spec: _CacheSpec, value: Any, start: float) -> None:
+    """
+    Store property or method ``value`` of ``instance`` computed since ``start``.
+
+    Applies the admission and ``max_bytes`` limits of ``spec``.
+    """
+    if spec.admitted is not None and not spec.admitted(start, value):
+        return
+    if spec.max_bytes is None:
+        _put(instance, instance._cache, spec.key, NO_SUBKEY, value, spec.ttl, start)
+    else:
+        _put_limited(instance, spec, value, start)
+
+
+def _weak(value: Any, callback: Callable[[Any], None] | None) -> Any:
+    """Weak reference to ``value`` if supported, otherwise ``value``."""
+    if type(value).__weakrefoffset__:
+        return ref(value, callback)
+    return value
+
+
+def _weak_args(
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    callback: Callable[[Any], None] | None = None,
+) -> tuple[tuple[Any, ...], dict[str, Any]]:
+    """Arguments with those supporting weak references replaced by weak references."""
+    return (
+        tuple(_weak(v, callback) for v in args),
+        {k: _weak(v, callback) for k, v in kwargs.items()},
+    )
+
+
+class _RemoveEntry:
+    """
+    Weak reference callback removing ``key`` from ``store``.
+
+    ``store`` holds this callback through the weak references in ``key``, so
+    is only held by weak reference.  The entry is also forgotten by the
+    memory budget.
+    """
+
+    __slots__ = ("ident", "key", "key_name", "store")
+
+    def __init__(
+        self, store: MutableMapping[Any, Any], ident: int, key_name: str
+    ) -> None:
+        self.store = ref(store)
+        self.ident = ident
+        self.key_name = key_name
+        self.key: Hashable = None
+
+    def __call__(self, _: Any) -> None:
+        if (store := self.store()) is not None:
+            _ = store.pop(self.key, None)
+        _forget_evicted(self.ident, self.key_name, self.key)
+
+
+def _weak_key_builder(make_key: Callable[..., Hashable]) -> Callable[..., Hashable]:
+    """Key builder for lookups with arguments replaced by weak references."""
+
+    def make_weak_key(self: Any, /, *args: Any, **kwargs: Any) -> Hashable:
+        key_args, key_kwargs = _weak_args(args, kwargs)
+        return make_key(self, *key_args, **key_kwargs)
+
+    return make_weak_key
+
+
+def _weak_key(
+    make_key: Callable[..., Hashable],
+    self: Any,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    store: MutableMapping[Any, Any],
+    adapted: bool,
+    key_name: str,
+) -> Hashable:
+    """
+    Key for storing a result with weak references to arguments.
+
+    Equal to the key from :func:`_weak_key_builder`.  The entry is removed from
+    ``store`` (of method ``key_name``) once any of the arguments is garbage
+    collected.
+    """
+    remove = _RemoveEntry(store, id(self), key_name)
+    if adapted:
+        args = tuple(freeze(v) for v in args)
+        kwargs = {k: freeze(v) for k, v in kwargs.items()}
+    key_args, key_kwargs = _weak_args(args, kwargs, remove)
+    remove.key = make_key(self, *key_args, **key_kwargs)
+    return remove.key
+
+
+def _budget_from_env() -> MemoryBudget | None:
+    """Budget set by ``MODULE_UTILITIES_CACHE_BUDGET``.  Disabled if invalid."""
+    if CACHE_BUDGET is None:
+        return None
+    try:
+        return MemoryBudget(CACHE_BUDGET)
+    except ValueError as e:
+        warnings.warn(
+            f"Ignoring MODULE_UTILITIES_CACHE_BUDGET={CACHE_BUDGET!r}: {e}",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return None
+
+
+# Process wide memory budget.  See :func:`set_budget`.
+_budget: MemoryBudget | None = _budget_from_env()
+
+
+def _forget_evicted(ident: int, key_name: str, subkey: Hashable) -> None:
+    """Forget an entry evicted from a per method store in the budget."""
+    if _budget is not None:
+        _budget.forget(ident, key_name, subkey)
+
+
+def _bounded_store(
+    new_store: Callable[..., MutableMapping[Any, Any]], key_name: str, instance: Any
+) -> MutableMapping[Any, Any]:
+    """Per method store of ``instance`` with limits, which reports evictions."""
+    return new_store(on_evict=partial(_forget_evicted, id(instance), key_name))
+
+
+def _new_dict(instance: Any) -> dict[Any, Any]:  # ruff:ignore[unused-function-argument]
+    """Per method store of ``instance`` without limits."""
+    return {}
+
+
+def _new_weakref_dict(instance: Any) -> dict[Any, Any]:  # ruff:ignore[unused-function-argument]
+    """Per method store of ``instance`` without limits, for ``weak_args``."""
+    return WeakrefDict()
+
+
+def set_budget(
+    nbytes: int | str | None,
+    *,
+    policy: Literal["lru", "cost"] = "lru",
+    sizer: Callable[[Any], int] | None = None,
+) -> MemoryBudget | None:
+    """
+    Set process wide memory budget for cached values.
+
+    Values computed by cached properties and methods (stored in ``_cache``)
+    are tracked, and evicted once their total size exceeds ``nbytes``.  The
+    default budget is set by environment variable
+    ``MODULE_UTILITIES_CACHE_BUDGET`` (for example ``2GB``), and is disabled
+    if unset or invalid.  Values computed before the budget was set are not
+    tracked.
+
+    Parameters
+    ----------
+    nbytes : int or str or None
+        Budget in bytes, or a string like ``"2GB"``.  `None` disables the
+        budget.
+    policy : {"lru", "cost"}
+        Evict the least recently used value, or prefer to keep values with
+        large compute time per byte.
+    sizer : callable, optional
+        Function returning the size of a value in bytes.  Defaults to
+        :func:`sizeof`, which uses ``nbytes`` if available.
+
+    Returns
+    -------
+    MemoryBudget or None
+        The new budget.  Use :meth:`MemoryBudget.info` for usage.
+
+    See Also
+    --------
+    get_budget
+    MemoryBudget
+
+    Examples
+    --------
+    >>> class Example:
+    ...     @prop
+    ...     def data(self):
+    ...         return bytes(600)
+    >>> budget = set_budget("1kB")
+    >>> a, b = Example(), Example()
+    >>> len(a.data), len(b.data)
+    (600, 600)
+    >>> "data" in a._cache, "data" in b._cache
+    (False, True)
+    >>> budget.info().evictions
+    1
+    >>> _ = set_budget(None)
+    """
+    global _budget  # ruff:ignore[global-statement]
+    _budget = None if nbytes is None else MemoryBudget(nbytes, policy, sizer)
+    return _budget
+
+
+def get_budget() -> MemoryBudget | None:
+    """Current process wide memory budget, if any.  See :func:`set_budget`."""
+    return _budget
+
+
+# Single flight computation.  Maps ``(id(instance), key)`` to the future and
+# thread ident of the computation in progress.  Entries only live while the
+# computation runs (or is scheduled in the background), so the instance is kept
+# alive and ``id`` cannot be reused.
+_inflight_lock = threading.Lock()
+_inflight: dict[tuple[int, Hashable], tuple[Future[Any], int]] = {}
+# Owners of computations scheduled by :func:`warm` or stale revalidation, which
+# have not started, or which run in another process.
+_PENDING = 0
+_REMOTE = -1
+
+
+def _start_flight(
+    token: tuple[int, Hashable], future: Future[Any] | None, ident: int
+) -> Future[Any]:
+    """
+    Register ``future`` as running in thread ``ident``.
+
+    A new future is used if ``future`` is `None` or was cancelled.  Must be
+    called with ``_inflight_lock`` held.
+    """
+    if future is None or not future.set_running_or_notify_cancel():
+        future = Future()
+        _ = future.set_running_or_notify_cancel()
+    _inflight[token] = (future, ident)
+    return future
+
+
+def _run_flight(
+    token: tuple[int, Hashable], future: Future[Any], compute: Callable[[], Any]
+) -> Any:
+    """Call ``compute``, passing the result to waiters on ``future``."""
+    try:
+        ret = compute()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(ret)
+        return ret
+    finally:
+        with _inflight_lock:
+            del _inflight[token]
+
+
+def _single_flight(  # ruff:ignore[complex-structure]
+    instance: Any,
+    key: Hashable,
+    lookup: Callable[[], Any],
+    compute: Callable[[], Any],
+    register: bool = True,
+    cache_stats: CacheStats | None = None,
+) -> Any:
+    """
+    Compute a cache entry at most once across threads.
+
+    ``lookup`` returns the cached value or raises ``KeyError``.  ``compute``
+    calculates and stores the value.  The first thread to miss calls
+    ``compute``, while other threads missing on the same instance and key
+    wait for its result.  If ``register`` is `False`, only computations
+    already in flight (for example, from :func:`warm`) are joined.  Values
+    found by ``lookup`` or from waiting are counted as hits in
+    ``cache_stats``.
+    """
+    token = (id(instance), key)
+    ident = threading.get_ident()
+    waiting: Future[Any] | None = None
+    running: Future[Any] | None = None
+    with _inflight_lock:
+        try:
+            value = lookup()
+        except KeyError:
+            pass
+        else:
+            if cache_stats is not None:
+                cache_stats.hits += 1
+            return value
+        call = _inflight.get(token)
+        if call is None:
+            if register:
+                running = _start_flight(token, None, ident)
+        elif call[1] == _PENDING:
+            # scheduled in the background, but not started.  Compute here.
+            running = _start_flight(token, call[0], ident)
+        elif call[1] != ident:
+            waiting = call[0]
+        # otherwise, reentrant call from the computing thread.
+
+    if waiting is not None:
+        value = waiting.result()
+        if cache_stats is not None:
+            cache_stats.hits += 1
+        return value
+    if running is None:
+        return compute()
+    return _run_flight(token, running, compute)
+
+
+# Coroutine computations in progress.  Maps ``(id(loop), id(instance), key)``
+# to the task computing the value.
+_inflight_tasks: dict[tuple[int, int, Hashable], asyncio.Task[Any]] = {}
+
+
+async def _await_single_flight(
+    instance: Any,
+    key: Hashable,
+    compute: Callable[[], Awaitable[Any]],
+    cache_stats: CacheStats | None = None,
+) -> Any:
+    """
+    Await a cache entry computed at most once per event loop.
+
+    Concurrent awaiters on the same instance and key share a single task.
+    The task is shielded, so cancelling one awaiter does not cancel the
+    computation for the others.  Failures are propagated to all current
+    awaiters, and not cached.  Awaiters joining a task are counted as hits
+    in ``cache_stats``.
+    """
+    loop = asyncio.get_running_loop()
+    token = (id(loop), id(instance), key)
+    task = _inflight_tasks.get(token)
+    if task is not None:
+        value = await asyncio.shield(task)
+        if cache_stats is not None:
+            cache_stats.hits += 1
+        return value
+
+    async def run() -> Any:
+        try:
+            return await compute()
+        finally:
+            del _inflight_tasks[token]
+
+    task = _inflight_tasks[token] = loop.create_task(run())
+    return await asyncio.shield(task)
+
+
+@cache
+def _default_executor() -> Executor:
+    """Thread pool shared by background computations."""
+    return ThreadPoolExecutor(thread_name_prefix="module_utilities.cached")
+
+
+def _warm_target(cls: type[Any], name: str) -> tuple[_CacheSpec, bool]:
+    """Spec of cached attribute ``name``, and whether it is a method."""
+    attr = getattr_static(cls, name, None)
+    if isinstance(attr, CachedProperty) and not isinstance(attr, AsyncCachedProperty):
+        return attr._cache_spec, False
+    if (
+        callable(attr)
+        and (spec := getattr(attr, "_cache_spec", None)) is not None
+        and not iscoroutinefunction(attr)
+        and len(signature(attr).parameters) == 1
+    ):
+        return spec, True
+    msg = (
+        f"{name!r} is not a cached property or cached method without "
+        f"arguments of {cls.__qualname__}"
+    )
+    raise ValueError(msg)
+
+
+def _run_scheduled(
+    token: tuple[int, Hashable], future: Future[Any], compute: Callable[[], Any]
+) -> None:
+    """Run a computation scheduled in the background, unless claimed by a caller."""
+    with _inflight_lock:
+        if _inflight.get(token) != (future, _PENDING):
+            return
+        if future.cancelled():
+            del _inflight[token]
+            return
+        running = _start_flight(token, future, threading.get_ident())
+    with contextlib.suppress(Exception):
+        _ = _run_flight(token, running, compute)
+
+
+def _revalidate(
+    instance: Any,
+    key: Hashable,
+    compute: Callable[[], Any],
+    executor: Executor | None,
+) -> None:
+    """
+    Recompute a stale value with ``compute`` on ``executor``.
+
+    At most one refresh per instance and key is scheduled at a time.  Until
+    it starts, a caller missing on the key computes the value instead.
+    Failures are not stored, so the value is recomputed by callers once the
+    stale window has passed.
+    """
+    token = (id(instance), key)
+    with _inflight_lock:
+        if token in _inflight:
+            return
+        future: Future[Any] = Future()
+        _inflight[token] = (future, _PENDING)
+    _ = (_default_executor() if executor is None else executor).submit(
+        _run_scheduled, token, future, compute
+    )
+
+
+def _warm_remote(obj: Any, name: str, method: bool) -> tuple[Any, float]:
+    """Compute ``name`` of ``obj`` in a worker process."""
+    start = perf_counter()
+    value = getattr(obj, name)
+    if method:
+        value = value()
+    return value, perf_counter() - start
+
+
+def _warm_remote_done(
+    obj: Any,
+    token: tuple[int, Hashable],
+    spec: _CacheSpec,
+    future: Future[Any],
+    remote: Future[tuple[Any, float]],
+) -> None:
+    """Store the result of :func:`_warm_remote` in ``obj._cache``."""
+    try:
+        value, elapsed = remote.result()
+    except BaseException as e:  # ruff:ignore[blind-except]
+        future.set_exception(e)
+    else:
+        if spec.stats is not None:
+            spec.stats.add_miss(elapsed)
+        _store_value(obj, spec, value, perf_counter() - elapsed)
+        future.set_result(value)
+    finally:
+        with _inflight_lock:
+            del _inflight[token]
+
+
+def warm(
+    obj: Any, *keys: str, executor: Executor | None = None
+) -> dict[str, Future[Any]]:
+    """
+    Compute cached properties and methods of ``obj`` in the background.
+
+    Each of ``keys`` is computed concurrently on ``executor`` and stored in
+    ``obj._cache``.  While a computation is in flight, accessing the
+    attribute waits for its result instead of computing it again.  If an
+    attribute is accessed before its computation starts, it is computed by
+    the caller, and the scheduled computation is skipped.
+
+    Parameters
+    ----------
+    obj : object
+        Instance with cached attributes.
+    *keys : str
+        Names of cached properties, or cached methods without arguments.
+        Asynchronous and slot properties are not supported.
+    executor : concurrent.futures.Executor, optional
+        Executor to run computations.  Defaults to a thread pool shared by
+        all calls.  With a :class:`~concurrent.futures.ProcessPoolExecutor`,
+        values are computed on a pickled copy of ``obj``, and stored in the
+        cache of ``obj`` when done.
+
+    Returns
+    -------
+    dict of str to Future
+        Future of the value for each key.  Values already cached, or in
+        flight, are not computed again.
+
+    Examples
+    --------
+    >>> class Example:
+    ...     @prop
+    ...     def a(self) -> int:
+    ...         return 1
+    ...
+    ...     @meth
+    ...     def b(self) -> int:
+    ...         return 2
+    >>> x = Example()
+    >>> futures = warm(x, "a", "b")
+    >>> {key: future.result() for key, future in futures.items()}
+    {'a': 1, 'b': 2}
+    >>> sorted(x._cache.items())
+    [('a', 1), ('b', 2)]
+    """
+    targets = {name: _warm_target(type(obj), name) for name in keys}
+    if executor is None:
+        executor = _default_executor()
+    remote = isinstance(executor, ProcessPoolExecutor)
+    if not hasattr(obj, "_cache"):
+        object.__setattr__(obj, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
+
+    out: dict[str, Future[Any]] = {}
+    for name, (spec, method) in targets.items():
+        token = (id(obj), spec.key)
+        future = out[name] = Future()
+        with _inflight_lock:
+            try:
+                future.set_result(_get_entry(obj._cache, spec.key, spec.ttl))
+            except KeyError:
+                pass
+            else:
+                continue
+            if (call := _inflight.get(token)) is not None:
+                out[name] = call[0]
+                continue
+            if remote:
+                _ = future.set_running_or_notify_cancel()
+            _inflight[token] = (future, _REMOTE if remote else _PENDING)
+
+        if remote:
+            executor.submit(_warm_remote, obj, name, method).add_done_callback(
+                partial(_warm_remote_done, obj, token, spec, future)
+            )
+        else:
+            thunk = getattr(obj, name) if method else partial(getattr, obj, name)
+            _ = executor.submit(_run_scheduled, token, future, thunk)
+    return out
 
 
 class CachedProperty(Generic[S, R]):
     """
     Simplified version of property with typing.
 
+    Parameters
+    ----------
+    prop : callable
+        Function to compute the property.
+    key : str, optional
+        Key for storage in ``_cache``.  Defaults to ``prop.__name__``.
+    check_use_cache : bool, default=False
+        If `True`, only cache if ``instance._use_cache`` is `True`.
+    ttl : float, optional
+        Time to live in seconds.  If passed, values are stored in ``_cache``
+        as ``(value, expires)``, with ``expires`` from :func:`time.monotonic`,
+        and recomputed on access once expired.
+    lock : bool, default=False
+        If `True`, concurrent threads missing on the same instance compute the
+        value only once, with other threads waiting for the result.  Cache hits
+        never take a lock.
+    stats : bool, optional
+        If `True`, record statistics (see :func:`info`).  Default is set by
+        environment variable ``MODULE_UTILITIES_CACHE_STATS``, which defaults
+        to `False`.
+    depends_on : str or iterable of str
+        Names of attributes or cache keys this property depends on.  See
+        :func:`clear`.
+    tags : str or iterable of str
+        Tags of this property.  See :func:`clear`.
+    backend : CacheBackend, optional
+        Persistent or shared storage.  See :func:`meth`.
+    max_bytes : int or str, optional
+        Limit on the total size of values of properties with ``max_bytes``
+        per instance.  See :func:`prop`.
+    stale_while_revalidate : float, optional
+        Seconds after expiry during which the expired value is returned,
+        while it is recomputed on ``executor``.  Requires ``ttl``.  See
+        :func:`prop`.
+    executor : concurrent.futures.Executor, optional
+        Executor for recomputing stale values.
+
     Examples
     --------
     >>> class Example:
@@ -54,13 +1173,28 @@ class CachedProperty(Generic[S, R]):
     """
 
     def __init__(
-        self, prop: C_prop[S, R], key: str | None = None, check_use_cache: bool = False
+        self,
+        prop: C_prop[S, R],
+        key: str | None = None,
+        check_use_cache: bool = False,
+        ttl: float | None = None,
+        lock: bool = False,
+        stats: bool | None = None,
+        depends_on: str | Iterable[str] = (),
+        tags: str | Iterable[str] = (),
+        backend: CacheBackend | None = None,
+        max_bytes: int | str | None = None,
+        stale_while_revalidate: float | None = None,
+        executor: Executor | None = None,
     ) -> None:
         self.__name__: str | None = None
         # pyrefly: ignore [bad-argument-type]
         _ = update_wrapper(self, prop)  # type: ignore[arg-type] # ty: ignore[invalid-argument-type] # pyright: ignore[reportArgumentType, reportUnknownVariableType]
 
         self._prop = prop
+        self._compute_func: C_prop[S, R] = (
+            prop if backend is None else _persistent(prop, backend, None)
+        )
 
         if key is None:
             key = prop.__name__  # ty: ignore[unresolved-attribute]
@@ -70,6 +1204,24 @@ class CachedProperty(Generic[S, R]):
             raise TypeError(msg)
         self._key = key
         self._check_use_cache = check_use_cache
+        self._ttl = _validate_ttl(ttl)
+        self._stale = _validate_stale(stale_while_revalidate, self._ttl)
+        if self._stale is not None and iscoroutinefunction(prop):
+            msg = "stale_while_revalidate is not supported for coroutine functions"
+            raise ValueError(msg)
+        self._executor = executor
+        self._lock = lock
+        self._stats = _make_stats(prop, key, stats)
+        self._cache_spec = _CacheSpec(
+            key,
+            self._stats,
+            _validate_names(depends_on, "depends_on"),
+            tags=_validate_names(tags, "tags"),
+            ttl=self._ttl,
+            max_bytes=None
+            if max_bytes is None
+            else _validate_limits(None, max_bytes)[1],
+        )
 
     def __set_name__(self, owner: type[Any], name: str) -> None:
         if self.__name__ is None:  # pragma: no cover
@@ -80,6 +1232,8 @@ class CachedProperty(Generic[S, R]):
                 f"({self.__name__!r} and {name!r})."
             )
             raise TypeError(msg)
+        # check dependencies on class creation.
+        _ = _get_dependents(owner)
 
     @overload
     def __get__(self, instance: None, owner: type[Any] | None = None) -> Self: ...
@@ -93,335 +1247,2224 @@ class CachedProperty(Generic[S, R]):
             return self
 
         if (not self._check_use_cache) or (getattr(instance, "_use_cache", False)):
-            try:
-                return cast(
-                    "R",
-                    instance._cache[self._key],
-                )
+            try:  # ruff:ignore[too-many-statements-in-try-clause]
+                if self._ttl is None:
+                    value = instance._cache[self._key]
+                elif self._stale is None:
+                    value = _get_entry(instance._cache, self._key, self._ttl)
+                else:
+                    value = self._get_stale(instance, self._stale)
             except AttributeError:
                 object.__setattr__(instance, "_cache", {})
             except KeyError:
                 pass
+            else:
+                if self._stats is not None:
+                    self._stats.hits += 1
+                if _budget is not None:
+                    _budget.touch(instance, self._key, NO_SUBKEY)
+                return cast("R", value)
+            return self._miss(instance)
 
-            instance._cache[self._key] = ret = self._prop(instance)
+        return self._prop(instance)
 
-            return ret
+    def _miss(self, instance: S) -> R:
+        if self._lock or _inflight:
+            return cast(
+                "R",
+                _single_flight(
+                    instance,
+                    self._key,
+                    partial(_get_entry, instance._cache, self._key, self._ttl),
+                    partial(self._compute, instance),
+                    self._lock,
+                    self._stats,
+                ),
+            )
+        return self._compute(instance)
 
-        return self._prop(instance)
+    def _get_stale(self, instance: S, window: float) -> Any:
+        value, expired = _get_stale_entry(instance._cache, self._key, window)
+        if expired:
+            _revalidate(
+                instance, self._key, partial(self._compute, instance), self._executor
+            )
+        return value
+
+    def _compute(self, instance: S) -> R:
+        start = perf_counter()
+        ret = (
+            self._compute_func(instance)
+            if self._stats is None
+            else cast("R", self._stats.call(self._compute_func, instance))
+        )
+        _store_value(instance, self._cache_spec, ret, start)
+        return ret
 
     def __set__(self, instance: S | None, value: R) -> None:
         msg = f"can't set attribute {self._prop.__name__}"  # ty: ignore[unresolved-attribute]
         raise AttributeError(msg)
 
 
-@overload
-def decorate(
-    *,
-    key: str | None = ...,
-    check_use_cache: bool = ...,
-    as_property: Literal[False],
-) -> Callable[[C_meth[S, P, R]], C_meth[S, P, R]]:  # pyre-ignore
-    ...
+class _PlainCachedProperty(CachedProperty[S, R]):
+    """
+    :class:`CachedProperty` without ``ttl`` or statistics.
 
+    Used by :func:`prop` for a faster hit path.
+    """
 
-@overload
-def decorate(
-    *,
-    key: str | None = ...,
-    check_use_cache: bool = ...,
-    as_property: Literal[True] = ...,
-) -> Callable[[C_prop[S, R]], CachedProperty[S, R]]: ...
+    @overload
+    def __get__(self, instance: None, owner: type[Any] | None = None) -> Self: ...
 
+    @overload
+    # pyrefly: ignore [inconsistent-overload]
+    def __get__(self, instance: S, owner: type[Any] | None = None) -> R: ...
 
-@overload
-def decorate(
-    *,
-    key: str | None = ...,
-    check_use_cache: bool = ...,
-    as_property: bool,
-) -> (
-    Callable[[C_meth[S, P, R]], C_meth[S, P, R]]
-    | Callable[[C_prop[S, R]], CachedProperty[S, R]]
-): ...
+    @override
+    def __get__(self, instance: S | None, owner: type[Any] | None = None) -> Self | R:
+        if instance is None:
+            return self
 
+        if (not self._check_use_cache) or (getattr(instance, "_use_cache", False)):
+            try:
+                value = instance._cache[self._key]
+            except AttributeError:
+                object.__setattr__(instance, "_cache", {})
+            except KeyError:
+                pass
+            else:
+                if _budget is not None:
+                    _budget.touch(instance, self._key, NO_SUBKEY)
+                return value  # type: ignore[no-any-return]
+            return self._miss(instance)
 
-def decorate(
-    *,
-    key: str | None = None,
-    check_use_cache: bool = False,
-    as_property: bool = True,
-) -> (
-    Callable[[C_prop[S, R]], CachedProperty[S, R]]
-    | Callable[[C_meth[S, P, R]], C_meth[S, P, R]]
-):
+        return self._prop(instance)
+
+
+class AsyncCachedProperty(CachedProperty[S, R]):
     """
-    General purpose cached decorator.
+    Cached property for coroutine functions.
+
+    Accessing the property returns an awaitable.  The awaited result, not the
+    coroutine, is stored in ``_cache``.  Concurrent awaiters of an uncached
+    value share a single computation, and failures are not cached.  This is
+    used by :func:`prop` when decorating an ``async def``.
 
-    Must always be called.
+    Examples
+    --------
+    >>> class Example:
+    ...     @prop
+    ...     async def value(self) -> int:
+    ...         print("calling value")
+    ...         return 1
+    >>> x = Example()
+    >>> asyncio.run(x.value)
+    calling value
+    1
+    >>> asyncio.run(x.value)
+    1
+    >>> x._cache
+    {'value': 1}
     """
-    if as_property:
-        return prop(key=key, check_use_cache=check_use_cache)
-    return meth(key=key, check_use_cache=check_use_cache)
+
+    @overload
+    def __get__(self, instance: None, owner: type[Any] | None = None) -> Self: ...
+
+    @overload
+    # pyrefly: ignore [inconsistent-overload]
+    def __get__(self, instance: S, owner: type[Any] | None = None) -> R: ...
+
+    @override
+    def __get__(self, instance: S | None, owner: type[Any] | None = None) -> Self | R:
+        if instance is None:
+            return self
+        return cast("R", self._aget(instance))
+
+    async def _aget(self, instance: S) -> Any:
+        if (not self._check_use_cache) or (getattr(instance, "_use_cache", False)):
+            try:
+                value = _get_entry(instance._cache, self._key, self._ttl)
+            except AttributeError:
+                object.__setattr__(instance, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
+            except KeyError:
+                pass
+            else:
+                if self._stats is not None:
+                    self._stats.hits += 1
+                if _budget is not None:
+                    _budget.touch(instance, self._key, NO_SUBKEY)
+                return value
+
+            return await _await_single_flight(
+                instance, self._key, partial(self._acompute, instance), self._stats
+            )
+
+        return await cast("Awaitable[Any]", self._prop(instance))
+
+    async def _acompute(self, instance: S) -> Any:
+        start = perf_counter()
+        ret = await (
+            cast("Awaitable[Any]", self._compute_func(instance))
+            if self._stats is None
+            else self._stats.acall(
+                cast("Callable[[S], Awaitable[Any]]", self._compute_func), instance
+            )
+        )
+        _store_value(instance, self._cache_spec, ret, start)
+        return ret
+
+
+class CachedSlotProperty(Generic[T, R]):
+    """
+    Cached property stored in a slot of the instance instead of ``_cache``.
+
+    Intended for classes with ``__slots__`` and many instances.  Each
+    property is stored in its own slot (named ``_cached_{key}`` by default),
+    which the class must declare in ``__slots__``.  This avoids a ``_cache``
+    dictionary per instance, and a lookup is a single slot access.  An unset
+    slot marks a value not yet computed.
+
+    Parameters
+    ----------
+    prop : callable
+        Function to compute the property.
+    key : str, optional
+        Name of the property used by :func:`clear`, ``depends_on`` and
+        statistics.  Defaults to ``prop.__name__``.
+    check_use_cache : bool, default=False
+        If `True`, only cache if ``instance._use_cache`` is `True`.
+    stats : bool, optional
+        If `True`, record statistics (see :func:`info`).
+    depends_on : str or iterable of str
+        Names of attributes or cache keys this property depends on.
+    tags : str or iterable of str
+        Tags of this property.  See :func:`clear`.
+    slot : str, optional
+        Name of slot.  Defaults to ``f"_cached_{key}"``.
+
+    See Also
+    --------
+    slot_prop : decorator interface
+    """
+
+    def __init__(
+        self,
+        prop: Callable[[T], R],
+        key: str | None = None,
+        check_use_cache: bool = False,
+        stats: bool | None = None,
+        depends_on: str | Iterable[str] = (),
+        tags: str | Iterable[str] = (),
+        slot: str | None = None,
+    ) -> None:
+        _ = update_wrapper(self, prop)  # type: ignore[arg-type]  # pyright: ignore[reportArgumentType]
+        self._prop = prop
+        self._key: str = prop.__name__ if key is None else key
+        self._slot_name = f"_cached_{self._key}" if slot is None else slot
+        self._check_use_cache = check_use_cache
+        self._stats = _make_stats(prop, self._key, stats)
+        self._cache_spec = _CacheSpec(
+            self._key,
+            self._stats,
+            _validate_names(depends_on, "depends_on"),
+            self._slot_name,
+            _validate_names(tags, "tags"),
+        )
+
+    def __set_name__(self, owner: type[Any], name: str) -> None:
+        slot = getattr(owner, self._slot_name, None)
+        if not isinstance(slot, MemberDescriptorType):
+            msg = (
+                f"{owner.__qualname__} must declare slot {self._slot_name!r} "
+                f"in __slots__ for cached property {name!r}"
+            )
+            raise TypeError(msg)
+        # attrgetter is faster than calling ``slot.__get__`` directly.
+        self._get_slot = attrgetter(self._slot_name)
+        self._set_slot = slot.__set__
+        # check dependencies on class creation.
+        _ = _get_dependents(owner)
+
+    @overload
+    def __get__(self, instance: None, owner: type[Any] | None = None) -> Self: ...
+
+    @overload
+    # pyrefly: ignore [inconsistent-overload]
+    def __get__(self, instance: T, owner: type[Any] | None = None) -> R: ...
+
+    def __get__(self, instance: T | None, owner: type[Any] | None = None) -> Self | R:
+        if instance is None:
+            return self
+
+        if self._check_use_cache and not getattr(instance, "_use_cache", False):
+            return self._prop(instance)
+
+        try:
+            value = self._get_slot(instance)
+        except AttributeError:
+            pass
+        else:
+            if self._stats is not None:
+                self._stats.hits += 1
+            return cast("R", value)
+
+        ret = (
+            self._prop(instance)
+            if self._stats is None
+            else cast("R", self._stats.call(self._prop, instance))
+        )
+        self._set_slot(instance, ret)
+        return ret
+
+    def __set__(self, instance: T | None, value: R) -> None:
+        msg = f"can't set attribute {self._key}"
+        raise AttributeError(msg)
+
+
+class _PlainCachedSlotProperty(CachedSlotProperty[T, R]):
+    """
+    :class:`CachedSlotProperty` without ``check_use_cache`` or statistics.
+
+    Used by :func:`slot_prop` for a faster hit path.
+    """
+
+    @overload
+    def __get__(self, instance: None, owner: type[Any] | None = None) -> Self: ...
+
+    @overload
+    # pyrefly: ignore [inconsistent-overload]
+    def __get__(self, instance: T, owner: type[Any] | None = None) -> R: ...
+
+    @override
+    def __get__(self, instance: T | None, owner: type[Any] | None = None) -> Self | R:
+        if instance is None:
+            return self
+        try:
+            return self._get_slot(instance)  # type: ignore[no-any-return]
+        except AttributeError:
+            pass
+        ret = self._prop(instance)
+        self._set_slot(instance, ret)
+        return ret
+
+
+@overload
+def slot_prop(
+    func: Callable[[T], R],
+    /,
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    slot: str | None = ...,
+) -> CachedSlotProperty[T, R]: ...
+
+
+@overload
+def slot_prop(
+    func: None = None,
+    /,
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    slot: str | None = ...,
+) -> Callable[[Callable[[T], R]], CachedSlotProperty[T, R]]: ...
+
+
+def slot_prop(
+    func: Callable[[T], R] | None = None,
+    /,
+    *,
+    key: str | None = None,
+    check_use_cache: bool = False,
+    stats: bool | None = None,
+    depends_on: str | Iterable[str] = (),
+    tags: str | Iterable[str] = (),
+    slot: str | None = None,
+) -> CachedSlotProperty[T, R] | Callable[[Callable[[T], R]], CachedSlotProperty[T, R]]:
+    """
+    Decorator to cache a property in a slot.
+
+    Like :func:`prop`, but the value is stored in slot ``slot`` (default
+    ``f"_cached_{key}"``) of the instance, which must be declared in
+    ``__slots__``.  The class does not need a ``_cache`` attribute.  Values
+    are removed by :func:`clear` and :func:`auto_clear` as usual.
+
+    Parameters
+    ----------
+    func : callable
+        Positional only.
+    key : str, optional
+    check_use_cache : bool, default=False
+    stats : bool, optional
+    depends_on : str or iterable of str
+    tags : str or iterable of str
+    slot : str, optional
+        See :class:`CachedSlotProperty`.  Keyword only.
+
+    See Also
+    --------
+    prop : properties cached in ``_cache``
+    CachedSlotProperty
+
+    Examples
+    --------
+    >>> class Point:
+    ...     __slots__ = ("_cached_norm", "x", "y")
+    ...
+    ...     def __init__(self, x, y):
+    ...         self.x, self.y = x, y
+    ...
+    ...     @slot_prop
+    ...     def norm(self):
+    ...         print("calling norm")
+    ...         return (self.x**2 + self.y**2) ** 0.5
+    ...
+    ...     @clear("norm")
+    ...     def move(self, x, y):
+    ...         self.x, self.y = x, y
+    >>> p = Point(3, 4)
+    >>> p.norm, p.norm
+    calling norm
+    (5.0, 5.0)
+    >>> p.move(6, 8)
+    >>> p.norm
+    calling norm
+    10.0
+    """
+    depends_on = _validate_names(depends_on, "depends_on")
+    tags = _validate_names(tags, "tags")
+
+    def decorator(func: Callable[[T], R]) -> CachedSlotProperty[T, R]:
+        if iscoroutinefunction(func):
+            msg = "slot_prop does not support coroutine functions.  Use prop."
+            raise TypeError(msg)
+        # properties without check_use_cache or statistics use a faster hit path.
+        cls: type[CachedSlotProperty[T, R]] = (
+            _PlainCachedSlotProperty
+            if not check_use_cache and not (CACHE_STATS if stats is None else stats)
+            else CachedSlotProperty
+        )
+        return cls(
+            func,
+            key=key,
+            check_use_cache=check_use_cache,
+            stats=stats,
+            depends_on=depends_on,
+            tags=tags,
+            slot=slot,
+        )
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+@overload
+def decorate(
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    as_property: Literal[False],
+    maxsize: int | None = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    backend: CacheBackend | None = ...,
+) -> Callable[[C_meth[S, P, R]], C_meth[S, P, R]]:  # pyre-ignore
+    ...
+
+
+@overload
+def decorate(
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    as_property: Literal[True] = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    backend: CacheBackend | None = ...,
+) -> Callable[[C_prop[S, R]], CachedProperty[S, R]]: ...
+
+
+@overload
+def decorate(
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    as_property: bool,
+    maxsize: int | None = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    backend: CacheBackend | None = ...,
+) -> (
+    Callable[[C_meth[S, P, R]], C_meth[S, P, R]]
+    | Callable[[C_prop[S, R]], CachedProperty[S, R]]
+): ...
+
+
+def decorate(
+    *,
+    key: str | None = None,
+    check_use_cache: bool = False,
+    as_property: bool = True,
+    maxsize: int | None = None,
+    max_bytes: int | str | None = None,
+    ttl: float | None = None,
+    lock: bool = False,
+    stats: bool | None = None,
+    depends_on: str | Iterable[str] = (),
+    tags: str | Iterable[str] = (),
+    key_func: Callable[..., Hashable] | None = None,
+    backend: CacheBackend | None = None,
+) -> (
+    Callable[[C_prop[S, R]], CachedProperty[S, R]]
+    | Callable[[C_meth[S, P, R]], C_meth[S, P, R]]
+):
+    """
+    General purpose cached decorator.
+
+    Must always be called.  Options ``maxsize`` and ``key_func`` are only
+    valid with ``as_property=False``.  See :func:`meth`.
+    """
+    if as_property:
+        if maxsize is not None or key_func is not None:
+            msg = "maxsize and key_func only apply to methods.  Use as_property=False."
+            raise ValueError(msg)
+        return prop(
+            key=key,
+            check_use_cache=check_use_cache,
+            max_bytes=max_bytes,
+            ttl=ttl,
+            lock=lock,
+            stats=stats,
+            depends_on=depends_on,
+            tags=tags,
+            backend=backend,
+        )
+    return meth(
+        key=key,
+        check_use_cache=check_use_cache,
+        maxsize=maxsize,
+        max_bytes=max_bytes,
+        ttl=ttl,
+        lock=lock,
+        key_func=key_func,
+        backend=backend,
+        stats=stats,
+        depends_on=depends_on,
+        tags=tags,
+    )
+
+
+@overload
+def prop(
+    func: C_prop[S, R],
+    /,
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    backend: CacheBackend | None = ...,
+) -> CachedProperty[S, R]: ...
+
+
+@overload
+def prop(
+    func: None = None,
+    /,
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    backend: CacheBackend | None = ...,
+) -> Callable[[C_prop[S, R]], CachedProperty[S, R]]: ...
+
+
+def prop(
+    func: C_prop[S, R] | None = None,
+    /,
+    *,
+    key: str | None = None,
+    check_use_cache: bool = False,
+    max_bytes: int | str | None = None,
+    ttl: float | None = None,
+    stale_while_revalidate: float | None = None,
+    executor: Executor | None = None,
+    lock: bool = False,
+    stats: bool | None = None,
+    depends_on: str | Iterable[str] = (),
+    tags: str | Iterable[str] = (),
+    backend: CacheBackend | None = None,
+) -> CachedProperty[S, R] | Callable[[C_prop[S, R]], CachedProperty[S, R]]:
+    """
+    Decorator to cache a property within a class.
+
+    Parameters
+    ----------
+    func: callable
+        This parameter is used in the case that you decorate without ().
+        That is, you can decorate with ``@prop`` or ``@prop()``.
+        Positional only.
+    key : string, optional
+        Optional key for storage in `_cache`.
+        Default to attribute/method ``__name__``.
+        Keyword only.
+    check_use_cache : bool, default=False
+        If `True`, then only apply caching if
+        ``self._use_cache = True``.
+        Note that the default value of `self._use_cache` is `False`.
+        If `False`, then always apply caching.
+        Keyword only.
+    max_bytes : int or str, optional
+        Limit in bytes (or a string like ``"2GB"``) on the total size of
+        cached values of the properties of an instance which pass
+        ``max_bytes``.  Storing this property removes the largest other
+        such values until the total is within ``max_bytes``.  A value larger
+        than ``max_bytes`` is not cached.  Sizes are estimated by
+        :func:`sizeof`.
+        Keyword only.
+    ttl : float, optional
+        Time to live in seconds.  Once a cached value is older than `ttl`, it
+        is recomputed on the next access.  Default is to never expire.
+        Keyword only.
+    stale_while_revalidate : float, optional
+        Seconds after a value expires during which it is still returned,
+        while a single refresh per instance is computed on ``executor``.
+        Accesses spanning the expiry then do not wait for the computation.
+        Once the window has passed, the value is recomputed on access.
+        Requires ``ttl``.  Not supported for coroutine functions.
+        Keyword only.
+    executor : concurrent.futures.Executor, optional
+        Executor for refreshing stale values.  Defaults to a thread pool
+        shared with :func:`warm`.
+        Keyword only.
+    lock : bool, default=False
+        If `True`, threads accessing an uncached property on the same
+        instance compute it only once.  Other threads wait for the result.
+        Cache hits are lock free.
+        Keyword only.
+    stats : bool, optional
+        If `True`, record hits, misses and compute time (see :func:`info`).
+        Default is set by environment variable
+        ``MODULE_UTILITIES_CACHE_STATS``, which defaults to `False`.
+        Keyword only.
+    depends_on : str or iterable of str
+        Names of attributes, properties or cache keys this property depends
+        on.  Clearing any of these with :func:`clear` also clears this
+        property.  Names which are not attributes of the class (set in its
+        body or methods) or cache keys, and cyclic dependencies, raise
+        :class:`ValueError` when the class is created.
+        Keyword only.
+    tags : str or iterable of str
+        Tags of this property.  ``clear(tags=...)`` with any of these tags
+        clears this property.
+        Keyword only.
+    backend : CacheBackend, optional
+        Persistent or shared storage consulted before computing the
+        property, for example :class:`SharedMemoryBackend` to share arrays
+        between worker processes.  See :func:`meth`.
+        Keyword only.
+
+    See Also
+    --------
+    clear : corresponding decorator to clear cache
+    meth : decorator for cache creation of function
+
+    Notes
+    -----
+    Options other than `func` must be passed by keyword.
+
+    Decorating a coroutine function creates an :class:`AsyncCachedProperty`,
+    which caches the awaited result.
+
+    Examples
+    --------
+    >>> class A:
+    ...     def __init__(self):
+    ...         # this isn't strictly needed as it will be created on demand
+    ...         # but should be included if using static typing (mypy, etc)
+    ...         self._cache = {}
+    ...
+    ...     @prop(key="keyname")
+    ...     def size(self):
+    ...         '''
+    ...         This code gets ran only if the lookup of keyname fails
+    ...         After this code has been ran once, the result is stored in
+    ...         _cache with the key: 'keyname'
+    ...         '''
+    ...         print("set size")
+    ...         return [10]
+    ...
+    ...     # no arguments implies give cache function name
+    ...     @prop
+    ...     def myprop(self):
+    ...         print("set myprop")
+    ...         return [1.0]
+    ...
+    ...     @prop(check_use_cache=True)
+    ...     def checker(self):
+    ...         print("set checker")
+    ...         return [2.0]
+
+    >>> x = A()
+    >>> x.size
+    set size
+    [10]
+    >>> x._cache["keyname"] is x.size
+    True
+
+    >>> x.size
+    [10]
+
+    >>> x.myprop
+    set myprop
+    [1.0]
+    >>> x._cache["myprop"] is x.myprop
+    True
+    >>> x.myprop
+    [1.0]
+
+    If you pass ``check_use_cache=True`` and
+    either `_use_cache=False` or the instance doesn't have
+    That property, then caching will NOT be done.
+
+    >>> x.checker
+    set checker
+    [2.0]
+    >>> x.checker
+    set checker
+    [2.0]
+    """
+    ttl = _validate_ttl(ttl)
+    stale_while_revalidate = _validate_stale(stale_while_revalidate, ttl)
+    depends_on = _validate_names(depends_on, "depends_on")
+    tags = _validate_names(tags, "tags")
+
+    def cached_lookup(_func: C_prop[S, R]) -> CachedProperty[S, R]:
+        if iscoroutinefunction(_func):
+            return AsyncCachedProperty[S, R](
+                prop=cast("C_prop[S, R]", _func),
+                key=key,
+                check_use_cache=check_use_cache,
+                ttl=ttl,
+                stats=stats,
+                depends_on=depends_on,
+                tags=tags,
+                backend=backend,
+                max_bytes=max_bytes,
+                stale_while_revalidate=stale_while_revalidate,
+            )
+        # properties without ttl or statistics use a faster hit path.
+        cls: type[CachedProperty[S, R]] = (
+            _PlainCachedProperty
+            if ttl is None and not (CACHE_STATS if stats is None else stats)
+            else CachedProperty
+        )
+        return cls(
+            prop=_func,
+            key=key,
+            check_use_cache=check_use_cache,
+            ttl=ttl,
+            lock=lock,
+            stats=stats,
+            depends_on=depends_on,
+            tags=tags,
+            backend=backend,
+            max_bytes=max_bytes,
+            stale_while_revalidate=stale_while_revalidate,
+            executor=executor,
+        )
+
+    if func:
+        return cached_lookup(func)
+    return cached_lookup
+
+
+def _instance_token(instance: Any) -> Any:
+    try:
+        return instance._cache_token
+    except AttributeError:
+        msg = (
+            f"{type(instance).__qualname__} must define attribute `_cache_token` "
+            "to use a cache backend"
+        )
+        raise TypeError(msg) from None
+
+
+def _release(backend: CacheBackend, key: str) -> None:
+    """Release claim on ``key`` of backends which claim keys on lookup."""
+    if (release := getattr(backend, "release", None)) is not None:
+        with contextlib.suppress(*BACKEND_ERRORS):
+            release(key)
+
+
+def _persistent(  # ruff:ignore[complex-structure]
+    func: Callable[..., Any],
+    backend: CacheBackend,
+    key_func: Callable[..., Hashable] | None,
+) -> Any:
+    """Wrap ``func`` to look up results in ``backend`` before calling."""
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    make_key = cast("Callable[..., Hashable]", key_func)
+
+    def make_key_first(self: Any, /, *args: Any, **kwargs: Any) -> Hashable:
+        nonlocal make_key
+        make_key = key_builder(signature(func), func.__name__)
+        return make_key(self, *args, **kwargs)
+
+    if key_func is None:
+        make_key = make_key_first
+
+    def backend_key(
+        self: Any, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> str | None:
+        try:
+            params: Hashable | None = make_key(self, *args, **kwargs)
+        except TypeError:
+            params = adapted_key(make_key, self, args, kwargs)
+        if params is None:
+            return None
+        token = _instance_token(self)
+        try:
+            return stable_hash((name, token, params))
+        except TypeError:
+            # no stable key, so only cached in memory.
+            return None
+
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(self: Any, /, *args: Any, **kwargs: Any) -> Any:
+            if (digest := backend_key(self, args, kwargs)) is None:
+                return await func(self, *args, **kwargs)
+            with contextlib.suppress(KeyError, *BACKEND_ERRORS):
+                return backend[digest]
+            try:
+                value = await func(self, *args, **kwargs)
+            except BaseException:
+                _release(backend, digest)
+                raise
+            with contextlib.suppress(*BACKEND_ERRORS):
+                backend[digest] = value
+            return value
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(self: Any, /, *args: Any, **kwargs: Any) -> Any:
+        if (digest := backend_key(self, args, kwargs)) is None:
+            return func(self, *args, **kwargs)
+        with contextlib.suppress(KeyError, *BACKEND_ERRORS):
+            return backend[digest]
+        try:
+            value = func(self, *args, **kwargs)
+        except BaseException:
+            _release(backend, digest)
+            raise
+        with contextlib.suppress(*BACKEND_ERRORS):
+            backend[digest] = value
+        return value
+
+    return wrapper
+
+
+def _takes_only_self(func: Callable[..., Any]) -> bool:
+    """
+    Whether ``func`` has a single parameter.
+
+    Read from the code object of plain functions, as :func:`inspect.signature`
+    is slow enough to matter when decorating many methods at import.
+    """
+    if (
+        type(func) is not FunctionType
+        or hasattr(func, "__wrapped__")
+        or hasattr(func, "__signature__")
+    ):
+        return len(signature(func).parameters) == 1
+    code = func.__code__
+    n = (
+        code.co_argcount
+        + code.co_kwonlyargcount
+        + bool(code.co_flags & CO_VARARGS)
+        + bool(code.co_flags & CO_VARKEYWORDS)
+    )
+    return n == 1
+
+
+@overload
+def meth(
+    func: C_meth[S, P, R],
+    /,
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    maxsize: int | None = ...,
+    policy: Literal["lru", "cost", "tinylfu"] = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    min_compute_time: float | None = ...,
+    admit: Callable[[Any], bool] | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    weak_args: bool = ...,
+    backend: CacheBackend | None = ...,
+) -> C_meth[S, P, R]: ...
+
+
+@overload
+def meth(
+    func: None = None,
+    /,
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    maxsize: int | None = ...,
+    policy: Literal["lru", "cost", "tinylfu"] = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    min_compute_time: float | None = ...,
+    admit: Callable[[Any], bool] | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    weak_args: bool = ...,
+    backend: CacheBackend | None = ...,
+) -> Callable[[C_meth[S, P, R]], C_meth[S, P, R]]: ...
+
+
+def meth(  # ruff:ignore[complex-structure, too-many-arguments, too-many-statements]
+    func: C_meth[S, P, R] | None = None,
+    /,
+    *,
+    key: str | None = None,
+    check_use_cache: bool = False,
+    maxsize: int | None = None,
+    policy: Literal["lru", "cost", "tinylfu"] = "lru",
+    max_bytes: int | str | None = None,
+    ttl: float | None = None,
+    stale_while_revalidate: float | None = None,
+    executor: Executor | None = None,
+    min_compute_time: float | None = None,
+    admit: Callable[[Any], bool] | None = None,
+    lock: bool = False,
+    stats: bool | None = None,
+    depends_on: str | Iterable[str] = (),
+    tags: str | Iterable[str] = (),
+    key_func: Callable[..., Hashable] | None = None,
+    weak_args: bool = False,
+    backend: CacheBackend | None = None,
+) -> C_meth[S, P, R] | Callable[[C_meth[S, P, R]], C_meth[S, P, R]]:
+    """
+    Decorator to cache a function within a class
+
+    Requires the Class to have a cache dict called ``_cache``.
+
+    Coroutine functions are supported.  In this case the awaited result is
+    cached, and concurrent awaiters with the same arguments share a single
+    computation.
+
+    Parameters
+    ----------
+    func: callable
+        This parameter is used in the case that you decorate without ().
+        Positional only.
+    key : string, optional
+        Optional key for storage in `_cache`.
+        Default to method ``__name__``.
+        Keyword only.
+    check_use_cache : bool, default=False
+        If `True`, then only apply caching if
+        ``self._use_cache = True``.
+        Keyword only.
+    maxsize : int, optional
+        If passed, store at most ``maxsize`` distinct argument combinations
+        per instance, evicting an entry chosen by ``policy`` once full.
+        Default is to store all results.  Ignored for methods which take
+        only ``self``.
+        Keyword only.
+    policy : {"lru", "cost", "tinylfu"}
+        Eviction policy used with ``maxsize``.  ``"lru"`` (default) evicts
+        the least recently used entry.  ``"cost"`` uses
+        :class:`GreedyDualSizeCache`, which prefers to keep results that were
+        expensive to compute relative to their size (see :func:`sizeof`).
+        Compute time of evicted entries is reported in
+        :attr:`CacheInfo.evicted_compute_time`.  ``"tinylfu"`` uses
+        :class:`TinyLFUCache`, which only admits frequently used results, so
+        that arguments used once do not evict the others.
+        Keyword only.
+    max_bytes : int or str, optional
+        If passed, limit the total size of stored results per instance to
+        ``max_bytes`` bytes (or a string like ``"2GB"``), evicting entries
+        chosen by ``policy`` until back under the limit.  A result larger
+        than ``max_bytes`` is not stored.  Sizes are estimated by
+        :func:`sizeof`.  May be combined with ``maxsize``.  Not supported
+        with ``policy="tinylfu"``.  For methods which take only ``self``, the
+        result is not stored if larger than ``max_bytes``.
+        Keyword only.
+    ttl : float, optional
+        Time to live in seconds.  Results are stored as ``(value, expires)``
+        and recomputed once expired.  Default is to never expire.
+        Keyword only.
+    stale_while_revalidate : float, optional
+        Seconds after a result expires during which it is still returned,
+        while a single refresh per instance and arguments is computed on
+        ``executor``.  See :func:`prop`.  Requires ``ttl``.  Not supported
+        for coroutine functions.
+        Keyword only.
+    executor : concurrent.futures.Executor, optional
+        Executor for refreshing stale results.  Defaults to a thread pool
+        shared with :func:`warm`.
+        Keyword only.
+    min_compute_time : float, optional
+        If passed, only store results which took longer than
+        ``min_compute_time`` seconds to compute.  Cheap results are
+        returned, but recomputed on each call.
+        Keyword only.
+    admit : callable, optional
+        Function ``admit(result) -> bool``.  If passed, only store results
+        for which it returns `True`.  Results not stored because of
+        ``min_compute_time`` or ``admit`` are counted in
+        :attr:`CacheInfo.rejections`.
+        Keyword only.
+    lock : bool, default=False
+        If `True`, threads calling with the same instance and arguments
+        compute the result only once.  Other threads wait for the result.
+        Cache hits are lock free.
+        Keyword only.
+    key_func : callable, optional
+        Function ``key_func(self, *args, **kwargs)`` returning the hashable key
+        for the arguments.  Default is ``(args, frozenset(kwargs.items()))``
+        after binding to the signature and applying defaults.
+        Keyword only.
+    weak_args : bool, default=False
+        If `True`, arguments supporting weak references (for example, models
+        or datasets) are keyed by weak reference, so that caching does not
+        extend their lifetime.  Results are removed once any such argument
+        is garbage collected.  Arguments are still compared by equality.
+        Not supported with ``backend``.
+        Keyword only.
+    backend : CacheBackend, optional
+        Persistent storage (for example, :class:`SQLiteBackend`) shared
+        between processes and restarts.  Results missing from ``_cache`` are
+        looked up in ``backend`` before being computed, and stored in both.
+        Backend keys are a :func:`stable_hash` of the qualified method name,
+        the instance attribute ``_cache_token``, and the arguments, so
+        instances must define ``_cache_token`` identifying their state.
+        Results are only cached in memory if the arguments have no stable
+        hash, or if the backend fails to load or store them (for example,
+        unpicklable results, or database errors).  Backend entries are not
+        removed by :func:`clear`.
+        Keyword only.
+    stats : bool, optional
+        If `True`, record hits, misses, evictions and compute time (see
+        :func:`info`).  Default is set by environment variable
+        ``MODULE_UTILITIES_CACHE_STATS``, which defaults to `False`.
+        Keyword only.
+    depends_on : str or iterable of str
+        Names of attributes, properties or cache keys this method depends
+        on.  Clearing any of these with :func:`clear` also clears all cached
+        results of this method.  Unknown names and cyclic dependencies raise
+        :class:`ValueError` (see :func:`prop`), when the class is created if
+        it has cached properties or is decorated with :func:`auto_clear`, and
+        otherwise on first use of the dependencies.
+        Keyword only.
+    tags : str or iterable of str
+        Tags of this method.  ``clear(tags=...)`` with any of these tags
+        clears all cached results of this method.
+        Keyword only.
+
+    See Also
+    --------
+    clear : corresponding decorator to remove cache
+    prop : decorator for properties
+
+    Notes
+    -----
+    Arguments which cannot be hashed are converted to keys with the adapters
+    registered with :func:`register_key_adapter`.  Lists, dicts, sets and
+    NumPy arrays (by content) are supported by default.  If arguments still
+    cannot be hashed, the method is called without caching.
+
+    Examples
+    --------
+    >>> class A(object):
+    ...     @meth(key="key")
+    ...     def method(self, x, y=2):
+    ...         # This code gets ran only if the lookup of keyname fails
+    ...         # After this code has been ran once, the result is stored in
+    ...         # _cache with the key: 'keyname'
+    ...         # a long calculation....
+    ...         print("calling method")
+    ...         return [x, y]
+
+    >>> x = A()
+    >>> x.method(1, 2)
+    calling method
+    [1, 2]
+
+    This will respect default params
+
+    >>> x.method(1)
+    [1, 2]
+
+    And keyword arguments
+
+    >>> x.method(y=2, x=1)
+    [1, 2]
+    >>> print(x._cache)
+    {'key': {((1, 2), frozenset()): [1, 2]}}
+
+    Limit the number of stored results with ``maxsize``
+
+    >>> class B:
+    ...     @meth(maxsize=2)
+    ...     def method(self, x):
+    ...         print("calling method")
+    ...         return x
+    >>> y = B()
+    >>> y.method(1), y.method(2), y.method(1)
+    calling method
+    calling method
+    (1, 2, 1)
+    >>> y.method(3)
+    calling method
+    3
+    >>> list(y._cache["method"])
+    [((1,), frozenset()), ((3,), frozenset())]
+
+    Or their total size with ``max_bytes``
+
+    >>> class C:
+    ...     @meth(max_bytes="1kB")
+    ...     def zeros(self, n):
+    ...         return bytes(n)
+    >>> z = C()
+    >>> _ = z.zeros(600), z.zeros(300), z.zeros(200)
+    >>> [args for (args, _) in z._cache["zeros"]]
+    [(300,), (200,)]
+
+    Unhashable arguments are cached by value
+
+    >>> y.method([1, 2]), y.method([1, 2])
+    calling method
+    ([1, 2], [1, 2])
+    """
+    if maxsize is not None or max_bytes is not None:
+        maxsize, max_bytes = _validate_limits(maxsize, max_bytes)
+    store_type = _validate_policy(policy)
+    if max_bytes is not None and policy == "tinylfu":
+        msg = "max_bytes is not supported with policy='tinylfu'"
+        raise ValueError(msg)
+    ttl = _validate_ttl(ttl)
+    stale = _validate_stale(stale_while_revalidate, ttl)
+    min_compute_time = _validate_min_compute_time(min_compute_time)
+    depends = _validate_names(depends_on, "depends_on")
+    tag_names = _validate_names(tags, "tags")
+    if weak_args and backend is not None:
+        msg = "weak_args is not supported with backend"
+        raise ValueError(msg)
+
+    def cached_lookup(_func: C_meth[S, P, R]) -> C_meth[S, P, R]:  # ruff:ignore[complex-structure, too-many-statements]
+        key_name = _func.__name__ if key is None else key  # ty: ignore[unresolved-attribute]
+        cache_stats = _make_stats(_func, key_name, stats)
+        # Signature and key builder are only needed for methods with arguments,
+        # and are built on first call.
+        no_args = _takes_only_self(_func)
+        # Without arguments, the single result is stored in ``_cache``, and
+        # ``max_bytes`` only limits its size.
+        admitted = _admission(
+            min_compute_time, admit, cache_stats, max_bytes if no_args else None
+        )
+        if backend is not None:
+            _func = _persistent(_func, backend, key_func)
+        new_store: Callable[[Any], MutableMapping[Any, Any]]
+        if max_bytes is not None:
+            # policy is "lru" or "cost", which support max_bytes.
+            new_store = partial(
+                _bounded_store,
+                partial(
+                    cast("type[LRUCache[Any, Any]]", store_type),
+                    maxsize,
+                    cache_stats,
+                    max_bytes,
+                ),
+                key_name,
+            )
+        elif maxsize is not None:
+            new_store = partial(
+                _bounded_store, partial(store_type, maxsize, cache_stats), key_name
+            )
+        else:
+            # weak argument keys remove entries through a weak reference to it.
+            new_store = _new_weakref_dict if weak_args else _new_dict
+
+        wrapper: Callable[..., Any]
+        if iscoroutinefunction(_func):
+            if stale is not None:
+                msg = "stale_while_revalidate is not supported for coroutine functions"
+                raise ValueError(msg)
+            wrapper = _async_meth(
+                _func,
+                key_name=key_name,
+                no_args=no_args,
+                new_store=new_store,
+                check_use_cache=check_use_cache,
+                ttl=ttl,
+                admitted=admitted,
+                key_func=key_func,
+                weak_args=weak_args,
+                cache_stats=cache_stats,
+            )
+
+        elif no_args:
+            # special case of single (self) parameter.
+            def compute_no_args(
+                self: S,
+                cache: MutableMapping[str, Any],
+                args: tuple[Any, ...],
+                kwargs: dict[str, Any],
+            ) -> R:
+                start = perf_counter()
+                ret = (
+                    _func(self, *args, **kwargs)
+                    if cache_stats is None
+                    else cast("R", cache_stats.call(_func, self, *args, **kwargs))
+                )
+                if admitted is None or admitted(start, ret):
+                    _put(self, cache, key_name, NO_SUBKEY, ret, ttl, start)
+                return ret
+
+            def get_stale_no_args(
+                self: S, window: float, args: tuple[Any, ...], kwargs: dict[str, Any]
+            ) -> Any:
+                value, expired = _get_stale_entry(self._cache, key_name, window)
+                if expired:
+                    _revalidate(
+                        self,
+                        key_name,
+                        partial(compute_no_args, self, self._cache, args, kwargs),
+                        executor,
+                    )
+                return value
+
+            @wraps(_func)
+            def wrapper_no_args(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:
+                if (not check_use_cache) or (getattr(self, "_use_cache", False)):
+                    try:  # ruff:ignore[too-many-statements-in-try-clause]
+                        if ttl is None:
+                            value = self._cache[key_name]
+                        elif stale is None:
+                            value = _get_entry(self._cache, key_name, ttl)
+                        else:
+                            value = get_stale_no_args(self, stale, args, kwargs)
+                    except AttributeError:
+                        object.__setattr__(self, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
+                    except KeyError:
+                        pass
+                    else:
+                        if cache_stats is not None:
+                            cache_stats.hits += 1
+                        if _budget is not None:
+                            _budget.touch(self, key_name, NO_SUBKEY)
+                        return cast("R", value)
+                    return miss_no_args(self, args, kwargs)
+
+                return _func(self, *args, **kwargs)
+
+            @wraps(_func)
+            def wrapper_no_args_plain(
+                self: S, /, *args: P.args, **kwargs: P.kwargs
+            ) -> R:
+                # hit path without ttl or statistics.
+                if (not check_use_cache) or (getattr(self, "_use_cache", False)):
+                    try:
+                        value = self._cache[key_name]
+                    except AttributeError:
+                        object.__setattr__(self, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
+                    except KeyError:
+                        pass
+                    else:
+                        if _budget is not None:
+                            _budget.touch(self, key_name, NO_SUBKEY)
+                        return value  # type: ignore[no-any-return]
+                    return miss_no_args(self, args, kwargs)
+
+                return _func(self, *args, **kwargs)
+
+            def miss_no_args(
+                self: S, args: tuple[Any, ...], kwargs: dict[str, Any]
+            ) -> R:
+                cache = self._cache
+                if lock or _inflight:
+                    return cast(
+                        "R",
+                        _single_flight(
+                            self,
+                            key_name,
+                            partial(_get_entry, cache, key_name, ttl),
+                            partial(compute_no_args, self, cache, args, kwargs),
+                            lock,
+                            cache_stats,
+                        ),
+                    )
+                return compute_no_args(self, cache, args, kwargs)
+
+            wrapper = (
+                wrapper_no_args_plain
+                if ttl is None and cache_stats is None
+                else wrapper_no_args
+            )
+
+        else:
+            # Full method.  Without key_func, keys are built from the signature
+            # on first call, which then replaces the builders.
+            base_make_key = make_key = cast("Callable[..., Hashable]", key_func)
+
+            def make_key_first(self: S, /, *args: Any, **kwargs: Any) -> Hashable:
+                nonlocal base_make_key, make_key
+                base_make_key = key_builder(signature(_func), _func.__name__)  # ty: ignore[unresolved-attribute]
+                make_key = (
+                    _weak_key_builder(base_make_key) if weak_args else base_make_key
+                )
+                return make_key(self, *args, **kwargs)
+
+            if key_func is None:
+                base_make_key = make_key = make_key_first
+            elif weak_args:
+                make_key = _weak_key_builder(key_func)
+
+            def compute(
+                self: S,
+                store: MutableMapping[Any, Any],
+                key_params: Hashable,
+                args: tuple[Any, ...],
+                kwargs: dict[str, Any],
+            ) -> R:
+                start = perf_counter()
+                ret = (
+                    _func(self, *args, **kwargs)
+                    if cache_stats is None
+                    else cast("R", cache_stats.call(_func, self, *args, **kwargs))
+                )
+                if admitted is None or admitted(start, ret):
+                    _put(self, store, key_name, key_params, ret, ttl, start)
+                return ret
+
+            def get_stale(
+                self: S,
+                store: MutableMapping[Any, Any],
+                key_params: Hashable,
+                args: tuple[Any, ...],
+                kwargs: dict[str, Any],
+            ) -> Any:
+                value, expired = _get_stale_entry(
+                    store, key_params, cast("float", stale)
+                )
+                if expired:
+                    _revalidate(
+                        self,
+                        (key_name, key_params),
+                        partial(compute, self, store, key_params, args, kwargs),
+                        executor,
+                    )
+                return value
+
+            @wraps(_func)
+            def wrapper_with_args(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:  # ruff:ignore[complex-structure, too-many-branches]
+                if (not check_use_cache) or (getattr(self, "_use_cache", False)):
+                    if not hasattr(self, "_cache"):
+                        object.__setattr__(self, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
+
+                    if key_name not in self._cache:
+                        self._cache[key_name] = new_store(self)
+
+                    store = self._cache[key_name]
+                    adapted_args = False
+                    try:  # ruff:ignore[too-many-statements-in-try-clause]
+                        key_params = make_key(self, *args, **kwargs)
+                        if ttl is None:
+                            value = store[key_params]
+                        elif stale is None:
+                            value = _get_entry(store, key_params, ttl)
+                        else:
+                            value = get_stale(self, store, key_params, args, kwargs)
+                    except TypeError:
+                        # unhashable arguments.  Try again with key adapters.
+                        adapted = adapted_key(make_key, self, args, kwargs)
+                        if adapted is None:
+                            return _func(self, *args, **kwargs)
+                        key_params, adapted_args = adapted, True
+                        try:
+                            value = (
+                                _get_entry(store, key_params, ttl)
+                                if stale is None
+                                else get_stale(self, store, key_params, args, kwargs)
+                            )
+                        except KeyError:
+                            pass
+                        else:
+                            if cache_stats is not None:
+                                cache_stats.hits += 1
+                            if _budget is not None:
+                                _budget.touch(self, key_name, key_params)
+                            return cast("R", value)
+                    except KeyError:
+                        pass
+                    except Exception as e:  # pragma: no cover
+                        print(f"unknown exception {e} in meth call")  # ruff:ignore[print]
+                        raise
+                    else:
+                        if cache_stats is not None:
+                            cache_stats.hits += 1
+                        if _budget is not None:
+                            _budget.touch(self, key_name, key_params)
+                        return cast("R", value)
+
+                    if weak_args:
+                        key_params = _weak_key(
+                            base_make_key,
+                            self,
+                            args,
+                            kwargs,
+                            store,
+                            adapted_args,
+                            key_name,
+                        )
+
+                    if lock or _inflight:
+                        return cast(
+                            "R",
+                            _single_flight(
+                                self,
+                                (key_name, key_params),
+                                partial(_get_entry, store, key_params, ttl),
+                                partial(compute, self, store, key_params, args, kwargs),
+                                lock,
+                                cache_stats,
+                            ),
+                        )
+                    return compute(self, store, key_params, args, kwargs)
+
+                return _func(self, *args, **kwargs)
+
+            wrapper = wrapper_with_args
+
+        cast("Any", wrapper)._cache_spec = _CacheSpec(
+            key_name, cache_stats, depends, tags=tag_names, ttl=ttl, admitted=admitted
+        )
+        return cast("C_meth[S, P, R]", wrapper)
+
+    if func:
+        return cached_lookup(func)
+
+    return cached_lookup
+
+
+def _async_meth(  # ruff:ignore[complex-structure, too-many-statements]
+    _func: Callable[..., Awaitable[Any]],
+    *,
+    key_name: str,
+    no_args: bool,
+    new_store: Callable[[Any], MutableMapping[Any, Any]],
+    check_use_cache: bool,
+    ttl: float | None,
+    admitted: Callable[[float, Any], bool] | None,
+    key_func: Callable[..., Hashable] | None,
+    weak_args: bool,
+    cache_stats: CacheStats | None,
+) -> Callable[..., Awaitable[Any]]:
+    """Cached wrapper of coroutine function ``_func``.  Used by :func:`meth`."""
+    # As for meth, keys are built from the signature on first call.
+    base_make_key = make_key = cast("Callable[..., Hashable]", key_func)
+
+    def make_key_first(self: Any, /, *args: Any, **kwargs: Any) -> Hashable:
+        nonlocal base_make_key, make_key
+        base_make_key = key_builder(signature(_func), _func.__name__)
+        make_key = _weak_key_builder(base_make_key) if weak_args else base_make_key
+        return make_key(self, *args, **kwargs)
+
+    if key_func is None:
+        base_make_key = make_key = make_key_first
+    elif weak_args:
+        make_key = _weak_key_builder(key_func)
+
+    @wraps(_func)
+    async def wrapper(self: Any, /, *args: Any, **kwargs: Any) -> Any:  # ruff:ignore[complex-structure, too-many-branches]
+        call = partial(_func, self, *args, **kwargs)
+        if (not check_use_cache) or (getattr(self, "_use_cache", False)):
+            if not hasattr(self, "_cache"):
+                object.__setattr__(self, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
+
+            store: MutableMapping[Any, Any] = self._cache
+            key_params: Hashable = key_name
+            if not no_args:
+                if key_name not in self._cache:
+                    self._cache[key_name] = new_store(self)
+                store = self._cache[key_name]
+
+            adapted_args = False
+            try:
+                if not no_args:
+                    key_params = make_key(self, *args, **kwargs)
+                value = _get_entry(store, key_params, ttl)
+            except TypeError:
+                # unhashable arguments.  Try again with key adapters.
+                adapted = adapted_key(make_key, self, args, kwargs)
+                if adapted is None:
+                    return await call()
+                key_params, adapted_args = adapted, True
+                with contextlib.suppress(KeyError):
+                    value = _get_entry(store, key_params, ttl)
+                    if cache_stats is not None:
+                        cache_stats.hits += 1
+                    if _budget is not None:
+                        _budget.touch(
+                            self, key_name, NO_SUBKEY if no_args else key_params
+                        )
+                    return value
+            except KeyError:
+                pass
+            else:
+                if cache_stats is not None:
+                    cache_stats.hits += 1
+                if _budget is not None:
+                    _budget.touch(self, key_name, NO_SUBKEY if no_args else key_params)
+                return value
+
+            if weak_args and not no_args:
+                key_params = _weak_key(
+                    base_make_key, self, args, kwargs, store, adapted_args, key_name
+                )
+
+            async def compute() -> Any:
+                start = perf_counter()
+                ret = await (call() if cache_stats is None else cache_stats.acall(call))
+                if admitted is None or admitted(start, ret):
+                    _put(
+                        self,
+                        store,
+                        key_name,
+                        NO_SUBKEY if no_args else key_params,
+                        ret,
+                        ttl,
+                        start,
+                    )
+                return ret
+
+            return await _await_single_flight(
+                self,
+                key_params if no_args else (key_name, key_params),
+                compute,
+                cache_stats,
+            )
+
+        return await call()
+
+    return wrapper
+
+
+def _batch_lookup(
+    store: MutableMapping[Any, Any], items: list[Any], out: list[Any]
+) -> dict[Any, tuple[Any, list[int]]]:
+    """
+    Fill ``out`` with values of ``items`` found in ``store``.
+
+    Returns keys of unique misses in order of first appearance, mapped to the
+    element and its indices in ``items``.  Unhashable elements are keyed with
+    key adapters, and raise ``TypeError`` if still unhashable.
+    """
+    missing: dict[Any, tuple[Any, list[int]]] = {}
+    for i, item in enumerate(items):
+        try:
+            out[i] = store[item]
+            continue
+        except KeyError:
+            key = item
+        except TypeError:
+            # unhashable element.  Try again with key adapters.
+            key = freeze(item)
+            if key in store:
+                out[i] = store[key]
+                continue
+        missing.setdefault(key, (item, []))[1].append(i)
+    return missing
+
+
+def _batch_call(
+    func: Callable[..., Any],
+    self: Any,
+    store: MutableMapping[Any, Any],
+    values: Any,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    cache_stats: CacheStats | None,
+) -> Any:
+    """Look up each of ``values`` in ``store`` and compute misses in one call."""
+    numpy = sys.modules.get("numpy")
+    is_array = numpy is not None and isinstance(values, numpy.ndarray)
+    items: list[Any] = values.ravel().tolist() if is_array else list(values)
+
+    out: list[Any] = [None] * len(items)
+    try:
+        missing = _batch_lookup(store, items, out)
+    except TypeError:
+        # unhashable elements
+        return func(self, values, *args, **kwargs)
+
+    if cache_stats is not None:
+        # Repeated misses are computed once, and are not hits.
+        cache_stats.hits += len(items) - sum(
+            len(indices) for _, indices in missing.values()
+        )
+
+    if missing:
+        batch: Any = [item for item, _ in missing.values()]
+        if is_array:
+            batch = numpy.asarray(batch, dtype=values.dtype)  # type: ignore[union-attr]
+
+        start = perf_counter()
+        computed = func(self, batch, *args, **kwargs)
+        if cache_stats is not None:
+            cache_stats.add_miss(perf_counter() - start, count=len(missing))
+
+        if len(computed) != len(missing):
+            msg = (
+                f"{func.__qualname__} returned {len(computed)} results "
+                f"for {len(missing)} values"
+            )
+            raise ValueError(msg)
+
+        for (key, (_, indices)), value in zip(missing.items(), computed, strict=True):
+            store[key] = value
+            for i in indices:
+                out[i] = value
+
+    if is_array:
+        result = numpy.asarray(out)  # type: ignore[union-attr]
+        return result.reshape(values.shape + result.shape[1:])
+    return out
 
 
 @overload
-def prop(
-    func: C_prop[S, R],
+def batch_meth(
+    func: C_meth[S, P, R],
     /,
     *,
     key: str | None = ...,
     check_use_cache: bool = ...,
-) -> CachedProperty[S, R]: ...
+    maxsize: int | None = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+) -> C_meth[S, P, R]: ...
 
 
 @overload
-def prop(
-    func: None = None, /, *, key: str | None = ..., check_use_cache: bool = ...
-) -> Callable[[C_prop[S, R]], CachedProperty[S, R]]: ...
+def batch_meth(
+    func: None = None,
+    /,
+    *,
+    key: str | None = ...,
+    check_use_cache: bool = ...,
+    maxsize: int | None = ...,
+    stats: bool | None = ...,
+    depends_on: str | Iterable[str] = ...,
+    tags: str | Iterable[str] = ...,
+) -> Callable[[C_meth[S, P, R]], C_meth[S, P, R]]: ...
 
 
-def prop(
-    func: C_prop[S, R] | None = None,
+def batch_meth(
+    func: C_meth[S, P, R] | None = None,
     /,
     *,
     key: str | None = None,
     check_use_cache: bool = False,
-) -> CachedProperty[S, R] | Callable[[C_prop[S, R]], CachedProperty[S, R]]:
+    maxsize: int | None = None,
+    stats: bool | None = None,
+    depends_on: str | Iterable[str] = (),
+    tags: str | Iterable[str] = (),
+) -> C_meth[S, P, R] | Callable[[C_meth[S, P, R]], C_meth[S, P, R]]:
     """
-    Decorator to cache a property within a class.
+    Decorator to cache a vectorized method element by element.
+
+    The decorated method has signature ``method(self, values, *args,
+    **kwargs)``, where ``values`` is a sequence or array of scalar values,
+    and returns a sequence of results of the same length.  Results are cached
+    in ``_cache`` per element of ``values`` (and value of the other
+    arguments).  A call looks up each element, and calls the method once with
+    all (unique) misses.  Results are returned in the order of ``values``.
+    Unhashable elements are keyed with key adapters (see
+    :func:`register_key_adapter`).  If an element is still unhashable, the
+    method is called with all of ``values`` without caching.
+
+    If ``values`` is a NumPy array, the misses are passed as an array of the
+    same dtype, and an array of shape ``values.shape + result_shape`` is
+    returned.  Otherwise, misses are passed and results returned as lists.
 
     Parameters
     ----------
-    func: callable
-        This parameter is used in the case that you decorate without ().
-        That is, you can decorate with ``@prop`` or ``@prop()``.
+    func : callable
         Positional only.
-    key : string, optional
-        Optional key for storage in `_cache`.
-        Default to attribute/method ``__name__``.
-        Keyword only.
+    key : str, optional
     check_use_cache : bool, default=False
-        If `True`, then only apply caching if
-        ``self._use_cache = True``.
-        Note that the default value of `self._use_cache` is `False`.
-        If `False`, then always apply caching.
-        Keyword only.
+    maxsize : int, optional
+        Maximum number of elements cached for each value of the other
+        arguments.
+    stats : bool, optional
+        If `True`, record statistics.  Each element counts as a hit or a
+        miss.
+    depends_on : str or iterable of str
+    tags : str or iterable of str
+        See :func:`meth`.  Keyword only.
 
     See Also
     --------
-    clear : corresponding decorator to clear cache
-    meth : decorator for cache creation of function
-
-    Notes
-    -----
-    To set `key` or `check_use_cache`, must pass with keyword.
+    meth
 
     Examples
     --------
-    >>> class A:
+    >>> class Gas:
     ...     def __init__(self):
-    ...         # this isn't strictly needed as it will be created on demand
-    ...         # but should be included if using static typing (mypy, etc)
     ...         self._cache = {}
     ...
-    ...     @prop(key="keyname")
-    ...     def size(self):
-    ...         '''
-    ...         This code gets ran only if the lookup of keyname fails
-    ...         After this code has been ran once, the result is stored in
-    ...         _cache with the key: 'keyname'
-    ...         '''
-    ...         print("set size")
-    ...         return [10]
-    ...
-    ...     # no arguments implies give cache function name
-    ...     @prop
-    ...     def myprop(self):
-    ...         print("set myprop")
-    ...         return [1.0]
-    ...
-    ...     @prop(check_use_cache=True)
-    ...     def checker(self):
-    ...         print("set checker")
-    ...         return [2.0]
-
-    >>> x = A()
-    >>> x.size
-    set size
-    [10]
-    >>> x._cache["keyname"] is x.size
-    True
+    ...     @batch_meth
+    ...     def pressure(self, temperatures, volume=1.0):
+    ...         print("calling pressure", temperatures)
+    ...         return [t / volume for t in temperatures]
+    >>> g = Gas()
+    >>> g.pressure([300.0, 400.0])
+    calling pressure [300.0, 400.0]
+    [300.0, 400.0]
+    >>> g.pressure([400.0, 500.0, 300.0, 500.0])
+    calling pressure [500.0]
+    [400.0, 500.0, 300.0, 500.0]
+    >>> g.pressure([300.0], volume=2.0)
+    calling pressure [300.0]
+    [150.0]
+    """
+    maxsize = None if maxsize is None else _validate_maxsize(maxsize)
+    depends = _validate_names(depends_on, "depends_on")
+    tag_names = _validate_names(tags, "tags")
 
-    >>> x.size
-    [10]
+    def cached_lookup(_func: C_meth[S, P, R]) -> C_meth[S, P, R]:
+        if iscoroutinefunction(_func):
+            msg = "batch_meth does not support coroutine functions."
+            raise TypeError(msg)
 
-    >>> x.myprop
-    set myprop
-    [1.0]
-    >>> x._cache["myprop"] is x.myprop
-    True
-    >>> x.myprop
-    [1.0]
+        key_name = _func.__name__ if key is None else key  # ty: ignore[unresolved-attribute]
+        cache_stats = _make_stats(_func, key_name, stats)
+        new_store: Callable[[], dict[Any, Any]] = (
+            dict if maxsize is None else partial(LRUCache, maxsize, cache_stats)
+        )
 
-    If you pass ``check_use_cache=True`` and
-    either `_use_cache=False` or the instance doesn't have
-    That property, then caching will NOT be done.
+        @wraps(_func)
+        def wrapper(self: S, values: Any, /, *args: Any, **kwargs: Any) -> Any:
+            if check_use_cache and not getattr(self, "_use_cache", False):
+                return _func(self, values, *args, **kwargs)
+
+            if not hasattr(self, "_cache"):
+                object.__setattr__(self, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
+            if key_name not in self._cache:
+                self._cache[key_name] = {}
+            # store for each value of the other arguments.
+            stores = self._cache[key_name]
+            other: Hashable = (
+                (freeze(args), frozenset((k, freeze(v)) for k, v in kwargs.items()))
+                if args or kwargs
+                else ()
+            )
+            try:
+                store = stores[other]
+            except KeyError:
+                store = stores[other] = new_store()
+            except TypeError:
+                # unhashable arguments
+                return _func(self, values, *args, **kwargs)
 
-    >>> x.checker
-    set checker
-    [2.0]
-    >>> x.checker
-    set checker
-    [2.0]
-    """
+            return _batch_call(_func, self, store, values, args, kwargs, cache_stats)
 
-    def cached_lookup(_func: C_prop[S, R]) -> CachedProperty[S, R]:
-        return CachedProperty[S, R](
-            prop=_func, key=key, check_use_cache=check_use_cache
+        cast("Any", wrapper)._cache_spec = _CacheSpec(
+            key_name, cache_stats, depends, tags=tag_names
         )
+        return cast("C_meth[S, P, R]", wrapper)
 
     if func:
         return cached_lookup(func)
     return cached_lookup
 
 
+# * Functions and classmethods -------------------------------------------------
+
+
+class _Store:
+    """Owner of ``_cache`` for cached functions and classmethods."""
+
+    __slots__ = ("__weakref__", "_cache", "owner")
+
+    # results of functions are keyed by qualified name and arguments only.
+    _cache_token = None
+
+    def __init__(self, owner: Any = None) -> None:
+        self._cache: dict[str, Any] = {}
+        self.owner = owner
+
+
+def _clear_store(store: _Store) -> None:
+    """``cache_clear`` of cached functions."""
+    store._cache.clear()
+    _forget_cleared(store)
+
+
+def _class_store(cls: type[Any]) -> _Store:
+    """Store for cached classmethods of ``cls``.  Not shared with subclasses."""
+    try:
+        return cls.__dict__["_cached_class_store"]  # type: ignore[no-any-return]
+    except KeyError:
+        with _inflight_lock:
+            if (store := cls.__dict__.get("_cached_class_store")) is None:
+                store = cls._cached_class_store = _Store(cls)
+        return store
+
+
+def _store_signature(func: Callable[..., Any]) -> Signature:
+    """Signature of ``func`` with leading positional only store argument."""
+    sig = signature(func)
+    name = "_store"
+    while name in sig.parameters:
+        name = f"{name}_"
+    return sig.replace(
+        parameters=[
+            Parameter(name, Parameter.POSITIONAL_ONLY),
+            *sig.parameters.values(),
+        ]
+    )
+
+
 @overload
-def meth(
-    func: C_meth[S, P, R],
+def func(
+    f: Callable[P, R],
     /,
     *,
     key: str | None = ...,
-    check_use_cache: bool = ...,
-) -> C_meth[S, P, R]: ...
+    maxsize: int | None = ...,
+    policy: Literal["lru", "cost", "tinylfu"] = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    min_compute_time: float | None = ...,
+    admit: Callable[[Any], bool] | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    weak_args: bool = ...,
+    backend: CacheBackend | None = ...,
+) -> Callable[P, R]: ...
 
 
 @overload
-def meth(
-    func: None = None,
+def func(
+    f: None = None,
     /,
     *,
     key: str | None = ...,
-    check_use_cache: bool = ...,
-) -> Callable[[C_meth[S, P, R]], C_meth[S, P, R]]: ...
-
-
-def meth(  # ruff:ignore[complex-structure]
-    func: C_meth[S, P, R] | None = None,
+    maxsize: int | None = ...,
+    policy: Literal["lru", "cost", "tinylfu"] = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    min_compute_time: float | None = ...,
+    admit: Callable[[Any], bool] | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    weak_args: bool = ...,
+    backend: CacheBackend | None = ...,
+) -> Callable[[Callable[P, R]], Callable[P, R]]: ...
+
+
+def func(  # ruff:ignore[complex-structure]
+    f: Callable[P, R] | None = None,
     /,
     *,
     key: str | None = None,
-    check_use_cache: bool = False,
-) -> C_meth[S, P, R] | Callable[[C_meth[S, P, R]], C_meth[S, P, R]]:
+    maxsize: int | None = None,
+    policy: Literal["lru", "cost", "tinylfu"] = "lru",
+    max_bytes: int | str | None = None,
+    ttl: float | None = None,
+    stale_while_revalidate: float | None = None,
+    executor: Executor | None = None,
+    min_compute_time: float | None = None,
+    admit: Callable[[Any], bool] | None = None,
+    lock: bool = False,
+    stats: bool | None = None,
+    key_func: Callable[..., Hashable] | None = None,
+    weak_args: bool = False,
+    backend: CacheBackend | None = None,
+) -> Callable[P, R] | Callable[[Callable[P, R]], Callable[P, R]]:
     """
-    Decorator to cache a function within a class
+    Decorator to cache a function in a process wide store.
 
-    Requires the Class to have a cache dict called ``_cache``.
+    Options are as for :func:`meth`, with results stored in the
+    ``cache`` attribute of the decorated function instead of an instance
+    ``_cache``.  ``key_func`` is called with the function arguments.  Use
+    ``cache_clear()`` to clear results, and :func:`info` for statistics.
+
+    Parameters
+    ----------
+    f : callable
+        Function to decorate.  Positional only.
+    key : str, optional
+    maxsize : int, optional
+    policy : {"lru", "cost", "tinylfu"}
+    max_bytes : int or str, optional
+    ttl : float, optional
+    stale_while_revalidate : float, optional
+    executor : concurrent.futures.Executor, optional
+    min_compute_time : float, optional
+    admit : callable, optional
+    lock : bool, default=False
+    stats : bool, optional
+    key_func : callable, optional
+    weak_args : bool, default=False
+    backend : CacheBackend, optional
+        See :func:`meth`.  Results are keyed by the qualified function name
+        and arguments.  Keyword only.
 
     See Also
     --------
-    clear : corresponding decorator to remove cache
-    prop : decorator for properties
+    meth : cached methods
+    classmeth : cached classmethods
 
     Examples
     --------
-    >>> class A(object):
-    ...     @meth(key="key")
-    ...     def method(self, x, y=2):
-    ...         # This code gets ran only if the lookup of keyname fails
-    ...         # After this code has been ran once, the result is stored in
-    ...         # _cache with the key: 'keyname'
-    ...         # a long calculation....
-    ...         print("calling method")
-    ...         return [x, y]
+    >>> @func(maxsize=128)
+    ... def square(x):
+    ...     print("calling square")
+    ...     return x * x
+    >>> square(2), square(2)
+    calling square
+    (4, 4)
+    >>> square.cache_clear()
+    >>> square(2)
+    calling square
+    4
+    """
+    store_key_func: Callable[..., Hashable] | None = None
+    if key_func is not None:
+
+        def store_key_func(_store: Any, /, *args: Any, **kwargs: Any) -> Hashable:
+            return key_func(*args, **kwargs)
+
+    cached = meth(
+        key=key,
+        maxsize=maxsize,
+        policy=policy,
+        max_bytes=max_bytes,
+        ttl=ttl,
+        stale_while_revalidate=stale_while_revalidate,
+        executor=executor,
+        min_compute_time=min_compute_time,
+        admit=admit,
+        lock=lock,
+        stats=stats,
+        key_func=store_key_func,
+        weak_args=weak_args,
+        backend=backend,
+    )
 
-    >>> x = A()
-    >>> x.method(1, 2)
-    calling method
-    [1, 2]
+    def decorator(f: Callable[P, R]) -> Callable[P, R]:
+        store = _Store()
 
-    This will respect default params
+        wrapper: Any
+        if iscoroutinefunction(f):
 
-    >>> x.method(1)
-    [1, 2]
+            async def acall(_store: Any, /, *args: Any, **kwargs: Any) -> Any:
+                return await f(*args, **kwargs)
 
-    And keyword arguments
+            call: Callable[..., Any] = acall
+        else:
 
-    >>> x.method(y=2, x=1)
-    [1, 2]
-    >>> print(x._cache)
-    {'key': {((1, 2), frozenset()): [1, 2]}}
+            def call(_store: Any, /, *args: Any, **kwargs: Any) -> Any:
+                return f(*args, **kwargs)
+
+        _ = update_wrapper(call, f)
+        call.__signature__ = _store_signature(f)  # type: ignore[attr-defined]
+        cached_call: Callable[..., Any] = cached(call)
+
+        if iscoroutinefunction(f):
+
+            @wraps(f)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await cached_call(store, *args, **kwargs)
+
+            wrapper = async_wrapper
+        else:
+
+            @wraps(f)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return cached_call(store, *args, **kwargs)
+
+            wrapper = sync_wrapper
+
+        wrapper._cache_spec = cached_call._cache_spec  # type: ignore[attr-defined]
+        wrapper.cache = store._cache
+        wrapper.cache_clear = partial(_clear_store, store)
+        return cast("Callable[P, R]", wrapper)
+
+    if f is not None:
+        return decorator(f)
+    return decorator
+
+
+@overload
+def classmeth(
+    f: Callable[Concatenate[Any, P], R],
+    /,
+    *,
+    key: str | None = ...,
+    maxsize: int | None = ...,
+    policy: Literal["lru", "cost", "tinylfu"] = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    min_compute_time: float | None = ...,
+    admit: Callable[[Any], bool] | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    weak_args: bool = ...,
+) -> classmethod[Any, P, R]: ...
+
+
+@overload
+def classmeth(
+    f: None = None,
+    /,
+    *,
+    key: str | None = ...,
+    maxsize: int | None = ...,
+    policy: Literal["lru", "cost", "tinylfu"] = ...,
+    max_bytes: int | str | None = ...,
+    ttl: float | None = ...,
+    stale_while_revalidate: float | None = ...,
+    executor: Executor | None = ...,
+    min_compute_time: float | None = ...,
+    admit: Callable[[Any], bool] | None = ...,
+    lock: bool = ...,
+    stats: bool | None = ...,
+    key_func: Callable[..., Hashable] | None = ...,
+    weak_args: bool = ...,
+) -> Callable[[Callable[Concatenate[Any, P], R]], classmethod[Any, P, R]]: ...
+
+
+def classmeth(  # ruff:ignore[complex-structure]
+    f: Callable[Concatenate[Any, P], R] | None = None,
+    /,
+    *,
+    key: str | None = None,
+    maxsize: int | None = None,
+    policy: Literal["lru", "cost", "tinylfu"] = "lru",
+    max_bytes: int | str | None = None,
+    ttl: float | None = None,
+    stale_while_revalidate: float | None = None,
+    executor: Executor | None = None,
+    min_compute_time: float | None = None,
+    admit: Callable[[Any], bool] | None = None,
+    lock: bool = False,
+    stats: bool | None = None,
+    key_func: Callable[..., Hashable] | None = None,
+    weak_args: bool = False,
+) -> (
+    classmethod[Any, P, R]
+    | Callable[[Callable[Concatenate[Any, P], R]], classmethod[Any, P, R]]
+):
     """
+    Decorator to create a cached classmethod.
 
-    def cached_lookup(_func: C_meth[S, P, R]) -> C_meth[S, P, R]:  # ruff:ignore[complex-structure]
-        key_func = _func.__name__ if key is None else key  # ty: ignore[unresolved-attribute]
+    Options are as for :func:`meth`.  Results are stored per class (so
+    subclasses do not share results), and ``key_func`` is called with the
+    class as its first argument.  The result is a :class:`classmethod`, so
+    do not also decorate with ``classmethod``.
 
-        # use signature
-        sig = signature(_func)
+    Parameters
+    ----------
+    f : callable
+        Function with class as first argument.  Positional only.
+    key : str, optional
+    maxsize : int, optional
+    policy : {"lru", "cost", "tinylfu"}
+    max_bytes : int or str, optional
+    ttl : float, optional
+    stale_while_revalidate : float, optional
+    executor : concurrent.futures.Executor, optional
+    min_compute_time : float, optional
+    admit : callable, optional
+    lock : bool, default=False
+    stats : bool, optional
+    key_func : callable, optional
+    weak_args : bool, default=False
+        See :func:`meth`.  Keyword only.
 
-        if len(sig.parameters) == 1:
-            # special case of single (self) parameter.
-            @wraps(_func)
-            def wrapper_no_args(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:
-                if (not check_use_cache) or (getattr(self, "_use_cache", False)):
-                    try:
-                        return cast(
-                            "R",
-                            self._cache[key_func],
-                        )
-                    except AttributeError:
-                        object.__setattr__(self, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
-                    except KeyError:
-                        pass
+    See Also
+    --------
+    meth : cached methods
+    func : cached functions
+    clear_class : clear results of cached classmethods
 
-                    self._cache[key_func] = ret = _func(self, *args, **kwargs)
+    Examples
+    --------
+    >>> class A:
+    ...     @classmeth
+    ...     def create(cls, x):
+    ...         print("calling create")
+    ...         return [cls.__name__, x]
+    >>> class B(A):
+    ...     pass
+    >>> A.create(1), A.create(1), B.create(1)
+    calling create
+    calling create
+    (['A', 1], ['A', 1], ['B', 1])
+    >>> clear_class(A)
+    >>> A.create(1)
+    calling create
+    ['A', 1]
+    """
+    store_key_func: Callable[..., Hashable] | None = None
+    if key_func is not None:
+
+        def store_key_func(store: _Store, /, *args: Any, **kwargs: Any) -> Hashable:
+            return key_func(store.owner, *args, **kwargs)
+
+    cached = meth(
+        key=key,
+        maxsize=maxsize,
+        policy=policy,
+        max_bytes=max_bytes,
+        ttl=ttl,
+        stale_while_revalidate=stale_while_revalidate,
+        executor=executor,
+        min_compute_time=min_compute_time,
+        admit=admit,
+        lock=lock,
+        stats=stats,
+        key_func=store_key_func,
+        weak_args=weak_args,
+    )
 
-                    return ret
+    def decorator(f: Callable[Concatenate[Any, P], R]) -> classmethod[Any, P, R]:
+        # allow stacking on classmethod.
+        f = getattr(f, "__func__", f)
 
-                return _func(self, *args, **kwargs)
+        wrapper: Any
+        if iscoroutinefunction(f):
 
-            return wrapper_no_args
+            async def acall(store: _Store, /, *args: Any, **kwargs: Any) -> Any:
+                return await f(store.owner, *args, **kwargs)
 
-        # Full method
-        bind = sig.bind
+            call: Callable[..., Any] = acall
+        else:
 
-        @wraps(_func)
-        def wrapper_with_args(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:
-            if (not check_use_cache) or (getattr(self, "_use_cache", False)):
-                if not hasattr(self, "_cache"):
-                    object.__setattr__(self, "_cache", {})  # ruff:ignore[unnecessary-dunder-call]
-
-                if key_func not in self._cache:
-                    self._cache[key_func] = {}
-
-                params = bind(self, *args, **kwargs)
-                params.apply_defaults()
-                key_params = (
-                    params.args[1:],
-                    frozenset(params.kwargs.items()),
-                )
+            def call(store: _Store, /, *args: Any, **kwargs: Any) -> Any:
+                return f(store.owner, *args, **kwargs)
 
-                try:
-                    return cast("R", self._cache[key_func][key_params])
-                except TypeError:
-                    # this means that key_lookup is bad hash
-                    return _func(self, *args, **kwargs)
-                except KeyError:
-                    pass
-                except Exception as e:  # pragma: no cover
-                    print(f"unknown exception {e} in meth call")  # ruff:ignore[print]
-                    raise
+        # signature of f, with class replaced by store.
+        _ = update_wrapper(call, f)
+        cached_call: Callable[..., Any] = cached(call)
 
-                self._cache[key_func][key_params] = ret = _func(self, *args, **kwargs)
-                return ret
+        if iscoroutinefunction(f):
 
-            return _func(self, *args, **kwargs)
+            @wraps(f)
+            async def async_wrapper(
+                cls: type[Any], /, *args: Any, **kwargs: Any
+            ) -> Any:
+                return await cached_call(_class_store(cls), *args, **kwargs)
 
-        return wrapper_with_args
+            wrapper = async_wrapper
+        else:
 
-    if func:
-        return cached_lookup(func)
+            @wraps(f)
+            def sync_wrapper(cls: type[Any], /, *args: Any, **kwargs: Any) -> Any:
+                return cached_call(_class_store(cls), *args, **kwargs)
 
-    return cached_lookup
+            wrapper = sync_wrapper
+
+        wrapper._cache_spec = cached_call._cache_spec  # type: ignore[attr-defined]
+        return classmethod(wrapper)
+
+    if f is not None:
+        return decorator(f)
+    return decorator
+
+
+def clear_class(cls: type[Any], *keys: str) -> None:
+    """
+    Clear results of cached classmethods of ``cls``.
+
+    Parameters
+    ----------
+    cls : type
+    *keys : str
+        Keys to remove.  If not passed, remove all results for ``cls``.
+        Results for subclasses are not removed.
+
+    See Also
+    --------
+    classmeth
+    """
+    store: _Store | None = cls.__dict__.get("_cached_class_store")
+    if store is None:
+        return
+    if not keys:
+        store._cache.clear()
+    for name in keys:
+        _ = store._cache.pop(name, None)
+    _forget_cleared(store, keys or None)
 
 
 @overload
@@ -430,12 +3473,14 @@ def clear(key_or_func: C_meth[S, P, R], *keys: str) -> C_meth[S, P, R]: ...
 
 @overload
 def clear(
-    key_or_func: str, *keys: str
+    key_or_func: str | None = None, *keys: str, tags: str | Iterable[str] = ()
 ) -> Callable[[C_meth[S, P, R]], C_meth[S, P, R]]: ...
 
 
 def clear(
-    key_or_func: str | C_meth[S, P, R], *keys: str
+    key_or_func: str | C_meth[S, P, R] | None = None,
+    *keys: str,
+    tags: str | Iterable[str] = (),
 ) -> C_meth[S, P, R] | Callable[[C_meth[S, P, R]], C_meth[S, P, R]]:
     """
     Decorator to clear self._cache of specified properties
@@ -443,7 +3488,20 @@ def clear(
     Parameters
     ----------
     *keys :
-        Remove these keys from cache.  if len(keys)==0, remove all keys.
+        Remove these keys from cache.  If no keys or tags are passed, remove
+        all keys.
+        Cached attributes declaring a dependency on any of these (see
+        ``depends_on`` option of :func:`prop` and :func:`meth`), directly or
+        transitively, are also removed.  Keys may also be names of plain
+        attributes used in ``depends_on``.
+
+        Clearing is O(1) per key if ``_cache`` is a :class:`GenerationCache`,
+        which defers freeing of removed values.
+    tags : str or iterable of str
+        Also remove keys with any of these tags (see ``tags`` option of
+        :func:`prop` and :func:`meth`), and their dependents.  Tagged keys
+        are indexed per class, so clearing by tag does not scan ``_cache``.
+        Keyword only.
 
     See Also
     --------
@@ -489,24 +3547,97 @@ def clear(
     >>> x.a, x.b
     calling a
     ('a', 'b')
+
+    Dependencies are cleared as well
+
+    >>> class Rectangle:
+    ...     def __init__(self, width, height):
+    ...         self.width, self.height = width, height
+    ...
+    ...     @prop(depends_on=("width", "height"))
+    ...     def area(self):
+    ...         print("calling area")
+    ...         return self.width * self.height
+    ...
+    ...     @meth(depends_on="area")
+    ...     def scaled_area(self, scale):
+    ...         return self.area * scale
+    ...
+    ...     @clear("width")
+    ...     def set_width(self, width):
+    ...         self.width = width
+    >>> r = Rectangle(2, 3)
+    >>> r.scaled_area(2)
+    calling area
+    12
+    >>> r.set_width(4)
+    >>> r._cache
+    {}
+    >>> r.scaled_area(2)
+    calling area
+    24
+
+    Or clear groups of keys by tag
+
+    >>> class Shape:
+    ...     def __init__(self):
+    ...         self._cache = {}
+    ...
+    ...     @prop(tags="geometry")
+    ...     def area(self):
+    ...         return 1
+    ...
+    ...     @meth(tags=("geometry", "render"))
+    ...     def outline(self, width):
+    ...         return width
+    ...
+    ...     @prop
+    ...     def name(self):
+    ...         return "shape"
+    ...
+    ...     @clear(tags="geometry")
+    ...     def reshape(self):
+    ...         pass
+    >>> s = Shape()
+    >>> s.area, s.outline(1), s.name
+    (1, 1, 'shape')
+    >>> s.reshape()
+    >>> s._cache
+    {'name': 'shape'}
     """
-    if not isinstance(key_or_func, str):
+    if key_or_func is None:
+        function = None
+        keys_inner = keys
+    elif not isinstance(key_or_func, str):
         function = key_or_func
         keys_inner = keys
     else:
         function = None
         keys_inner = (key_or_func, *keys)
+    tag_names = _validate_names(tags, "tags")
 
     def decorator(func: C_meth[S, P, R]) -> C_meth[S, P, R]:
+        # keys with dependents for each class.
+        expanded: WeakKeyDictionary[type[Any], frozenset[str]] = WeakKeyDictionary()
+
         @wraps(func)
         def wrapper(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:
-            if hasattr(self, "_cache"):
-                if not keys_inner:
+            cls = type(self)
+            if not keys_inner and not tag_names:
+                if hasattr(self, "_cache"):
                     self._cache.clear()
-                else:
-                    for name in keys_inner:
-                        with contextlib.suppress(KeyError):
-                            delitem(self._cache, name)
+                    _forget_cleared(self)
+                if slots := _get_slots(cls):
+                    _discard(self, slots)
+            else:
+                try:
+                    names = expanded[cls]
+                except KeyError:
+                    tag_index = _get_tag_index(cls)
+                    names = expanded[cls] = _expand_keys(cls, keys_inner).union(
+                        *(tag_index.get(tag, ()) for tag in tag_names)
+                    )
+                _discard(self, names)
 
             return func(self, *args, **kwargs)
 
@@ -515,3 +3646,112 @@ def clear(
     if function:
         return decorator(function)
     return decorator
+
+
+def _field_map(cls: type[Any]) -> dict[str, tuple[str, ...]]:
+    """Mapping from attribute name to cache keys to remove when it is set."""
+    try:
+        return cls.__dict__["_cached_field_map"]  # type: ignore[no-any-return]
+    except KeyError:
+        field_map = {
+            name: tuple(keys) for name, keys in _get_dependents(cls).items() if keys
+        }
+        cls._cached_field_map = field_map
+        return field_map
+
+
+def auto_clear(cls: type[T]) -> type[T]:
+    """
+    Class decorator to clear cached attributes when their dependencies are set.
+
+    Wraps ``cls.__setattr__`` so that assigning to an attribute named in the
+    ``depends_on`` option of :func:`prop` or :func:`meth` removes the cached
+    attributes depending on it (directly or transitively) from ``_cache``.
+    Assigning to other attributes only costs a dictionary lookup.  The
+    attribute to cache key map is computed once per class.  Subclasses are
+    handled, including ``__setattr__`` generated by ``attrs`` for validators
+    or converters.
+
+    Works with plain classes, :mod:`dataclasses` and ``attrs`` classes, in
+    which case it must be applied after (above) the ``dataclass`` or
+    ``attrs`` decorator.  For frozen classes, fields are only set with
+    :func:`object.__setattr__`, which is not intercepted.
+
+    See Also
+    --------
+    clear : decorator to clear cache in a method
+
+    Examples
+    --------
+    >>> from dataclasses import dataclass, field
+    >>> @auto_clear
+    ... @dataclass
+    ... class Rectangle:
+    ...     width: float
+    ...     height: float
+    ...     _cache: dict = field(default_factory=dict, init=False, repr=False)
+    ...
+    ...     @prop(depends_on=("width", "height"))
+    ...     def area(self):
+    ...         print("calling area")
+    ...         return self.width * self.height
+    >>> r = Rectangle(2, 3)
+    >>> r.area
+    calling area
+    6
+    >>> r.width = 4
+    >>> r.area
+    calling area
+    12
+    """
+    _wrap_setattr(cls)
+    own_init_subclass = cls.__dict__.get("__init_subclass__")
+    own_attrs_init_subclass = cls.__dict__.get("__attrs_init_subclass__")
+
+    def init_subclass(sub: type[Any], /, **kwargs: Any) -> None:
+        if own_init_subclass is None:
+            super(cls, sub).__init_subclass__(**kwargs)
+        else:
+            own_init_subclass.__func__(sub, **kwargs)
+        # Other subclasses use the inherited wrapper.  Adding ``__setattr__``
+        # here would be taken by attrs as a custom ``__setattr__``.
+        if "__setattr__" in sub.__dict__:
+            _wrap_setattr(sub)
+
+    def attrs_init_subclass(sub: type[Any]) -> None:
+        # Called by attrs once a subclass is created.  Its ``__setattr__``
+        # may be generated by attrs (for validators or converters), bypassing
+        # the inherited wrapper.
+        if own_attrs_init_subclass is not None:
+            own_attrs_init_subclass.__func__(sub)
+        elif (
+            parent := getattr(super(cls, sub), "__attrs_init_subclass__", None)
+        ) is not None:
+            parent()
+        _wrap_setattr(sub)
+
+    cls.__init_subclass__ = classmethod(init_subclass)  # type: ignore[assignment]
+    cls.__attrs_init_subclass__ = classmethod(attrs_init_subclass)  # type: ignore[attr-defined]
+    return cls
+
+
+def _wrap_setattr(cls: type[Any]) -> None:
+    """Wrap ``cls.__setattr__`` to clear cache keys depending on the attribute set."""
+    current: Callable[..., None] = cls.__setattr__
+    if getattr(current, "_auto_clear_owner", None) is cls:
+        return
+    # Wrap the original of an inherited wrapper, so keys are only cleared once.
+    base_setattr: Callable[..., None] = getattr(current, "_auto_clear_base", current)
+    get_keys = _field_map(cls).get
+
+    def setattr_and_clear(self: Any, name: str, value: Any) -> None:
+        base_setattr(self, name, value)
+        keys = get_keys(name) if type(self) is cls else _field_map(type(self)).get(name)
+        if keys is not None:
+            _discard(self, keys)
+
+    setattr_and_clear.__name__ = "__setattr__"
+    setattr_and_clear.__qualname__ = f"{cls.__qualname__}.__setattr__"
+    setattr_and_clear._auto_clear_base = base_setattr  # type: ignore[attr-defined]
+    setattr_and_clear._auto_clear_owner = cls  # type: ignore[attr-defined]
+    cls.__setattr__ = setattr_and_clear  # type: ignore[assignment]
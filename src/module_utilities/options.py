@@ -15,4 +15,20 @@ def _get_doc_sub() -> bool:
     }
 
 
+def _get_cache_stats() -> bool:
+    # Default is cache_stats is False
+    return os.getenv("MODULE_UTILITIES_CACHE_STATS", "False").lower() in {
+        "1",
+        "t",
+        "true",
+    }
+
+
+def _get_cache_budget() -> str | None:
+    # Default is no budget
+    return os.getenv("MODULE_UTILITIES_CACHE_BUDGET") or None
+
+
 DOC_SUB = _get_doc_sub()
+CACHE_STATS = _get_cache_stats()
+CACHE_BUDGET = _get_cache_budget()
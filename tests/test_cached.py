@@ -4,11 +4,14 @@
 
 from __future__ import annotations
 
+import re
+import weakref
 from typing import Any
 
 import pytest
 
 from module_utilities import cached
+from module_utilities._cache_stats import CacheStats  # ruff:ignore[import-private-name]
 from module_utilities._typing_compat import override  # ruff:ignore[import-private-name]
 
 
@@ -79,7 +82,10 @@ def test_cachedproperty_without_cache() -> None:
 
 
 def test_meth_bad_hash() -> None:
-    # test that passing unhashable just returns the func
+    # test that passing unhashable without an adapter just returns the func
+    class Unhashable:
+        __hash__ = None  # type: ignore[assignment]  # pyright: ignore[reportAssignmentType]
+
     class Tmp:
         def __init__(self) -> None:
             self._cache: dict[str, Any] = {}
@@ -95,10 +101,16 @@ def test_meth_bad_hash() -> None:
     assert "thing" in x._cache
 
     x._cache = {}
-    v = {"a": 1}
-    assert x.thing(v) == v
+    v = Unhashable()
+    assert x.thing(v) is v
     assert not x._cache["thing"]
 
+    # unhashable with adapter is cached by value
+    d = {"a": 1}
+    assert x.thing(d) is d
+    assert x.thing({"a": 1}) is d
+    assert len(x._cache["thing"]) == 1
+
 
 class Baseclass:
     def __init__(self, a, b) -> None:
@@ -740,3 +752,767 @@ def test_meth_single_arg() -> None:
 
     assert "prop_check" not in x._cache
     assert "meth_check" not in x._cache
+
+
+def test_meth_maxsize() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls: list[int] = []
+
+        @cached.meth(maxsize=2)
+        def meth(self, x: int) -> list[int]:
+            self.calls.append(x)
+            return [x]
+
+        @cached.decorate(as_property=False, maxsize=1)
+        def meth2(self, x: int) -> list[int]:
+            return [x]
+
+    x = Tmp()
+
+    a = x.meth(1)
+    _ = x.meth(2)
+    # hit moves 1 to most recently used
+    assert x.meth(1) is a
+    _ = x.meth(3)
+
+    assert isinstance(x._cache["meth"], cached.LRUCache)
+    assert list(x._cache["meth"]) == [((1,), frozenset()), ((3,), frozenset())]
+    assert x.calls == [1, 2, 3]
+
+    _ = x.meth(2)
+    assert x.calls == [1, 2, 3, 2]
+    assert len(x._cache["meth"]) == 2
+
+    _ = x.meth2(1)
+    _ = x.meth2(2)
+    assert list(x._cache["meth2"]) == [((2,), frozenset())]
+
+    # unhashable arguments are cached by value
+    v: Any = [1]
+    assert x.meth(v) == [v]
+    v_copy: Any = [1]
+    assert x.meth(v_copy) == [v]
+    assert x.calls == [1, 2, 3, 2, v]
+
+
+def test_meth_maxsize_copy() -> None:
+    import copy
+
+    c: cached.LRUCache[str, int] = cached.LRUCache(2)
+    c["a"] = 1
+    c["b"] = 2
+    out = copy.deepcopy(c)
+    assert out == c
+    assert out.maxsize == 2
+    assert list(out) == ["a", "b"]
+    assert repr(out) == "LRUCache(2, {'a': 1, 'b': 2})"
+
+    for out in (c.copy(), copy.copy(c)):
+        assert type(out) is cached.LRUCache
+        assert out.maxsize == 2
+        assert list(out) == ["a", "b"]
+        out["c"] = 3
+        assert list(out) == ["b", "c"]
+    assert list(c) == ["a", "b"]
+
+    sized: cached.LRUCache[str, bytes] = cached.LRUCache(max_bytes=100)
+    sized["a"] = bytes(60)
+    out_sized = sized.copy()
+    assert (out_sized.max_bytes, out_sized.nbytes) == (100, sized.nbytes)
+    out_sized["b"] = bytes(60)
+    assert list(out_sized) == ["b"]
+    assert list(sized) == ["a"]
+
+
+def test_greedy_dual_size_cache() -> None:
+    stats = CacheStats("owner", "key")
+    c: cached.GreedyDualSizeCache[str, int] = cached.GreedyDualSizeCache(2, stats)
+    c.set("a", 1, cost=2.0, size=1)
+    c.set("b", 2, cost=1.0, size=1)
+    c.set("c", 3, cost=1.5, size=1)
+    assert set(c) == {"a", "c"}
+    assert (stats.evictions, stats.evicted_compute_time) == (1, 1.0)
+
+    # large entries have less credit
+    c.set("d", 4, cost=10.0, size=100)
+    assert set(c) == {"a", "c"}
+
+    # inflation ages out unused entries.  "c" is used, so "a" is evicted.
+    for i in range(4):
+        assert c["c"] == 3
+        c.set(f"x{i}", i, cost=1.0, size=1)
+    assert "c" in c
+    assert "a" not in c
+    assert repr(c) == "GreedyDualSizeCache(2, {'c': 3, 'x3': 3})"
+
+    # plain assignment has zero cost
+    c["y"] = 5
+    assert "y" not in c
+    del c["c"]
+    assert len(c) == 1
+    c.clear()
+    assert dict(c) == {}
+
+
+def test_meth_policy_cost() -> None:
+    import time
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls: list[int] = []
+
+        @cached.meth(maxsize=2, policy="cost", stats=True)
+        def meth(self, x: int) -> int:
+            self.calls.append(x)
+            if x < 0:
+                time.sleep(0.01)
+            return x
+
+    t = Tmp()
+    for x in (-1, 1, 2, -1, 3, -1):
+        assert t.meth(x) == x
+    assert t.calls == [-1, 1, 2, 3]
+    assert isinstance(t._cache["meth"], cached.GreedyDualSizeCache)
+    info = cached.info(t)["meth"]
+    assert info.evictions == 2
+    assert 0.0 < info.evicted_compute_time < 0.01
+
+    with pytest.raises(ValueError, match="policy must be"):
+        _ = cached.meth(maxsize=2, policy="fifo")  # type: ignore[call-overload]
+
+
+def test_tinylfu_cache() -> None:
+    stats = CacheStats("owner", "key")
+    c: cached.TinyLFUCache[int, int] = cached.TinyLFUCache(10, stats)
+    for _ in range(3):
+        for key in range(9):
+            c[key] = key
+            assert c[key] == key
+
+    # a scan of keys used once does not evict frequently used keys
+    for key in range(100, 200):
+        with pytest.raises(KeyError):
+            _ = c[key]
+        c[key] = key
+    assert set(range(9)) <= set(c)
+    assert len(c) == 10
+    # the first key of the scan fills the main region
+    assert stats.evictions == 99
+
+    c[0] = -1
+    assert c[0] == -1
+    del c[0]
+    del c[199]
+    assert 0 not in c
+    assert len(c) == 8
+    assert repr(c).startswith("TinyLFUCache(10, {1: 1,")
+    c.clear()
+    assert dict(c) == {}
+
+    with pytest.raises(TypeError):
+        _ = c[[1]]  # type: ignore[index]
+
+
+def test_meth_policy_tinylfu() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls: list[Any] = []
+
+        @cached.meth(maxsize=3, policy="tinylfu")
+        def meth(self, x: Any) -> Any:
+            self.calls.append(x)
+            return x
+
+    t = Tmp()
+    for x in (1, 2, 1, 2, 3, 4, 5, 1, 2, [1]):
+        assert t.meth(x) == x
+    assert t.calls == [1, 2, 3, 4, 5, [1]]
+    assert isinstance(t._cache["meth"], cached.TinyLFUCache)
+
+
+def test_generation_cache() -> None:
+    c: cached.GenerationCache[str, Any] = cached.GenerationCache()
+    c["a"] = 1
+    c["b"] = 2
+    assert dict(c) == {"a": 1, "b": 2}
+
+    del c["a"]
+    assert "a" not in c
+    with pytest.raises(KeyError):
+        _ = c["a"]
+    with pytest.raises(KeyError):
+        del c["a"]
+    assert c.pop("a", None) is None
+    assert c.pop("b") == 2
+    assert (len(c), c.stale) == (0, 2)
+
+    # setting a key does not free its stale value
+    class Value:
+        pass
+
+    value = Value()
+    ref = weakref.ref(value)
+    c["a"] = value
+    del value
+    c.clear()
+    c["a"] = 3
+    assert c == {"a": 3}
+    assert ref() is not None
+    assert c.stale == 3
+    c.clear()
+    assert c == {}
+    assert repr(c) == "GenerationCache({})"
+    c["b"] = 4
+    assert c.stale == 4
+    assert c.sweep() == 4
+    assert ref() is None
+    assert c.stale == 0
+    assert c == {"b": 4}
+
+    # nothing is retained for deleted keys once swept
+    for i in range(100):
+        c[str(i)] = i
+        del c[str(i)]
+    assert c.sweep() == 100
+    assert c._data.keys() == {"b"}
+
+
+def test_generation_cache_instance() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: cached.GenerationCache[str, Any] = cached.GenerationCache()
+            self.x = 1
+
+        @cached.prop(depends_on="x")
+        def a(self) -> list[int]:
+            return [self.x]
+
+        @cached.meth(depends_on="a")
+        def b(self, y: int) -> list[int]:
+            return [*self.a, y]
+
+        @cached.clear("x")
+        def set_x(self, x: int) -> None:
+            self.x = x
+
+        @cached.clear
+        def clear_all(self) -> None:
+            pass
+
+    t = Tmp()
+    a, b = t.a, t.b(1)
+    assert (t.a, t.b(1)) == (a, b)
+    assert t.a is a
+    assert t.b(1) is b
+
+    t.set_x(2)
+    assert t._cache.stale == 2
+    assert (t.a, t.b(1)) == ([2], [2, 1])
+    # replaced values are freed by sweep, not by recomputation
+    assert t._cache.stale == 2
+
+    t.clear_all()
+    assert len(t._cache) == 0
+    assert t._cache.sweep() == 4
+
+
+@pytest.mark.parametrize("maxsize", [0, -1, 1.5])
+def test_meth_maxsize_bad(maxsize: Any) -> None:
+    with pytest.raises(ValueError, match="maxsize"):
+        cached.meth(maxsize=maxsize)
+
+    with pytest.raises(ValueError, match="maxsize"):
+        cached.decorate(maxsize=2)  # type: ignore[call-overload]  # pyright: ignore[reportCallIssue,reportArgumentType]
+
+
+def test_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr(cached, "monotonic", lambda: now[0])
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls = 0
+
+        @cached.prop(ttl=10)
+        def prop(self) -> list[int]:
+            self.calls += 1
+            return [self.calls]
+
+        @cached.CachedProperty
+        def prop_no_ttl(self) -> list[int]:
+            return [1]
+
+        @cached.meth(ttl=5)
+        def meth0(self) -> list[int]:
+            self.calls += 1
+            return [self.calls]
+
+        @cached.decorate(as_property=False, ttl=5, maxsize=2)
+        def meth1(self, x: int) -> list[int]:
+            self.calls += 1
+            return [x, self.calls]
+
+    x = Tmp()
+
+    p = x.prop
+    assert x._cache["prop"] == (p, 10.0)
+    now[0] = 9.9
+    assert x.prop is p
+    now[0] = 10.0
+    assert x.prop is not p
+    assert x._cache["prop"][1] == 20.0
+
+    now[0] = 0.0
+    x.calls = 0
+    m0 = x.meth0()
+    m1 = x.meth1(1)
+    assert x.meth0() is m0
+    assert x.meth1(1) is m1
+    assert x._cache["meth1"][(1,), frozenset()] == (m1, 5.0)
+
+    now[0] = 6.0
+    assert x.meth0() == [3]
+    assert x.meth1(1) == [1, 4]
+    assert x.meth1(1) == [1, 4]
+
+    assert x.prop_no_ttl is x._cache["prop_no_ttl"]
+
+
+@pytest.mark.parametrize("ttl", [0, -1.0, "1", True])
+def test_ttl_bad(ttl: Any) -> None:
+    with pytest.raises(ValueError, match="ttl"):
+        cached.prop(ttl=ttl)
+    with pytest.raises(ValueError, match="ttl"):
+        cached.meth(ttl=ttl)
+
+
+@pytest.mark.parametrize("name", ["prop", "meth0", "meth1"])
+def test_lock_single_flight(name: str) -> None:
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls = 0
+
+        def _compute(self) -> list[int]:
+            self.calls += 1
+            time.sleep(0.05)
+            return [self.calls]
+
+        @cached.prop(lock=True, stats=True)
+        def prop(self) -> list[int]:
+            return self._compute()
+
+        @cached.meth(lock=True, stats=True)
+        def meth0(self) -> list[int]:
+            return self._compute()
+
+        @cached.meth(lock=True, stats=True)
+        def meth1(self, x: int) -> list[int]:
+            return [*self._compute(), x]
+
+    def get(x: Tmp) -> Any:
+        barrier.wait()
+        if name == "prop":
+            return x.prop
+        if name == "meth0":
+            return x.meth0()
+        return x.meth1(1)
+
+    nthreads = 8
+    barrier = threading.Barrier(nthreads)
+    x = Tmp()
+    with ThreadPoolExecutor(nthreads) as executor:
+        out = list(executor.map(get, [x] * nthreads))
+
+    assert x.calls == 1
+    assert all(o is out[0] for o in out)
+    assert not cached._inflight
+    # threads waiting for the computation are hits
+    assert cached.info(x)[name][:2] == (nthreads - 1, 1)
+
+
+def test_lock_single_flight_error() -> None:
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls = 0
+
+        @cached.prop(lock=True)
+        def prop(self) -> int:
+            self.calls += 1
+            time.sleep(0.05)
+            msg = "bad"
+            raise ValueError(msg)
+
+    def get(x: Tmp) -> Any:
+        barrier.wait()
+        try:
+            return x.prop
+        except ValueError as e:
+            return e
+
+    nthreads = 4
+    barrier = threading.Barrier(nthreads)
+    x = Tmp()
+    with ThreadPoolExecutor(nthreads) as executor:
+        out = list(executor.map(get, [x] * nthreads))
+
+    assert all(isinstance(o, ValueError) for o in out)
+    assert "prop" not in x._cache
+    assert not cached._inflight
+
+    # failure is not cached
+    calls = x.calls
+    with pytest.raises(ValueError, match="bad"):
+        _ = x.prop
+    assert x.calls == calls + 1
+
+
+def test_lock_reentrant() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth(lock=True)
+        def fib(self, n: int) -> int:
+            return n if n < 2 else self.fib(n - 1) + self.fib(n - 2)
+
+    assert Tmp().fib(20) == 6765
+
+
+def test_depends_on() -> None:  # ruff:ignore[complex-structure]
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.x = 1
+            self.y = 2
+
+        @cached.prop(depends_on="x")
+        def a(self) -> int:
+            return self.x
+
+        @cached.prop(key="b_key", depends_on=["a", "y"])
+        def b(self) -> int:
+            return self.a + self.y
+
+        @cached.meth(depends_on=("b",))
+        def c(self, z: int) -> int:
+            return self.b + z
+
+        @cached.prop(depends_on="y")
+        def d(self) -> int:
+            return self.y
+
+        @cached.prop
+        def e(self) -> int:
+            return 5
+
+        @cached.clear("x")
+        def set_x(self, x: int) -> None:
+            self.x = x
+
+        @cached.clear("y")
+        def set_y(self, y: int) -> None:
+            self.y = y
+
+        @cached.clear("b_key")
+        def clear_b(self) -> None:
+            pass
+
+    t = Tmp()
+
+    def fill() -> None:
+        _ = (t.c(1), t.d, t.e)
+        assert set(t._cache) == {"a", "b_key", "c", "d", "e"}
+
+    fill()
+    t.set_x(2)
+    assert set(t._cache) == {"d", "e"}
+    assert t.c(1) == 5
+
+    fill()
+    t.set_y(3)
+    assert set(t._cache) == {"a", "e"}
+    assert t.c(1) == 6
+
+    fill()
+    t.clear_b()
+    assert set(t._cache) == {"a", "d", "e"}
+
+    assert cached._get_dependents(Tmp) == {
+        "x": frozenset({"a", "b_key", "c"}),
+        "a": frozenset({"b_key", "c"}),
+        "y": frozenset({"b_key", "c", "d"}),
+        "b_key": frozenset({"c"}),
+        "c": frozenset(),
+        "d": frozenset(),
+    }
+
+    class Sub(Tmp):
+        # no longer depends on y
+        @cached.prop
+        def d(self) -> int:
+            return 4
+
+    s = Sub()
+    _ = (s.c(1), s.d)
+    s.set_y(1)
+    assert set(s._cache) == {"a", "d"}
+
+
+def _raised(excinfo: pytest.ExceptionInfo[BaseException]) -> str:
+    # before python 3.12, errors in ``__set_name__`` are wrapped in RuntimeError
+    return str(excinfo.value) + str(excinfo.value.__cause__)
+
+
+def test_depends_on_cycle() -> None:
+    # raised on class creation
+    with pytest.raises((ValueError, RuntimeError)) as excinfo:
+
+        class Tmp:
+            _cache: dict[str, Any]
+
+            @cached.prop(depends_on="b")
+            def a(self) -> int:
+                return 1
+
+            @cached.prop(depends_on="a")
+            def b(self) -> int:
+                return 2
+
+    assert re.search(
+        r"Cyclic cache dependencies .*: (a -> b -> a|b -> a -> b)", _raised(excinfo)
+    )
+
+    # classes with only cached methods are checked by auto_clear, or on first use
+    class Meth:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth(depends_on="b")
+        def a(self, x: int) -> int:
+            return x
+
+        @cached.meth(depends_on="a")
+        def b(self, x: int) -> int:
+            return x
+
+        @cached.clear("a")
+        def clear_a(self) -> None:
+            pass
+
+    with pytest.raises(ValueError, match="Cyclic cache dependencies"):
+        _ = cached.auto_clear(Meth)
+    with pytest.raises(ValueError, match="Cyclic cache dependencies"):
+        Meth().clear_a()
+
+
+def test_depends_on_unknown() -> None:
+    with pytest.raises((ValueError, RuntimeError)) as excinfo:
+
+        class Tmp:
+            def __init__(self) -> None:
+                self._cache: dict[str, Any] = {}
+                self.width = 1
+
+            @cached.prop(depends_on="widht")
+            def a(self) -> int:
+                return self.width
+
+    assert "Tmp.a depends on 'widht', which is not an attribute" in _raised(excinfo)
+
+    # attributes set in methods, declared in the class body, or cache keys
+    class Known:
+        height: int
+        depth = 1
+
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.width = 1
+
+        @cached.prop(depends_on=("width", "height", "depth", "b_key"))
+        def a(self) -> int:
+            return 1
+
+        @cached.meth(key="b_key")
+        def b(self, x: int) -> int:
+            return x
+
+    assert cached._get_dependents(Known)["b_key"] == {"a"}
+
+    class Meth:
+        _cache: dict[str, Any]
+
+        @cached.meth(depends_on="widht")
+        def a(self, x: int) -> int:
+            return x
+
+    with pytest.raises(ValueError, match="depends on 'widht'"):
+        _ = cached.auto_clear(Meth)
+
+
+def test_depends_on_bad() -> None:
+    with pytest.raises(TypeError, match="depends_on must be"):
+        _ = cached.prop(depends_on=[1])  # type: ignore[list-item]
+    with pytest.raises(TypeError, match="depends_on must be"):
+        _ = cached.meth(depends_on=1)  # type: ignore[call-overload]
+
+
+def test_tags() -> None:  # ruff:ignore[complex-structure]
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.prop(tags="geometry")
+        def a(self) -> int:
+            return 1
+
+        @cached.meth(key="b_key", tags=["geometry", "render"])
+        def b(self, x: int) -> int:
+            return x
+
+        @cached.prop(depends_on="a")
+        def c(self) -> int:
+            return self.a + 1
+
+        @cached.prop(tags="render")
+        def d(self) -> int:
+            return 4
+
+        @cached.prop
+        def e(self) -> int:
+            return 5
+
+        @cached.clear(tags="geometry")
+        def clear_geometry(self) -> None:
+            pass
+
+        @cached.clear("e", tags=("render", "missing"))
+        def clear_render(self) -> None:
+            pass
+
+        @cached.clear(tags="missing")
+        def clear_missing(self) -> None:
+            pass
+
+        def fill(self) -> None:
+            _ = (self.a, self.b(1), self.c, self.d, self.e)
+
+    t = Tmp()
+    t.fill()
+    t.clear_geometry()
+    assert set(t._cache) == {"d", "e"}
+
+    t.fill()
+    t.clear_render()
+    assert set(t._cache) == {"a", "c"}
+
+    t.fill()
+    t.clear_missing()
+    assert set(t._cache) == {"a", "b_key", "c", "d", "e"}
+
+    with pytest.raises(TypeError, match="tags must be"):
+        _ = cached.prop(tags=[1])  # type: ignore[list-item]
+    with pytest.raises(TypeError, match="tags must be"):
+        _ = cached.clear(tags=1)  # type: ignore[call-overload]
+
+
+def test_slot_prop() -> None:
+    calls: list[str] = []
+
+    @cached.auto_clear
+    class Tmp:
+        __slots__ = ("_cached_a", "_cached_b_key", "_use_cache", "custom", "x")
+        _use_cache: bool
+        custom: int
+
+        def __init__(self, x: int) -> None:
+            self.x = x
+
+        @cached.slot_prop(depends_on="x", stats=True)
+        def a(self) -> int:
+            calls.append("a")
+            return self.x
+
+        @cached.slot_prop(key="b_key", depends_on="a")
+        def b(self) -> int:
+            calls.append("b")
+            return self.a + 1
+
+        @cached.slot_prop(slot="custom", check_use_cache=True)
+        def c(self) -> int:
+            calls.append("c")
+            return 3
+
+        @cached.clear("b_key")  # type: ignore[type-var]
+        def clear_b(self) -> None:
+            pass
+
+        @cached.clear  # type: ignore[type-var]
+        def clear_all(self) -> None:
+            pass
+
+    assert isinstance(Tmp.__dict__["a"], cached.CachedSlotProperty)
+    t = Tmp(1)
+    assert not hasattr(t, "__dict__")
+    assert (t.a, t.a, t.b, t.b) == (1, 1, 2, 2)
+    assert calls == ["a", "b"]
+    assert cached.info(t)["a"][:2] == (2, 1)
+
+    with pytest.raises(AttributeError, match="can't set attribute"):
+        t.a = 2
+
+    # auto_clear discards dependents
+    t.x = 2
+    assert (t.b, t.a) == (3, 2)
+    assert calls == ["a", "b", "b", "a"]
+
+    # use cache only if `_use_cache`
+    assert (t.c, t.c) == (3, 3)
+    t._use_cache = True
+    assert (t.c, t.c) == (3, 3)
+    assert t.custom == 3
+    assert calls.count("c") == 3
+
+    calls.clear()
+    t.clear_b()
+    assert t.b == 3
+    assert calls == ["b"]
+
+    t.clear_all()
+    for slot in ("_cached_a", "_cached_b_key", "custom"):
+        assert not hasattr(t, slot)
+
+
+def test_slot_prop_errors() -> None:
+    with pytest.raises((TypeError, RuntimeError)) as excinfo:
+
+        class Tmp:
+            __slots__ = ("x",)
+
+            @cached.slot_prop
+            def a(self) -> int:
+                return 1
+
+    assert "must declare slot '_cached_a'" in str(excinfo.value) + str(
+        excinfo.value.__cause__
+    )
+
+    with pytest.raises(TypeError, match="coroutine"):
+
+        @cached.slot_prop
+        async def b(self: Any) -> int:  # ruff:ignore[unused-async, unused-function-argument]
+            return 1
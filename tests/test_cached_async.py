@@ -0,0 +1,170 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from module_utilities import cached
+from module_utilities._cache_keys import freeze  # ruff:ignore[import-private-name]
+
+
+class Example:
+    def __init__(self) -> None:
+        self._cache: dict[str, Any] = {}
+        self.calls = 0
+        self.fail = False
+
+    async def _compute(self, *args: Any) -> list[Any]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            msg = "bad"
+            raise ValueError(msg)
+        return [self.calls, *args]
+
+    @cached.prop
+    async def prop(self) -> list[Any]:
+        """A doc string"""
+        return await self._compute()
+
+    @cached.meth
+    async def meth0(self) -> list[Any]:
+        return await self._compute()
+
+    @cached.meth(ttl=100, maxsize=2)
+    async def meth1(self, x: int, y: int = 2) -> list[Any]:
+        return await self._compute(x, y)
+
+
+def test_async_prop() -> None:
+    x = Example()
+
+    assert isinstance(Example.prop, cached.AsyncCachedProperty)
+    assert Example.prop.__doc__ == "A doc string"
+
+    async def main() -> None:
+        out = await asyncio.gather(*(x.prop for _ in range(5)))
+        assert all(o is out[0] for o in out)
+        assert await x.prop is out[0]
+
+    asyncio.run(main())
+    assert x.calls == 1
+    assert x._cache == {"prop": [1]}
+    assert not cached._inflight_tasks
+
+
+def test_async_single_flight_stats() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.prop(stats=True)
+        async def prop(self) -> list[Any]:
+            await asyncio.sleep(0.01)
+            return []
+
+        @cached.meth(stats=True)
+        async def meth(self, x: int) -> list[Any]:
+            await asyncio.sleep(0.01)
+            return [x]
+
+    x = Tmp()
+
+    async def main() -> None:
+        _ = await asyncio.gather(*(x.prop for _ in range(5)))
+        _ = await asyncio.gather(*(x.meth(1) for _ in range(5)))
+
+    asyncio.run(main())
+    # awaiters joining the computation are hits
+    assert cached.info(x)["prop"][:2] == (4, 1)
+    assert cached.info(x)["meth"][:2] == (4, 1)
+
+
+def test_async_meth() -> None:
+    x = Example()
+
+    async def main() -> None:
+        out = await asyncio.gather(*(x.meth0() for _ in range(5)))
+        assert all(o is out[0] for o in out)
+
+        a, b, c, d = await asyncio.gather(
+            x.meth1(1), x.meth1(1, 2), x.meth1(x=1), x.meth1(2)
+        )
+        assert a is b is c
+        assert d is not a
+
+    asyncio.run(main())
+    assert x.calls == 3
+    assert x._cache["meth0"] == [1]
+    assert isinstance(x._cache["meth1"], cached.LRUCache)
+    assert x._cache["meth1"][(1, 2), frozenset()][0][1:] == [1, 2]
+    assert not cached._inflight_tasks
+
+
+def test_async_failure_not_cached() -> None:
+    x = Example()
+    x.fail = True
+
+    async def main() -> None:
+        out = await asyncio.gather(*(x.prop for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(o, ValueError) for o in out)
+        assert x.calls == 1
+
+        with pytest.raises(ValueError, match="bad"):
+            await x.meth1(1)
+
+        x.fail = False
+        assert await x.prop == [3]
+        assert await x.meth1(1) == [4, 1, 2]
+
+    asyncio.run(main())
+    assert not cached._inflight_tasks
+
+
+def test_async_cancel_one_awaiter() -> None:
+    x = Example()
+
+    async def main() -> None:
+        first = asyncio.ensure_future(x.meth1(1))
+        second = asyncio.ensure_future(x.meth1(1))
+        await asyncio.sleep(0)
+        _ = first.cancel()
+        assert await second == [1, 1, 2]
+        assert first.cancelled()
+
+    asyncio.run(main())
+    assert x.calls == 1
+
+
+def test_async_use_cache() -> None:
+    class Tmp:
+        _use_cache = False
+
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.prop(check_use_cache=True)
+        async def prop(self) -> list[int]:
+            return [1]
+
+        @cached.meth(check_use_cache=True)
+        async def meth(self, x: Any) -> list[Any]:
+            return [x]
+
+    x = Tmp()
+
+    async def main() -> None:
+        assert await x.prop is not await x.prop
+        assert await x.meth(1) is not await x.meth(1)
+        # unhashable
+        x._use_cache = True
+        v: Any = object.__new__(type("Unhashable", (), {"__hash__": None}))
+        assert await x.meth(v) == [v]
+        assert await x.meth([1]) is await x.meth([1])
+
+    asyncio.run(main())
+    assert list(x._cache["meth"]) == [((freeze([1]),), frozenset())]
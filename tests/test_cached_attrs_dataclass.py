@@ -6,6 +6,7 @@ import dataclasses
 from typing import Any
 
 import attrs
+import pytest
 
 from module_utilities import cached
 
@@ -148,3 +149,194 @@ def test_dataclass_class_frozen() -> None:
 
     x.clear()
     assert list(x._cache.keys()) == ["prop"]
+
+
+class _Base:
+    x: int
+    y: int
+    _cache: dict[str, Any]
+
+    @cached.prop(depends_on="x")
+    def a(self) -> int:
+        return self.x * 10
+
+    @cached.meth(depends_on=("a", "y"))
+    def b(self, z: int) -> int:
+        return self.a + self.y + z
+
+    @cached.prop
+    def c(self) -> int:
+        return 3
+
+
+def _make_auto_clear_class(kind: str) -> Any:
+    if kind == "plain":
+
+        class Plain(_Base):
+            def __init__(self, x: int = 1, y: int = 2) -> None:
+                self._cache: dict[str, Any] = {}
+                self.x = x
+                self.y = y
+
+        return Plain
+
+    if kind == "dataclass":
+
+        @dataclasses.dataclass
+        class Dataclass(_Base):
+            x: int = 1
+            y: int = 2
+            _cache: dict[str, Any] = dataclasses.field(default_factory=dict, init=False)
+
+        return Dataclass
+
+    if kind == "attrs":
+
+        @attrs.define
+        class Attrs(_Base):
+            x: int = 1
+            y: int = 2
+            _cache: dict[str, Any] = attrs.field(factory=dict, init=False)
+
+        return Attrs
+
+    @attrs.define
+    class AttrsValidated(_Base):
+        x: int = attrs.field(default=1, validator=attrs.validators.instance_of(int))
+        y: int = 2
+        _cache: dict[str, Any] = attrs.field(factory=dict, init=False)
+
+    return AttrsValidated
+
+
+@pytest.mark.parametrize("kind", ["plain", "dataclass", "attrs", "attrs_validated"])
+def test_auto_clear(kind: str) -> None:
+    x = cached.auto_clear(_make_auto_clear_class(kind))()
+    assert (x.a, x.b(1), x.c) == (10, 13, 3)
+    assert set(x._cache) == {"a", "b", "c"}
+
+    x.y = 3
+    assert set(x._cache) == {"a", "c"}
+    assert x.b(1) == 14
+
+    x.x = 2
+    assert set(x._cache) == {"c"}
+    assert (x.a, x.b(1)) == (20, 24)
+
+    x._cache = {}
+    assert x._cache == {}
+
+
+class _SubMixin:
+    x: int
+    w: int
+    _cache: dict[str, Any]
+
+    @cached.prop(depends_on=("x", "w"))
+    def d(self) -> int:
+        return self.x + self.w
+
+
+def _make_auto_clear_subclass(kind: str) -> Any:
+    base = cached.auto_clear(_make_auto_clear_class(kind))
+
+    if kind == "plain":
+
+        class Plain(_SubMixin, base):  # type: ignore[misc,valid-type]
+            def __init__(self, w: int = 4) -> None:
+                super().__init__()
+                self.w = w
+
+        return Plain
+
+    if kind == "dataclass":
+
+        @dataclasses.dataclass
+        class Dataclass(_SubMixin, base):  # type: ignore[misc,valid-type]
+            w: int = 4
+
+        return Dataclass
+
+    validator = attrs.validators.instance_of(int) if kind == "attrs_validated" else None
+
+    @attrs.define
+    class Attrs(_SubMixin, base):  # type: ignore[misc,valid-type]
+        w: int = attrs.field(default=4, validator=validator)
+
+    return Attrs
+
+
+@pytest.mark.parametrize("kind", ["plain", "dataclass", "attrs", "attrs_validated"])
+def test_auto_clear_subclass_kinds(kind: str) -> None:
+    x = _make_auto_clear_subclass(kind)()
+    assert (x.a, x.b(1), x.c, x.d) == (10, 13, 3, 5)
+
+    # attributes of the subclass
+    x.w = 5
+    assert set(x._cache) == {"a", "b", "c"}
+    assert x.d == 6
+
+    # attributes of the base class clear keys of both
+    x.x = 2
+    assert set(x._cache) == {"c"}
+    assert (x.a, x.b(1), x.d) == (20, 23, 7)
+    x.y = 3
+    assert set(x._cache) == {"a", "c", "d"}
+
+    if kind == "attrs_validated":
+        with pytest.raises(TypeError):
+            x.w = "a"
+
+
+def test_auto_clear_subclass() -> None:
+    @cached.auto_clear
+    @dataclasses.dataclass
+    class Base:
+        x: int = 1
+        _cache: dict[str, Any] = dataclasses.field(default_factory=dict, init=False)
+
+        @cached.prop(depends_on="x")
+        def a(self) -> int:
+            return self.x
+
+    @dataclasses.dataclass
+    class Sub(Base):
+        y: int = 2
+
+        @cached.prop(depends_on="y")
+        def b(self) -> int:
+            return self.y
+
+    s = Sub()
+    assert (s.a, s.b) == (1, 2)
+    s.y = 3
+    assert set(s._cache) == {"a"}
+    assert (s.a, s.b) == (1, 3)
+    s.x = 4
+    assert set(s._cache) == {"b"}
+
+
+def test_auto_clear_frozen() -> None:
+    @cached.auto_clear
+    @dataclasses.dataclass(frozen=True)
+    class Dataclass(_Base):
+        x: int = 1
+        y: int = 2
+        _cache: dict[str, Any] = dataclasses.field(default_factory=dict, init=False)
+
+    @cached.auto_clear
+    @attrs.frozen
+    class Attrs(_Base):
+        x: int = 1
+        y: int = 2
+        _cache: dict[str, Any] = attrs.field(factory=dict, init=False)
+
+    for cls, error in [
+        (Dataclass, dataclasses.FrozenInstanceError),
+        (Attrs, attrs.exceptions.FrozenInstanceError),
+    ]:
+        x = cls(x=2)
+        assert (x.a, x.b(1)) == (20, 23)
+        with pytest.raises(error):
+            x.x = 3
+        assert set(x._cache) == {"a", "b"}
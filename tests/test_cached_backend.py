@@ -0,0 +1,438 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from module_utilities import cached
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from typing import IO
+
+
+@pytest.fixture
+def backend(tmp_path: Path) -> Iterator[cached.SQLiteBackend]:
+    with cached.SQLiteBackend(tmp_path / "cache.sqlite") as b:
+        yield b
+
+
+def make_class(backend: Any) -> Any:
+    class Example:
+        def __init__(self, token: Any) -> None:
+            self._cache: dict[str, Any] = {}
+            self._cache_token = token
+            self.calls = 0
+
+        @cached.meth(backend=backend)
+        def meth(self, x: Any, y: int = 2) -> list[Any]:
+            self.calls += 1
+            return [x, y]
+
+        @cached.meth(backend=backend)
+        def no_args(self) -> int:
+            self.calls += 1
+            return 1
+
+        @cached.meth(backend=backend)
+        async def ameth(self, x: int) -> int:
+            self.calls += 1
+            await asyncio.sleep(0)
+            return x
+
+    return Example
+
+
+def test_sqlite_backend(backend: cached.SQLiteBackend) -> None:
+    assert isinstance(backend, cached.CacheBackend)
+    assert isinstance({}, cached.CacheBackend)
+
+    with pytest.raises(KeyError):
+        _ = backend["a"]
+    backend["a"] = {"x": [1]}
+    backend["b"] = None
+    assert backend["a"] == {"x": [1]}
+    assert backend["b"] is None
+    assert len(backend) == 2
+
+    del backend["a"]
+    with pytest.raises(KeyError):
+        del backend["a"]
+    backend.clear()
+    assert len(backend) == 0
+
+    with pytest.raises(ValueError, match="table must be"):
+        _ = cached.SQLiteBackend(backend.path, table="bad table")
+
+
+def test_meth_backend(backend: cached.SQLiteBackend) -> None:
+    cls = make_class(backend)
+    a, b, c = cls("token"), cls("token"), cls("other")
+
+    assert a.meth(1) == [1, 2]
+    assert a.meth(x=1, y=2) == [1, 2]
+    assert a.calls == 1
+    assert len(backend) == 1
+
+    # same token, so reuse
+    assert b.meth(1, 2) == [1, 2]
+    assert b.calls == 0
+    assert "meth" in b._cache
+
+    # different token
+    assert c.meth(1) == [1, 2]
+    assert c.calls == 1
+
+    # unhashable arguments
+    assert a.meth([1, 2]) == [[1, 2], 2]
+    assert b.meth([1, 2]) == [[1, 2], 2]
+    assert (a.calls, b.calls) == (2, 0)
+
+    assert a.no_args() == b.no_args() == 1
+    assert (a.calls, b.calls) == (3, 0)
+
+    async def main() -> None:
+        assert await a.ameth(3) == 3
+        assert await b.ameth(3) == 3
+
+    asyncio.run(main())
+    assert (a.calls, b.calls) == (4, 0)
+
+
+def test_meth_backend_restart(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    for expected_calls in (1, 0):
+        with cached.SQLiteBackend(path) as backend:
+            x = make_class(backend)("token")
+            assert x.meth(1) == [1, 2]
+            assert x.calls == expected_calls
+
+
+def test_meth_backend_no_token(backend: cached.SQLiteBackend) -> None:
+    x = make_class(backend)(None)
+    del x._cache_token
+    with pytest.raises(TypeError, match="must define attribute `_cache_token`"):
+        x.meth(1)
+
+
+def test_meth_backend_unpicklable_result(backend: cached.SQLiteBackend) -> None:
+    class Tmp:
+        _cache_token = 1
+
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls = 0
+
+        @cached.meth(backend=backend)
+        def meth(self, x: int) -> Any:
+            self.calls += 1
+            return x, threading.Lock()
+
+    x = Tmp()
+    lock = x.meth(1)
+    assert x.meth(1) is lock
+    assert x.calls == 1
+    assert len(backend) == 0
+
+
+@pytest.mark.parametrize("arg", [threading.Lock(), lambda: None, object()])
+def test_meth_backend_unstable_key(backend: cached.SQLiteBackend, arg: Any) -> None:
+    x = make_class(backend)("token")
+    assert x.meth(arg) == [arg, 2]
+    assert x.meth(arg) == [arg, 2]
+    assert x.calls == 1
+    assert len(backend) == 0
+
+    with pytest.raises(TypeError, match="stable hash"):
+        _ = cached.stable_hash(arg)
+
+
+def test_meth_backend_database_error(backend: cached.SQLiteBackend) -> None:
+    x = make_class(backend)("token")
+    assert x.meth(1) == [1, 2]
+    _ = backend._connection().execute("DROP TABLE cache")
+
+    y = make_class(backend)("token")
+    with pytest.raises(sqlite3.OperationalError):
+        _ = backend["a"]
+    assert y.meth(1) == [1, 2]
+    assert y.meth(1) == [1, 2]
+    assert y.calls == 1
+
+
+@dataclass(frozen=True)
+class _Params:
+    names: frozenset[str]
+    mode: _Mode
+
+
+class _Mode(Enum):
+    FAST = "fast"
+
+
+def test_stable_hash_across_processes() -> None:
+    value = ("name", "token", ((1, "a", None, 2.5), frozenset({("b", "c"), ("d", 1)})))
+    names = frozenset(f"name{i}" for i in range(20))
+    params = _Params(names, _Mode.FAST)
+    code = (
+        "from module_utilities.cached import stable_hash; "
+        f"from {__name__} import _Params, _Mode; "
+        f"print(stable_hash({value!r}), stable_hash(_Params({names!r}, _Mode.FAST)))"
+    )
+    out = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={
+                **os.environ,
+                "PYTHONHASHSEED": seed,
+                "PYTHONPATH": os.pathsep.join(sys.path),
+            },
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert out == {f"{cached.stable_hash(value)} {cached.stable_hash(params)}"}
+
+
+@pytest.fixture
+def shm_backend() -> Iterator[cached.SharedMemoryBackend]:
+    with cached.SharedMemoryBackend(prefix=f"mu_test_{os.getpid()}_") as b:
+        yield b
+
+
+def test_shared_memory_backend(shm_backend: cached.SharedMemoryBackend) -> None:
+    np = pytest.importorskip("numpy")
+
+    key = cached.stable_hash("a")
+    x = np.arange(6.0).reshape(2, 3).T
+    shm_backend[key] = x
+
+    # attach from another backend with the same prefix
+    with cached.SharedMemoryBackend(prefix=shm_backend.prefix) as other:
+        y = other[key]
+        np.testing.assert_array_equal(x, y)
+        assert not y.flags.writeable
+        with pytest.raises(ValueError, match="read-only"):
+            y[0, 0] = 1.0
+        del y
+
+    for value in (b"abc", bytearray(b"abc"), np.zeros(0)):
+        key = cached.stable_hash(value)
+        shm_backend[key] = value
+        out = shm_backend[key]
+        assert type(out) is type(value)
+        assert bytes(out) == bytes(value)
+
+    # not buffer backed, so not stored
+    key = cached.stable_hash("list")
+    shm_backend[key] = [1, 2]
+    with pytest.raises(KeyError):
+        _ = shm_backend[key]
+
+    key = cached.stable_hash("a")
+    del shm_backend[key]
+    with pytest.raises(KeyError):
+        _ = shm_backend[key]
+    with pytest.raises(KeyError):
+        del shm_backend[key]
+
+
+def test_shared_memory_backend_other_process(
+    shm_backend: cached.SharedMemoryBackend,
+) -> None:
+    np = pytest.importorskip("numpy")
+    key = cached.stable_hash("a")
+    shm_backend[key] = np.arange(3)
+
+    code = (
+        "from module_utilities.cached import SharedMemoryBackend; "
+        f"print(SharedMemoryBackend(prefix={shm_backend.prefix!r})[{key!r}].tolist())"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    assert out.stdout.strip() == "[0, 1, 2]"
+    assert not out.stderr
+
+    # creator unlinks on close
+    shm_backend.close()
+    with (
+        cached.SharedMemoryBackend(prefix=shm_backend.prefix) as other,
+        pytest.raises(KeyError),
+    ):
+        _ = other[key]
+
+
+_WORKER = """
+import sys, time
+import numpy as np
+from module_utilities import cached
+
+backend = cached.SharedMemoryBackend(prefix={prefix!r})
+
+
+class Example:
+    _cache_token = 1
+
+    def __init__(self):
+        self._cache = {{}}
+        self.calls = 0
+
+    @cached.meth(backend=backend)
+    def meth(self, n):
+        self.calls += 1
+        time.sleep(0.2)
+        return np.arange(n)
+
+
+x = Example()
+print(x.meth(3).tolist(), x.calls, flush=True)
+# keep published segments until all workers are done.
+sys.stdin.read()
+"""
+
+
+def test_shared_memory_backend_compute_once(
+    shm_backend: cached.SharedMemoryBackend,
+) -> None:
+    _ = pytest.importorskip("numpy")
+    code = _WORKER.format(prefix=shm_backend.prefix)
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", code],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(4)
+    ]
+    lines = [cast("IO[str]", p.stdout).readline().strip() for p in procs]
+    errors = [p.communicate()[1] for p in procs]
+
+    assert sorted(lines) == [
+        "[0, 1, 2] 0",
+        "[0, 1, 2] 0",
+        "[0, 1, 2] 0",
+        "[0, 1, 2] 1",
+    ]
+    # segments are unlinked by their creator, without resource tracker warnings
+    assert errors == [""] * 4
+
+
+def test_shared_memory_backend_claims(shm_backend: cached.SharedMemoryBackend) -> None:
+    np = pytest.importorskip("numpy")
+    key = cached.stable_hash("claim")
+
+    with cached.SharedMemoryBackend(prefix=shm_backend.prefix, timeout=0.05) as other:
+        # miss claims the key, so other processes wait, then compute anyway
+        with pytest.raises(KeyError):
+            _ = shm_backend[key]
+        start = time.monotonic()
+        with pytest.raises(KeyError):
+            _ = other[key]
+        assert time.monotonic() - start >= 0.05
+        other.release(key)
+
+        # released on store
+        shm_backend[key] = np.arange(2)
+        assert other[key].tolist() == [0, 1]
+
+        # or explicitly, for example if computing fails
+        key = cached.stable_hash("release")
+        with pytest.raises(KeyError):
+            _ = shm_backend[key]
+        shm_backend.release(key)
+        assert other._claim(key)
+        other.release(key)
+
+    # claims of exited processes are taken over
+    name = shm_backend._claim_name(key)
+    code = (
+        "from multiprocessing import resource_tracker, shared_memory; "
+        f"shm = shared_memory.SharedMemory({name!r}, create=True, size=8); "
+        "import os; shm.buf[:8] = os.getpid().to_bytes(8, 'little'); "
+        "resource_tracker.unregister(shm._name, 'shared_memory')"
+    )
+    _ = subprocess.run([sys.executable, "-c", code], check=True)
+    assert shm_backend._claim(key)
+    shm_backend.release(key)
+
+
+def test_meth_shared_memory_backend_release(
+    shm_backend: cached.SharedMemoryBackend,
+) -> None:
+    np = pytest.importorskip("numpy")
+
+    class Example:
+        _cache_token = 1
+
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.fail = True
+
+        @cached.meth(backend=shm_backend)
+        def meth(self, n: int) -> Any:
+            if self.fail:
+                msg = "failed"
+                raise ValueError(msg)
+            return np.arange(n)
+
+    x = Example()
+    with pytest.raises(ValueError, match="failed"):
+        x.meth(2)
+    assert not shm_backend._created
+    x.fail = False
+    assert x.meth(2).tolist() == [0, 1]
+
+    # values which are not buffer backed are computed by each process
+    with cached.SharedMemoryBackend(prefix=shm_backend.prefix, timeout=10) as other:
+        key = cached.stable_hash("list")
+        with pytest.raises(KeyError):
+            _ = shm_backend[key]
+        shm_backend[key] = [1]
+        start = time.monotonic()
+        with pytest.raises(KeyError):
+            _ = other[key]
+        assert time.monotonic() - start < 1
+
+
+def test_prop_shared_memory_backend(shm_backend: cached.SharedMemoryBackend) -> None:
+    np = pytest.importorskip("numpy")
+
+    class Example:
+        def __init__(self, token: Any) -> None:
+            self._cache: dict[str, Any] = {}
+            self._cache_token = token
+            self.calls = 0
+
+        @cached.prop(backend=shm_backend)
+        def array(self) -> Any:
+            self.calls += 1
+            return np.arange(3)
+
+        @cached.prop(backend=shm_backend)
+        def other(self) -> list[int]:
+            self.calls += 1
+            return [1]
+
+    a, b = Example("token"), Example("token")
+    np.testing.assert_array_equal(a.array, b.array)
+    assert a.other == b.other == [1]
+    assert (a.calls, b.calls) == (2, 1)
+    assert "array" in b._cache
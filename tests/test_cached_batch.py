@@ -0,0 +1,187 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from module_utilities import cached
+
+
+class Example:
+    def __init__(self) -> None:
+        self._cache: dict[str, Any] = {}
+        self.calls: list[Any] = []
+        self.scale = 2
+
+    @cached.batch_meth(stats=True, depends_on="scale")
+    def double(self, values: Any, offset: Any = 0) -> Any:
+        self.calls.append(values)
+        return [
+            v * self.scale + (offset if isinstance(offset, int) else 0) for v in values
+        ]
+
+    @cached.batch_meth(maxsize=2)
+    def bounded(self, values: Any) -> Any:
+        self.calls.append(values)
+        return list(values)
+
+    @cached.batch_meth
+    def bad(self, values: Any) -> Any:  # ruff:ignore[unused-method-argument]
+        return [1]
+
+    @cached.clear("scale")
+    def set_scale(self, scale: int) -> None:
+        self.scale = scale
+
+
+def test_batch_meth() -> None:
+    x = Example()
+    assert x.double([1, 2, 1]) == [2, 4, 2]
+    assert x.double((3, 2, 3, 1)) == [6, 4, 6, 2]
+    assert x.calls == [[1, 2], [3]]
+    # repeated misses are not hits
+    assert cached.info(x)["double"][:2] == (2, 3)
+
+    # other arguments
+    assert x.double([1], offset=1) == [3]
+    assert x.double([1], 1) == [3]
+    assert x.calls[2:] == [[1], [1]]
+    assert set(x._cache["double"]) == {
+        (),
+        ((1,), frozenset()),
+        ((), frozenset({("offset", 1)})),
+    }
+
+    # unhashable other arguments use key adapters
+    assert x.double([1], offset=[1]) == [2]
+    assert x.double([1], offset=[1]) == [2]
+    assert len(x.calls) == 5
+
+    x.set_scale(3)
+    assert "double" not in x._cache
+    assert x.double([1, 2]) == [3, 6]
+
+    x.calls.clear()
+    assert x.bounded([1, 2, 3]) == [1, 2, 3]
+    assert x.bounded([3, 1]) == [3, 1]
+    assert x.calls == [[1, 2, 3], [1]]
+
+    assert x.double([]) == []
+    with pytest.raises(ValueError, match="returned 1 results for 2 values"):
+        x.bad([1, 2])
+
+
+def test_batch_meth_stats_duplicates() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.batch_meth(stats=True)
+        def double(self, values: Any) -> Any:
+            return [2 * v for v in values]
+
+    x = Tmp()
+    assert x.double([1, 2, 2, 2]) == [2, 4, 4, 4]
+    assert cached.info(x)["double"][:2] == (0, 2)
+    assert x.double([2, 3, 3, 1]) == [4, 6, 6, 2]
+    assert cached.info(x)["double"][:2] == (2, 3)
+
+
+def test_batch_meth_unhashable_values() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls: list[Any] = []
+
+        @cached.batch_meth(stats=True)
+        def total(self, values: Any) -> Any:
+            self.calls.append(values)
+            return [sum(v) if isinstance(v, list) else v for v in values]
+
+    class Opaque:
+        __hash__ = None  # type: ignore[assignment]
+
+    x = Tmp()
+    assert x.total([[1, 2], 3, [1, 2]]) == [3, 3, 3]
+    assert x.total([[1, 2], [4]]) == [3, 4]
+    assert x.calls == [[[1, 2], 3], [[4]]]
+    assert cached.info(x)["total"][:2] == (1, 3)
+
+    # elements without key adapters are not cached
+    opaque = Opaque()
+    assert x.total([1, opaque]) == [1, opaque]
+    assert x.calls[-1] == [1, opaque]
+    assert cached.info(x)["total"][:2] == (1, 3)
+
+
+def test_batch_meth_numpy() -> None:
+    np = pytest.importorskip("numpy")
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls: list[Any] = []
+
+        @cached.batch_meth
+        def square(self, values: Any) -> Any:
+            self.calls.append(values)
+            return values**2
+
+        @cached.batch_meth
+        def pair(self, values: Any) -> Any:
+            return np.stack([values, -values], axis=-1)
+
+    x = Tmp()
+    values = np.array([[1, 2], [3, 1]], dtype=np.int32)
+    out = x.square(values)
+    np.testing.assert_array_equal(out, values**2)
+    assert out.dtype == np.int32
+    (batch,) = x.calls
+    assert batch.dtype == np.int32
+    np.testing.assert_array_equal(batch, [1, 2, 3])
+
+    np.testing.assert_array_equal(x.square(np.arange(4)), [0, 1, 4, 9])
+    np.testing.assert_array_equal(x.calls[-1], [0])
+
+    out = x.pair(np.array([1.0, 2.0]))
+    assert out.shape == (2, 2)
+    np.testing.assert_array_equal(out, [[1.0, -1.0], [2.0, -2.0]])
+
+
+def test_batch_meth_options() -> None:
+    calls: list[Any] = []
+
+    class Tmp:
+        _cache: dict[str, Any]
+
+        def __init__(self) -> None:
+            self._use_cache = False
+
+        @cached.batch_meth(check_use_cache=True, key="b", tags="t")
+        def a(self, values: Any) -> Any:
+            calls.append(values)
+            return list(values)
+
+        @cached.clear(tags="t")
+        def clear_t(self) -> None:
+            pass
+
+    x = Tmp()
+    assert x.a([1]) == x.a([1]) == [1]
+    assert len(calls) == 2
+    assert not hasattr(x, "_cache")
+
+    x._use_cache = True
+    assert x.a([1]) == x.a([1]) == [1]
+    assert len(calls) == 3
+    x.clear_t()
+    assert x._cache == {}
+
+    with pytest.raises(TypeError, match="coroutine"):
+
+        @cached.batch_meth
+        async def b(self: Any, values: Any) -> Any:  # ruff:ignore[unused-async, unused-function-argument]
+            return values
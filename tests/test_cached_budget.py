@@ -0,0 +1,476 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import gc
+import os
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from module_utilities import cached
+from module_utilities._cache_budget import (  # ruff:ignore[import-private-name]
+    NO_SUBKEY,
+)
+from module_utilities._cache_store import (  # ruff:ignore[import-private-name]
+    parse_bytes,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Example:
+    def __init__(self) -> None:
+        self._cache: dict[str, Any] = {}
+
+    @cached.prop
+    def data(self) -> bytearray:
+        return bytearray(100)
+
+    @cached.meth
+    def meth(self, n: int) -> bytearray:
+        return bytearray(n)
+
+    @cached.meth
+    def no_args(self) -> bytearray:
+        return bytearray(100)
+
+
+def _sizer(value: Any) -> int:
+    return len(value)
+
+
+@pytest.fixture
+def budget() -> Iterator[cached.MemoryBudget]:
+    b = cached.set_budget(250, sizer=_sizer)
+    assert b is not None
+    yield b
+    _ = cached.set_budget(None)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("100", 100),
+        ("2GB", 2 * 10**9),
+        ("2 gb", 2 * 10**9),
+        ("1.5kB", 1500),
+        ("1KiB", 1024),
+        ("2MiB", 2 * 1024**2),
+        ("3M", 3 * 10**6),
+        (10, 10),
+    ],
+)
+def test_parse_bytes(value: Any, expected: int) -> None:
+    assert parse_bytes(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "GB", "1iB", "1 PB", "-1"])
+def test_parse_bytes_bad(value: str) -> None:
+    with pytest.raises(ValueError, match="Could not parse"):
+        _ = parse_bytes(value)
+
+
+def test_budget_lru(budget: cached.MemoryBudget) -> None:
+    assert cached.get_budget() is budget
+    a, b, c = Example(), Example(), Example()
+    _ = (a.data, b.data)
+    assert budget.info() == (250, 200, 2, 0)
+
+    # use a, so b is least recently used
+    _ = a.data
+    _ = c.no_args()
+    assert "data" in a._cache
+    assert "data" not in b._cache
+    assert "no_args" in c._cache
+    assert budget.info() == (250, 200, 2, 1)
+
+    _ = a.meth(160)
+    assert "data" not in a._cache
+    assert "no_args" not in c._cache
+    assert list(a._cache["meth"]) == [((160,), frozenset())]
+    assert budget.info().used == 160
+
+    # garbage collected instances are forgotten
+    del a
+    _ = gc.collect()
+    assert budget.info() == (250, 0, 0, 3)
+
+    # recomputed values replace entries
+    _ = c.data
+    del c._cache["data"]
+    _ = c.data
+    assert budget.info().used == 100
+
+    budget.clear()
+    assert budget.info().entries == 0
+    assert repr(budget) == "MemoryBudget(nbytes=250, policy='lru', used=0)"
+
+
+def test_budget_clear(budget: cached.MemoryBudget) -> None:
+    class Tmp(Example):
+        @cached.clear("data")
+        def clear_data(self) -> None:
+            pass
+
+        @cached.clear
+        def clear_all(self) -> None:
+            pass
+
+    x = Tmp()
+    _ = (x.data, x.meth(50))
+    assert budget.info().used == 150
+    x.clear_data()
+    assert budget.info().used == 50
+    x.clear_all()
+    assert budget.info() == (250, 0, 0, 0)
+
+    @cached.func
+    def f(n: int) -> bytearray:
+        return bytearray(n)
+
+    _ = (f(10), f(20))
+    assert budget.info().used == 30
+    f.cache_clear()  # type: ignore[attr-defined]
+    assert budget.info().entries == 0
+
+    class Cls:
+        @cached.classmeth
+        def g(cls, n: int) -> bytearray:  # ruff:ignore[invalid-first-argument-name-for-method]
+            return bytearray(n)
+
+    _ = Cls.g(10)
+    assert budget.info().used == 10
+    cached.clear_class(Cls, "g")
+    assert budget.info().entries == 0
+
+
+def test_budget_cost() -> None:
+    budget = cached.MemoryBudget(250, policy="cost", sizer=lambda _: 100)
+    a, b = Example(), Example()
+    b._cache["x"] = "value"
+    budget.add(a, "x", NO_SUBKEY, None, cost=2.0)
+    budget.add(b, "x", NO_SUBKEY, None, cost=1.0)
+    budget.add(a, "y", NO_SUBKEY, None, cost=1.5)
+    assert "x" not in b._cache
+    assert budget.info() == (250, 200, 2, 1)
+
+    # unused entries age out
+    for _ in range(3):
+        budget.touch(a, "y", NO_SUBKEY)
+        budget.add(b, "z", NO_SUBKEY, None, cost=1.0)
+    assert {key for _, key, _ in budget._entries} == {"y", "z"}
+
+
+def test_budget_not_weakrefable(budget: cached.MemoryBudget) -> None:
+    class Slots:
+        __slots__ = ("_cache",)
+
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.prop
+        def data(self) -> bytearray:
+            return bytearray(1000)
+
+    x = Slots()
+    assert len(x.data) == 1000
+    assert budget.info().entries == 0
+
+
+def test_budget_bad() -> None:
+    with pytest.raises(ValueError, match="positive"):
+        _ = cached.set_budget(0)
+    with pytest.raises(ValueError, match="policy"):
+        _ = cached.set_budget("1GB", policy="fifo")  # type: ignore[arg-type]
+    assert cached.get_budget() is None
+
+
+def test_budget_environment() -> None:
+    code = (
+        "from module_utilities import cached; print(cached.get_budget().info().nbytes)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "MODULE_UTILITIES_CACHE_BUDGET": "2GB"},
+    )
+    assert out.stdout.strip() == "2000000000"
+
+    # invalid values disable the budget
+    out = subprocess.run(
+        [sys.executable, "-c", code.replace(".info().nbytes", "")],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "MODULE_UTILITIES_CACHE_BUDGET": "lots"},
+    )
+    assert out.stdout.strip() == "None"
+    assert "Ignoring MODULE_UTILITIES_CACHE_BUDGET='lots'" in out.stderr
+
+
+def test_budget_bounded_store() -> None:
+    class Bounded:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth(maxsize=2)
+        def meth(self, n: int) -> bytearray:  # ruff:ignore[unused-method-argument]
+            return bytearray(100)
+
+        @cached.prop
+        def data(self) -> bytearray:
+            return bytearray(400)
+
+    budget = cached.set_budget(1000, sizer=_sizer)
+    assert budget is not None
+    try:
+        # entries evicted by per method stores are forgotten
+        x, y = Bounded(), Bounded()
+        for n in range(10):
+            _ = x.meth(n)
+        assert budget.info() == (1000, 200, 2, 0)
+        _ = y.data
+        assert "data" in y._cache
+        assert budget.info() == (1000, 600, 3, 0)
+    finally:
+        _ = cached.set_budget(None)
+
+
+def test_budget_oversized(budget: cached.MemoryBudget) -> None:
+    x = Example()
+    _ = (x.data, x.meth(50))
+    # values larger than the budget are not kept, and do not evict others
+    assert len(x.meth(300)) == 300
+    assert list(x._cache["meth"]) == [((50,), frozenset())]
+    assert "data" in x._cache
+    assert budget.info() == (250, 150, 2, 1)
+
+
+def test_store_on_evict() -> None:
+    evicted: list[Any] = []
+    lru: cached.LRUCache[str, bytes] = cached.LRUCache(
+        2, max_bytes=100, on_evict=evicted.append
+    )
+    lru["a"], lru["b"], lru["c"] = b"", b"", b""
+    lru["c"] = bytes(200)
+    assert evicted == ["a", "c"]
+    assert list(lru) == ["b"]
+
+    evicted.clear()
+    gds: cached.GreedyDualSizeCache[str, int] = cached.GreedyDualSizeCache(
+        2, max_bytes=100, on_evict=evicted.append
+    )
+    gds.set("a", 1, cost=2.0)
+    gds.set("b", 2, cost=1.0)
+    gds.set("c", 3, cost=3.0)
+    gds.set("a", 4, size=200)
+    assert evicted == ["b", "a"]
+    assert list(gds) == ["c"]
+
+    evicted.clear()
+    tiny: cached.TinyLFUCache[str, int] = cached.TinyLFUCache(
+        2, on_evict=evicted.append
+    )
+    for key in "abc":
+        tiny[key] = 0
+    assert evicted == ["b"]
+    assert sorted(tiny) == ["a", "c"]
+
+
+def test_sizeof() -> None:
+    class Rows:
+        def __init__(self, n: int) -> None:
+            self.rows = list(range(n))
+
+    class MoreRows(Rows):
+        pass
+
+    assert cached.sizeof(bytes(10)) == 10
+    assert cached.sizeof(memoryview(bytearray(12))) == 12
+    assert cached.sizeof(1.0) == sys.getsizeof(1.0)
+    assert cached.sizeof(Rows(3)) == sys.getsizeof(Rows(3))
+
+    @cached.register_sizer(Rows)
+    def _(value: Rows) -> int:
+        return 8 * len(value.rows)
+
+    assert cached.sizeof(MoreRows(3)) == 24
+
+    np = pytest.importorskip("numpy")
+    assert cached.sizeof(np.zeros(10)) == 80
+
+
+def test_lru_max_bytes() -> None:
+    c: cached.LRUCache[str, bytes] = cached.LRUCache(max_bytes="1kB")
+    c["a"] = bytes(500)
+    c["b"] = bytes(300)
+    _ = c["a"]
+    c["c"] = bytes(300)
+    assert list(c) == ["a", "c"]
+    assert c.nbytes == 800
+
+    # too large to keep.  Other entries are kept, and an old value is dropped.
+    c["d"] = bytes(2000)
+    assert list(c) == ["a", "c"]
+    assert c.nbytes == 800
+    c["c"] = bytes(2000)
+    assert list(c) == ["a"]
+    assert c.nbytes == 500
+    c.clear()
+
+    c["a"] = bytes(100)
+    c["a"] = bytes(200)
+    c["b"] = bytes(10)
+    assert c.nbytes == 210
+    assert c.pop("b") == bytes(10)
+    assert c.pop("b", None) is None
+    del c["a"]
+    assert c.nbytes == 0
+    c["a"] = bytes(1)
+    c.clear()
+    assert c.nbytes == 0
+
+    # both limits
+    c = cached.LRUCache(2, max_bytes=100, sizer=len)
+    c["a"], c["b"], c["c"] = b"a", b"b", b"c"
+    assert list(c) == ["b", "c"]
+    assert repr(c) == "LRUCache(2, {'b': b'b', 'c': b'c'}, max_bytes=100)"
+    d = copy.deepcopy(c)
+    assert (d.maxsize, d.max_bytes, d.nbytes, d.sizer) == (2, 100, 2, len)
+
+    with pytest.raises(ValueError, match="At least one"):
+        _ = cached.LRUCache()
+    with pytest.raises(ValueError, match="max_bytes must be positive"):
+        _ = cached.LRUCache(max_bytes=0)
+
+
+def test_greedy_dual_size_max_bytes() -> None:
+    c: cached.GreedyDualSizeCache[str, Any] = cached.GreedyDualSizeCache(max_bytes=100)
+    c.set("a", None, cost=1.0, size=60)
+    c.set("b", None, cost=0.1, size=30)
+    c.set("c", None, cost=1.0, size=30)
+    assert sorted(c) == ["a", "c"]
+    assert c.nbytes == 90
+    c["d"] = bytes(200)
+    assert sorted(c) == ["a", "c"]
+    assert c.nbytes == 90
+    del c["a"]
+    assert c.nbytes == 30
+    c.clear()
+    assert c.nbytes == 0
+
+
+def test_meth_max_bytes() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth(max_bytes=1000, stats=True)
+        def lru(self, n: int) -> bytes:
+            return bytes(n)
+
+        @cached.meth(max_bytes=1000, policy="cost", ttl=60)
+        def cost(self, n: int) -> bytes:
+            return bytes(n)
+
+    x = Tmp()
+    for n in (600, 300, 200):
+        _ = x.lru(n)
+        _ = x.cost(n)
+    assert [args for args, _ in x._cache["lru"]] == [(300,), (200,)]
+    assert x._cache["lru"].nbytes == 500
+    assert cached.info(x)["lru"].evictions == 1
+    # sized by value, not the (value, expires) entry
+    store = x._cache["cost"]
+    assert store.nbytes == sum(n for (n,), _ in store) <= 1000
+
+    # an oversized result is returned, but leaves stored results alone
+    assert len(x.lru(2000)) == 2000
+    assert [args for args, _ in x._cache["lru"]] == [(300,), (200,)]
+    assert cached.info(x)["lru"].rejections == 1
+    before = sorted(store)
+    assert len(x.cost(2000)) == 2000
+    assert sorted(store) == before
+
+    with pytest.raises(ValueError, match="tinylfu"):
+        _ = cached.meth(max_bytes=100, policy="tinylfu")
+
+
+def test_prop_max_bytes() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.prop(max_bytes=1000, stats=True)
+        def a(self) -> bytes:
+            return bytes(600)
+
+        @cached.prop(max_bytes=1000, ttl=60)
+        def b(self) -> bytes:
+            return bytes(300)
+
+        @cached.prop(max_bytes="1kB")
+        def c(self) -> bytes:
+            return bytes(200)
+
+        @cached.prop(max_bytes=100, stats=True)
+        def big(self) -> bytes:
+            return bytes(200)
+
+        @cached.prop
+        def other(self) -> bytes:
+            return bytes(1000)
+
+    x = Tmp()
+    _ = (x.other, x.a, x.b)
+    assert set(x._cache) == {"other", "a", "b"}
+    # "a" is the largest value of the group
+    _ = x.c
+    assert set(x._cache) == {"other", "b", "c"}
+    assert cached.info(x)["a"].evictions == 1
+
+    assert len(x.big) == 200
+    assert "big" not in x._cache
+    assert set(x._cache) == {"other", "b", "c"}
+    # oversized values are counted as rejections, as for cached.meth
+    assert cached.info(x)["big"].rejections == 1
+    assert cached.info(x)["big"].evictions == 0
+
+
+def test_meth_no_args_max_bytes() -> None:
+    class Tmp:
+        def __init__(self, n: int) -> None:
+            self._cache: dict[str, Any] = {}
+            self.n = n
+            self.calls = 0
+
+        @cached.meth(max_bytes=100, stats=True)
+        def data(self) -> bytes:
+            self.calls += 1
+            return bytes(self.n)
+
+        @cached.meth(max_bytes=100, stats=True)
+        async def adata(self) -> bytes:
+            self.calls += 1
+            return bytes(self.n)
+
+    small, big = Tmp(50), Tmp(200)
+    for x in (small, big):
+        assert len(x.data()) == len(x.data()) == x.n
+        assert len(asyncio.run(x.adata())) == len(asyncio.run(x.adata())) == x.n
+
+    assert small.calls == 2
+    assert set(small._cache) == {"data", "adata"}
+    assert big.calls == 4
+    assert not big._cache
+    assert cached.info(big)["data"].rejections == 2
+    assert cached.info(big)["adata"].rejections == 2
@@ -0,0 +1,177 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=missing-class-docstring
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from module_utilities import cached
+
+
+def test_func() -> None:
+    calls: list[Any] = []
+
+    @cached.func
+    def f(x: int, y: int = 2, *, z: int = 3) -> int:
+        """Docstring."""
+        calls.append((x, y, z))
+        return x + y + z
+
+    assert f.__name__ == "f"
+    assert f.__doc__ == "Docstring."
+
+    assert f(1) == f(1, 2) == f(x=1, z=3) == 6
+    assert f(1, z=4) == 7
+    assert calls == [(1, 2, 3), (1, 2, 4)]
+    cache: dict[str, Any] = f.cache  # type: ignore[attr-defined]
+    assert set(cache["f"]) == {
+        ((1, 2), frozenset({("z", 3)})),
+        ((1, 2), frozenset({("z", 4)})),
+    }
+
+    f.cache_clear()  # type: ignore[attr-defined]
+    assert cache == {}
+    assert f(1) == 6
+    assert len(calls) == 3
+
+
+def test_func_options() -> None:
+    calls: list[Any] = []
+
+    @cached.func(maxsize=2, stats=True, key="g_key", key_func=len)
+    def g(x: list[int]) -> int:
+        calls.append(x)
+        return sum(x)
+
+    assert g([1, 2]) == 3
+    assert g([2, 2]) == 3
+    assert g([1]) == 1
+    assert g([1, 2, 3]) == 6
+    assert g([5, 5]) == 10
+    assert len(calls) == 4
+    assert cached.info(g)["g_key"][:3] == (1, 4, 2)
+
+    name = f"{__name__}.test_func_options.<locals>.g_key"
+    assert cached.stats()[name][:3] == (1, 4, 2)
+
+    with pytest.raises(ValueError, match="maxsize must be"):
+        _ = cached.func(maxsize=0)
+
+
+def test_func_unhashable_and_async() -> None:
+    @cached.func
+    def f(x: list[int]) -> list[int]:
+        return [*x, len(x)]
+
+    assert f([1]) is f([1])
+
+    @cached.func
+    async def g(x: int) -> list[int]:
+        await asyncio.sleep(0)
+        return [x]
+
+    async def main() -> None:
+        a, b = await asyncio.gather(g(1), g(1))
+        assert a is b
+        assert await g(1) is a
+
+    asyncio.run(main())
+    assert len(g.cache["g"]) == 1  # type: ignore[attr-defined]
+
+
+def test_func_backend() -> None:
+    backend: dict[str, Any] = {}
+
+    def make() -> Any:
+        @cached.func(backend=backend)
+        def f(x: int) -> list[int]:
+            return [x]
+
+        return f
+
+    f0, f1 = make(), make()
+    out = f0(1)
+    assert len(backend) == 1
+    assert f1(1) is out
+
+
+class Base:
+    calls = 0
+
+    @cached.classmeth(stats=True)
+    def create(cls: type[Base], x: int) -> list[Any]:  # ruff:ignore[invalid-first-argument-name-for-method]
+        cls.calls += 1
+        return [cls.__name__, x]
+
+    @cached.classmeth
+    @classmethod
+    async def acreate(cls, x: int) -> list[Any]:
+        await asyncio.sleep(0)
+        return [cls.__name__, x]
+
+
+class Derived(Base):
+    calls = 0
+
+
+def test_classmeth() -> None:
+    cached.clear_class(Base)
+    cached.clear_class(Derived)
+    Base.calls = Derived.calls = 0
+
+    assert Base.create(1) == ["Base", 1]
+    assert Base.create(1) is Base.create(x=1)
+    assert Base().create(1) is Base.create(1)
+    assert Derived.create(1) == ["Derived", 1]
+    assert (Base.calls, Derived.calls) == (1, 1)
+
+    assert "create" in cached.info(Base)
+    assert cached.info(Base.create) == {"create": cached.info(Base)["create"]}
+
+    cached.clear_class(Base, "create")
+    assert Base.create(1) == ["Base", 1]
+    assert Derived.create(1) == ["Derived", 1]
+    assert (Base.calls, Derived.calls) == (2, 1)
+
+    async def main() -> None:
+        a = await Derived.acreate(2)
+        assert a == ["Derived", 2]
+        assert await Derived.acreate(2) is a
+
+    asyncio.run(main())
+
+    cached.clear_class(Derived)
+    assert Derived.__dict__["_cached_class_store"]._cache == {}
+
+    class NotCached:
+        pass
+
+    cached.clear_class(NotCached)
+
+
+def test_classmeth_key_func() -> None:
+    seen: list[Any] = []
+
+    def key_func(cls: type[Any], x: Any) -> Any:
+        seen.append(cls)
+        return x["id"]
+
+    class Tmp:
+        calls = 0
+
+        @cached.classmeth(key_func=key_func)
+        def create(cls, x: Any) -> Any:  # ruff:ignore[invalid-first-argument-name-for-method]
+            cls.calls += 1
+            return x["value"]
+
+    class Sub(Tmp):
+        calls = 0
+
+    assert Tmp.create({"id": 1, "value": "a"}) == "a"
+    assert Tmp.create({"id": 1, "value": "b"}) == "a"
+    assert Sub.create({"id": 1, "value": "c"}) == "c"
+    assert seen == [Tmp, Tmp, Sub]
+    assert (Tmp.calls, Sub.calls) == (1, 1)
@@ -0,0 +1,282 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=unused-argument
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from functools import wraps
+from inspect import signature
+from typing import Any
+
+import pytest
+
+from module_utilities import cached
+from module_utilities._cache_keys import (  # ruff:ignore[import-private-name]
+    _FROZEN,
+    bind_key_builder,
+    freeze,
+    key_builder,
+    stable_hash,
+)
+from module_utilities.cached import (
+    _takes_only_self,  # ruff:ignore[import-private-name]
+)
+
+
+def f0(self, x, y=2): ...
+def f1(self, x, /, y, *, z=3): ...
+def f2(self, *args): ...
+def f3(self, /, **kwargs): ...
+def f4(self, /, *args, **kwargs): ...
+def f5(self, beta, *args, z, **kwargs): ...
+def f6(self, a=[1], *, b=None): ...  # ruff: ignore[mutable-argument-default]
+def f7(self, /, frozenset=1, x=2): ...  # ruff: ignore[builtin-argument-shadowing]
+
+
+CALLS: list[tuple[Any, tuple[Any, ...], dict[str, Any]]] = [
+    (f0, (1,), {}),
+    (f0, (1, 3), {}),
+    (f0, (), {"y": 3, "x": 1}),
+    (f1, (1, 2), {}),
+    (f1, (1,), {"y": 2, "z": 4}),
+    (f2, (), {}),
+    (f2, (1, 2, 3), {}),
+    (f3, (), {"a": 1, "b": 2}),
+    (f4, (1, 2), {"a": 1}),
+    (f5, (1, 2, 3), {"z": 1, "w": 2}),
+    (f6, (), {}),
+    (f6, ((1,),), {"b": 2}),
+    (f7, (), {"frozenset": 3}),
+]
+
+
+@pytest.mark.parametrize(("func", "args", "kwargs"), CALLS)
+def test_key_builder(func, args, kwargs) -> None:
+    sig = signature(func)
+    expected = bind_key_builder(sig)(None, *args, **kwargs)
+    out = key_builder(sig, func.__name__)(None, *args, **kwargs)
+    assert out == expected
+    assert type(out[0]) is tuple
+    assert type(out[1]) is frozenset
+
+
+@pytest.mark.parametrize(
+    ("func", "args", "kwargs"),
+    [
+        (f0, (), {}),
+        (f0, (1, 2, 3), {}),
+        (f0, (1,), {"z": 1}),
+        (f1, (), {"x": 1, "y": 2}),
+        (f5, (1,), {}),
+    ],
+)
+def test_key_builder_errors(func, args, kwargs) -> None:
+    sig = signature(func)
+    with pytest.raises(TypeError):
+        bind_key_builder(sig)(None, *args, **kwargs)
+    with pytest.raises(TypeError, match=func.__name__):
+        key_builder(sig, func.__name__)(None, *args, **kwargs)
+
+
+def test_key_builder_fallback() -> None:
+    def g(*args): ...
+    def h(self, __x): ...
+
+    for func in (g, h):
+        make_key = key_builder(signature(func), func.__name__)
+        assert make_key.__qualname__.endswith("bind_key_builder.<locals>.make_key")
+
+    assert key_builder(signature(f0), "<lambda>").__name__ == "make_key"
+    assert key_builder(signature(f0), "class").__name__ == "make_key"
+    assert key_builder(signature(f0), "meth").__name__ == "meth"
+
+
+def test_freeze() -> None:
+    assert freeze(1) == 1
+    assert freeze((1, [2])) == (1, (_FROZEN, list, (2,)))
+    assert freeze([1, 2]) != freeze((1, 2))
+    assert freeze([1, 2]) != freeze((list, (1, 2)))
+    assert freeze({"a": [1]}) == (
+        _FROZEN,
+        dict,
+        frozenset({("a", (_FROZEN, list, (1,)))}),
+    )
+    assert freeze({1, 2}) == (_FROZEN, set, frozenset({1, 2}))
+    assert freeze(bytearray(b"ab")) == (_FROZEN, bytearray, b"ab")
+    # the tag survives copies, and hashes stably
+    assert copy.deepcopy(freeze([1])) == freeze([1])
+    assert stable_hash(freeze([1])) == stable_hash(copy.deepcopy(freeze([1])))
+    assert stable_hash(freeze([1])) != stable_hash((list, (1,)))
+
+    class Unhashable:
+        __hash__ = None  # type: ignore[assignment]  # pyright: ignore[reportAssignmentType]
+
+    v = Unhashable()
+    assert freeze(v) is v
+
+
+def test_freeze_buffer() -> None:
+    from array import array
+
+    a = array("d", [1.0, 2.0])
+    key = freeze(a)
+    assert key == freeze(array("d", [1.0, 2.0]))
+    assert key != freeze(array("d", [1.0, 3.0]))
+    assert key != freeze(array("f", [1.0, 2.0]))
+    hash(key)
+
+
+def test_freeze_numpy() -> None:
+    np = pytest.importorskip("numpy")
+
+    a = np.arange(6.0).reshape(2, 3)
+    key = freeze(a)
+    hash(key)
+    assert key == freeze(a.copy())
+    assert key != freeze(a.reshape(3, 2))
+    assert key != freeze(a.astype(np.float32))
+    assert key != freeze(a + 1)
+    # non contiguous
+    assert freeze(a.T) == freeze(np.ascontiguousarray(a.T))
+    # datetime and object arrays
+    hash(freeze(np.array(["2020-01-01"], dtype="datetime64[D]")))
+    b = np.array([[1]], dtype=object)
+    assert freeze(b) is b
+
+
+def test_register_key_adapter() -> None:
+    class Point:
+        __hash__ = None  # type: ignore[assignment]  # pyright: ignore[reportAssignmentType]
+
+        def __init__(self, x: int, y: int) -> None:
+            self.x, self.y = x, y
+
+    @cached.register_key_adapter(Point)
+    def _(p: Point) -> tuple[Any, ...]:
+        return (Point, p.x, p.y)
+
+    class SubPoint(Point):
+        pass
+
+    assert freeze(Point(1, 2)) == (Point, 1, 2)
+    assert freeze([SubPoint(1, 2)]) == (_FROZEN, list, ((Point, 1, 2),))
+
+
+def test_meth_unhashable_args() -> None:
+    np = pytest.importorskip("numpy")
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls = 0
+
+        @cached.meth
+        def meth(self, a: Any, *, opts: Any = None) -> Any:
+            self.calls += 1
+            return [a, opts]
+
+    x = Tmp()
+    a = np.arange(3)
+    out = x.meth(a, opts={"b": [1]})
+    assert x.meth(a.copy(), opts={"b": [1]}) is out
+    assert x.meth(a + 1, opts={"b": [1]}) is not out
+    assert x.meth([1], opts=[2]) is x.meth([1], opts=[2])
+    assert x.calls == 3
+
+    with pytest.raises(TypeError, match="meth"):
+        x.meth([1], other=[2])  # type: ignore[call-arg]  # pyright: ignore[reportCallIssue]
+
+
+def test_meth_unhashable_args_collision() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth
+        def meth(self, x: Any) -> str:
+            return type(x).__name__
+
+    x = Tmp()
+    assert x.meth([1, 2]) == "list"
+    assert x.meth((list, (1, 2))) == "tuple"
+    assert x.meth({"a": 1}) == "dict"
+    assert x.meth((dict, frozenset({("a", 1)}))) == "tuple"
+    assert len(x._cache["meth"]) == 4
+
+
+def test_meth_key_func() -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth(key_func=lambda self, x, **kwargs: x)  # ruff: ignore[unused-lambda-argument]
+        def meth(self, x: int, verbose: bool = False) -> list[int]:
+            return [x, 0] if verbose else [x]
+
+        @cached.decorate(as_property=False, key_func=lambda self, x: round(x))  # ruff: ignore[unused-lambda-argument]
+        def meth2(self, x: float) -> list[float]:
+            return [x]
+
+    x = Tmp()
+    assert x.meth(1) is x.meth(1, verbose=True)
+    assert list(x._cache["meth"]) == [1]
+    assert x.meth2(1.1) is x.meth2(0.9)
+
+    with pytest.raises(ValueError, match="key_func"):
+        cached.decorate(key_func=lambda self: 1)  # type: ignore[call-overload]  # pyright: ignore[reportCallIssue,reportArgumentType]  # ruff: ignore[unused-lambda-argument]
+
+
+def g0(self): ...
+def g1(self, /): ...
+def g2(*args): ...
+def g3(*, self): ...
+
+
+class Bound:
+    def meth(self, x): ...
+
+
+@pytest.mark.parametrize(
+    "func",
+    [f0, f1, f2, f3, f4, f5, f6, f7, g0, g1, g2, g3, Bound().meth, wraps(f0)(g0)],
+)
+def test_takes_only_self(func) -> None:
+    assert _takes_only_self(func) == (len(signature(func).parameters) == 1)
+
+
+def test_meth_lazy_signature(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[Any] = []
+
+    def counted(func: Any) -> Any:
+        calls.append(func)
+        return signature(func)
+
+    monkeypatch.setattr(cached, "signature", counted)
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth
+        def a(self) -> int:
+            return 1
+
+        @cached.meth(weak_args=True)
+        def b(self, x: int, y: int = 2) -> int:
+            return x + y
+
+        @cached.meth
+        async def c(self, x: int) -> int:
+            return x
+
+    # signatures are only inspected on first call of methods with arguments
+    assert not calls
+    x = Tmp()
+    assert x.a() == 1
+    assert not calls
+    assert (x.b(1), x.b(x=1, y=2), x.b(2)) == (3, 3, 4)
+    assert len(calls) == 1
+    assert len(x._cache["b"]) == 2
+    assert asyncio.run(x.c(1)) == 1
+    assert len(calls) == 2
@@ -0,0 +1,196 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Executor, Future
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from module_utilities import cached
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ManualExecutor(Executor):
+    """Executor running submitted calls on demand."""
+
+    def __init__(self) -> None:
+        self.tasks: list[Callable[[], Any]] = []
+
+    def submit(
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Future[Any]:
+        self.tasks.append(lambda: fn(*args, **kwargs))
+        return Future()
+
+    def run(self) -> None:
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            task()
+
+
+executor = ManualExecutor()
+
+
+class Example:
+    def __init__(self) -> None:
+        self._cache: dict[str, Any] = {}
+        self.calls = 0
+        self.fail = False
+
+    @cached.prop(ttl=10, stale_while_revalidate=5, executor=executor)
+    def value(self) -> int:
+        if self.fail:
+            msg = "failed"
+            raise ValueError(msg)
+        self.calls += 1
+        return self.calls
+
+    @cached.meth(ttl=10, stale_while_revalidate=5, executor=executor)
+    def no_args(self) -> int:
+        self.calls += 1
+        return self.calls
+
+    @cached.meth(ttl=10, stale_while_revalidate=5, executor=executor)
+    def scaled(self, x: Any) -> Any:
+        self.calls += 1
+        return x * self.calls
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    c = Clock()
+    monkeypatch.setattr(cached, "monotonic", c)
+    executor.tasks.clear()
+    return c
+
+
+@pytest.mark.parametrize("name", ["value", "no_args"])
+def test_stale_while_revalidate(clock: Clock, name: str) -> None:
+    x = Example()
+
+    def get() -> int:
+        out = getattr(x, name)
+        return out() if callable(out) else out  # type: ignore[no-any-return]
+
+    assert get() == 1
+
+    # stale values are returned, with a single refresh scheduled
+    clock.now = 12
+    assert (get(), get()) == (1, 1)
+    assert len(executor.tasks) == 1
+    executor.run()
+    assert x.calls == 2
+    assert get() == 2
+    assert not executor.tasks
+
+    # past the stale window, values are recomputed by the caller
+    clock.now = 30
+    assert get() == 3
+    assert not executor.tasks
+
+
+def test_stale_while_revalidate_args(clock: Clock) -> None:
+    x = Example()
+    assert (x.scaled(1), x.scaled(2)) == (1, 4)
+
+    clock.now = 11
+    assert (x.scaled(1), x.scaled(2), x.scaled(1)) == (1, 4, 1)
+    assert len(executor.tasks) == 2
+    executor.run()
+    assert (x.scaled(1), x.scaled(2)) == (3, 8)
+
+    # unhashable arguments
+    assert x.scaled([1]) == [1] * 5
+    clock.now = 22
+    assert x.scaled([1]) == [1] * 5
+    executor.run()
+    assert x.scaled([1]) == [1] * 6
+
+
+def test_stale_while_revalidate_claim(clock: Clock) -> None:
+    x = Example()
+    _ = x.value
+    clock.now = 12
+    _ = x.value
+    # window passes before the refresh starts.  The caller computes the value.
+    clock.now = 20
+    assert x.value == 2
+    executor.run()
+    assert x.calls == 2
+
+
+def test_stale_while_revalidate_failure(clock: Clock) -> None:
+    x = Example()
+    _ = x.value
+    x.fail = True
+    clock.now = 12
+    assert x.value == 1
+    executor.run()
+    # failures are not stored, and the refresh is retried
+    assert x.value == 1
+    assert len(executor.tasks) == 1
+
+    clock.now = 20
+    with pytest.raises(ValueError, match="failed"):
+        _ = x.value
+
+
+def test_stale_while_revalidate_default_executor() -> None:
+    started, release = threading.Event(), threading.Event()
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls = 0
+
+        @cached.prop(ttl=60, stale_while_revalidate=60)
+        def value(self) -> int:
+            self.calls += 1
+            if self.calls > 1:
+                started.set()
+                _ = release.wait(5)
+            return self.calls
+
+    x = Tmp()
+    _ = x.value
+    value, expires = x._cache["value"]
+    x._cache["value"] = (value, expires - 60)
+    assert x.value == 1
+    assert started.wait(5)
+    # in flight refresh is not scheduled again
+    assert x.value == 1
+    release.set()
+    for _ in range(500):
+        if x._cache["value"][0] == 2:
+            break
+        _ = threading.Event().wait(0.01)
+    assert x.value == 2
+    assert x.calls == 2
+
+
+def test_stale_while_revalidate_bad() -> None:
+    with pytest.raises(ValueError, match="requires ttl"):
+        _ = cached.prop(stale_while_revalidate=1)
+    with pytest.raises(ValueError, match="positive"):
+        _ = cached.meth(ttl=1, stale_while_revalidate=0)
+
+    async def f(self: Any) -> int:  # ruff:ignore[unused-async, unused-function-argument]
+        return 1
+
+    with pytest.raises(ValueError, match="coroutine"):
+        _ = cached.prop(ttl=1, stale_while_revalidate=1)(f)
+    with pytest.raises(ValueError, match="coroutine"):
+        _ = cached.meth(ttl=1, stale_while_revalidate=1)(f)
@@ -0,0 +1,184 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+
+import pytest
+
+from module_utilities import cached, options
+
+
+class Example:
+    def __init__(self) -> None:
+        self._cache: dict[str, Any] = {}
+
+    @cached.prop(stats=True)
+    def a(self) -> int:
+        return 1
+
+    @cached.meth(stats=True)
+    def b(self) -> int:
+        return 2
+
+    @cached.meth(maxsize=2, stats=True, key="my_key")
+    def c(self, x: Any) -> Any:
+        return x
+
+    @cached.prop(stats=False)
+    def no_stats(self) -> int:
+        return 3
+
+    @cached.prop(stats=True)
+    async def d(self) -> int:
+        await asyncio.sleep(0)
+        return 4
+
+    @cached.meth(stats=True)
+    async def e(self, x: Any) -> Any:
+        await asyncio.sleep(0)
+        return x
+
+
+@pytest.fixture
+def example() -> Example:
+    _ = cached.stats(reset=True)
+    return Example()
+
+
+def test_info(example: Example) -> None:
+    x = example
+    assert cached.info(x) == cached.info(Example)
+    assert set(cached.info(x)) == {"a", "b", "my_key", "d", "e"}
+    assert all(v == (0, 0, 0, 0.0, 0.0, 0.0, 0) for v in cached.info(x).values())
+
+    for _ in range(3):
+        _ = x.a
+        _ = x.b()
+        _ = x.no_stats
+
+    info = cached.info(x)
+    for k in ("a", "b"):
+        assert info[k][:3] == (2, 1, 0)
+        assert info[k].compute_time >= info[k].max_compute_time >= 0.0
+
+    for v in [1, 2, 1, 3, 1, [1]]:
+        _ = x.c(v)
+    # [1] is cached via key adapter, so 3 evicts 2 and [1] evicts 3.
+    assert cached.info(x)["my_key"][:3] == (2, 4, 2)
+
+    # shared between instances
+    _ = Example().a
+    assert cached.info(x)["a"].misses == 2
+
+
+def test_info_async(example: Example) -> None:
+    x = example
+
+    async def main() -> None:
+        for _ in range(2):
+            assert await x.d == 4
+            assert await x.e(1) == 1
+            assert await x.e([1]) == [1]
+
+    asyncio.run(main())
+
+    info = cached.info(x)
+    assert info["d"][:2] == (1, 1)
+    assert info["e"][:2] == (2, 2)
+
+
+def test_stats(example: Example) -> None:
+    _ = example.a
+    _ = example.a
+
+    out = cached.stats()
+    name = f"{__name__}.Example.a"
+    assert out[name][:2] == (1, 1)
+    assert f"{__name__}.Example.no_stats" not in out
+
+    assert cached.stats(reset=True)[name][:2] == (1, 1)
+    assert cached.stats()[name][:2] == (0, 0)
+    assert cached.info(example)["a"][:2] == (0, 0)
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_stats_default(monkeypatch: pytest.MonkeyPatch, enabled: bool) -> None:
+    # default is read from the environment on import
+    monkeypatch.setenv("MODULE_UTILITIES_CACHE_STATS", str(enabled))
+    assert options._get_cache_stats() is enabled
+    monkeypatch.setattr(cached, "CACHE_STATS", enabled)
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.prop
+        def a(self) -> int:
+            return 1
+
+        @cached.meth
+        def b(self, x: int) -> int:
+            return x
+
+    assert set(cached.info(Tmp)) == ({"a", "b"} if enabled else set())
+
+    monkeypatch.delenv("MODULE_UTILITIES_CACHE_STATS")
+    assert not options._get_cache_stats()
+
+
+def test_admission() -> None:
+    import time
+
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+            self.calls = 0
+
+        @cached.meth(min_compute_time=0.005, stats=True)
+        def slow_if_negative(self, x: int) -> int:
+            self.calls += 1
+            if x < 0:
+                time.sleep(0.01)
+            return x
+
+        @cached.meth(admit=lambda value: value is not None, stats=True)
+        def lookup(self) -> Any:
+            self.calls += 1
+            return None
+
+        @cached.meth(min_compute_time=0.0, admit=bool)
+        async def alookup(self, x: int) -> int:
+            self.calls += 1
+            await asyncio.sleep(0)
+            return x
+
+    x = Tmp()
+    for _ in range(2):
+        assert x.slow_if_negative(1) == 1
+        assert x.slow_if_negative(-1) == -1
+    assert x.calls == 3
+    assert list(x._cache["slow_if_negative"]) == [((-1,), frozenset())]
+    info = cached.info(x)["slow_if_negative"]
+    assert (info.hits, info.misses, info.rejections) == (1, 3, 2)
+
+    assert x.lookup() is None
+    assert x.lookup() is None
+    assert "lookup" not in x._cache
+    assert cached.info(x)["lookup"].rejections == 2
+
+    async def main() -> None:
+        assert await x.alookup(0) == 0
+        assert await x.alookup(1) == 1
+        assert await x.alookup(1) == 1
+
+    x.calls = 0
+    asyncio.run(main())
+    assert x.calls == 2
+    assert list(x._cache["alookup"]) == [((1,), frozenset())]
+
+    for value in [-1.0, "1", True]:
+        with pytest.raises(ValueError, match="min_compute_time"):
+            _ = cached.meth(min_compute_time=cast("Any", value))
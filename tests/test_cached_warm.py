@@ -0,0 +1,154 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from module_utilities import cached
+
+
+class Example:
+    def __init__(self) -> None:
+        self._cache: dict[str, Any] = {}
+        self.calls: list[str] = []
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    @cached.prop
+    def a(self) -> int:
+        self.calls.append("a")
+        _ = self.barrier.wait()
+        return 1
+
+    @cached.meth
+    def b(self) -> int:
+        self.calls.append("b")
+        _ = self.barrier.wait()
+        return 2
+
+    @cached.prop(lock=True)
+    def c(self) -> int:
+        self.calls.append("c")
+        return self.d + 1
+
+    @cached.prop
+    def d(self) -> int:
+        self.calls.append("d")
+        return 3
+
+    @cached.meth
+    def e(self, x: int) -> int:
+        return x
+
+    @cached.prop
+    def fail(self) -> int:
+        msg = "failed"
+        raise ValueError(msg)
+
+
+def test_warm_concurrent() -> None:
+    x = Example()
+    with ThreadPoolExecutor(2) as executor:
+        futures = cached.warm(x, "a", "b", executor=executor)
+        # the barrier is only passed if both are computed concurrently
+        assert {k: f.result(timeout=5) for k, f in futures.items()} == {"a": 1, "b": 2}
+    assert x._cache == {"a": 1, "b": 2}
+    assert (x.a, x.b()) == (1, 2)
+    assert sorted(x.calls) == ["a", "b"]
+
+    # already cached values are returned
+    futures = cached.warm(x, "a")
+    assert futures["a"].done()
+    assert futures["a"].result() == 1
+
+
+def test_warm_wait_in_flight() -> None:
+    x = Example()
+    with ThreadPoolExecutor(1) as executor:
+        futures = cached.warm(x, "a", executor=executor)
+        while not x.calls:
+            pass
+        # the property waits for the computation in flight
+        results: list[int] = []
+        thread = threading.Thread(target=lambda: results.append(x.a))
+        thread.start()
+        _ = x.barrier.wait()
+        thread.join(timeout=5)
+        assert futures["a"].result(timeout=5) == 1
+    assert results == [1]
+    assert x.calls == ["a"]
+
+
+def test_warm_claim_pending() -> None:
+    x = Example()
+    release = threading.Event()
+    with ThreadPoolExecutor(1) as executor:
+        # block the only worker, so the warm computations are pending
+        _ = executor.submit(release.wait, 5)
+        futures = cached.warm(x, "c", "d", executor=executor)
+        assert cached.warm(x, "c", executor=executor)["c"] is futures["c"]
+        # computed by the caller, including the dependency scheduled by warm
+        assert x.c == 4
+        assert futures["c"].result(timeout=0) == 4
+        assert futures["d"].result(timeout=0) == 3
+        release.set()
+    assert x.calls == ["c", "d"]
+
+
+def test_warm_errors() -> None:
+    x = Example()
+    future = cached.warm(x, "fail")["fail"]
+    with pytest.raises(ValueError, match="failed"):
+        _ = future.result(timeout=5)
+    assert "fail" not in x._cache
+
+    for name in ["e", "missing", "__init__"]:
+        with pytest.raises(ValueError, match="not a cached property"):
+            _ = cached.warm(x, name)
+
+
+class Picklable:
+    _cache: dict[str, Any]
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    @cached.prop(stats=True)
+    def square(self) -> int:
+        return self.value**2
+
+    @cached.meth(ttl=60)
+    def double(self) -> int:
+        return self.value * 2
+
+    @cached.meth(admit=lambda value: value > 100)
+    def triple(self) -> int:
+        return self.value * 3
+
+    @cached.prop(max_bytes=100)
+    def values(self) -> list[int]:
+        return list(range(self.value * 100))
+
+
+def test_warm_process_pool() -> None:
+    x = Picklable(3)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, mp_context=context) as executor:
+        futures = cached.warm(
+            x, "square", "double", "triple", "values", executor=executor
+        )
+        assert futures["square"].result(timeout=60) == 9
+        assert futures["double"].result(timeout=60) == 6
+        assert futures["triple"].result(timeout=60) == 9
+        assert len(futures["values"].result(timeout=60)) == 300
+    assert x._cache["square"] == 9
+    assert x.double() == 6
+    # results are stored subject to admission and size limits, as for calls
+    assert "triple" not in x._cache
+    assert "values" not in x._cache
+    assert cached.info(x)["square"].misses >= 1
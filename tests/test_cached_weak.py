@@ -0,0 +1,155 @@
+# mypy: disable-error-code="no-untyped-def, no-untyped-call"
+# pylint: disable=protected-access,missing-class-docstring
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import weakref
+from typing import Any
+
+import pytest
+
+from module_utilities import cached
+
+
+class Model:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Model) and other.name == self.name
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+
+class Example:
+    def __init__(self) -> None:
+        self._cache: dict[str, Any] = {}
+        self.calls = 0
+
+    @cached.meth(weak_args=True)
+    def evaluate(self, model: Model, n: int = 1) -> list[Any]:
+        self.calls += 1
+        return [model.name] * n
+
+    @cached.meth(weak_args=True)
+    def total(self, model: Model, values: list[int]) -> int:
+        self.calls += 1
+        return len(model.name) + sum(values)
+
+    @cached.meth(weak_args=True)
+    async def aevaluate(self, model: Model) -> str:
+        await asyncio.sleep(0)
+        self.calls += 1
+        return model.name
+
+
+def test_weak_args() -> None:
+    x = Example()
+    a, b = Model("a"), Model("b")
+
+    out = x.evaluate(a)
+    assert x.evaluate(a) is out
+    assert x.evaluate(Model("a"), n=1) is out
+    assert x.evaluate(b, 2) == ["b", "b"]
+    assert x.calls == 2
+    assert len(x._cache["evaluate"]) == 2
+
+    # arguments do not outlive the caller
+    del a
+    _ = gc.collect()
+    assert len(x._cache["evaluate"]) == 1
+    assert x.evaluate(b, 2) == ["b", "b"]
+    assert x.calls == 2
+
+    del b
+    _ = gc.collect()
+    assert len(x._cache["evaluate"]) == 0
+
+
+def test_weak_args_unhashable() -> None:
+    x = Example()
+    a = Model("abc")
+    assert x.total(a, [1, 2]) == x.total(a, [1, 2]) == 6
+    assert x.calls == 1
+
+    del a
+    _ = gc.collect()
+    assert len(x._cache["total"]) == 0
+
+
+@pytest.mark.parametrize("maxsize", [None, 10])
+def test_weak_args_no_cycle(maxsize: int | None) -> None:
+    class Tmp:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth(weak_args=True, maxsize=maxsize)
+        def evaluate(self, model: Model) -> str:
+            return model.name
+
+    x = Tmp()
+    a = Model("a")
+    assert x.evaluate(a) == "a"
+    store = weakref.ref(x._cache["evaluate"])
+
+    # freed by reference counting, without the cycle collector
+    gc.disable()
+    try:
+        del x
+        assert store() is None
+    finally:
+        gc.enable()
+    del a
+
+
+def test_weak_args_budget() -> None:
+    budget = cached.set_budget("1MB")
+    assert budget is not None
+    try:
+        x = Example()
+        a, b = Model("a"), Model("b")
+        _ = (x.evaluate(a), x.evaluate(b))
+        assert budget.info().entries == 2
+
+        del a
+        _ = gc.collect()
+        assert len(x._cache["evaluate"]) == 1
+        assert budget.info().entries == 1
+    finally:
+        _ = cached.set_budget(None)
+
+
+def test_weak_args_async() -> None:
+    x = Example()
+    a = Model("a")
+
+    async def main(model: Model) -> None:
+        first, second = await asyncio.gather(x.aevaluate(model), x.aevaluate(model))
+        assert first == second == "a"
+        assert await x.aevaluate(model) == "a"
+
+    asyncio.run(main(a))
+    assert x.calls == 1
+    del a
+    _ = gc.collect()
+    assert len(x._cache["aevaluate"]) == 0
+
+
+def test_weak_args_func() -> None:
+    @cached.func(weak_args=True)
+    def f(model: Model) -> str:
+        return model.name * 2
+
+    a = Model("a")
+    assert f(a) == "aa"
+    cache: dict[str, Any] = f.cache  # type: ignore[attr-defined]
+    assert len(cache["f"]) == 1
+    del a
+    _ = gc.collect()
+    assert len(cache["f"]) == 0
+
+    with pytest.raises(ValueError, match="weak_args"):
+        _ = cached.func(weak_args=True, backend={})
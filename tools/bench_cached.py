@@ -0,0 +1,321 @@
+"""
+Microbenchmarks for :mod:`module_utilities.cached`.
+
+Run from an environment with ``module_utilities`` installed::
+
+    python tools/bench_cached.py keys slots batch policy decorate
+"""
+# ruff:file-ignore[print, no-self-use]
+
+from __future__ import annotations
+
+import random
+import tracemalloc
+from argparse import ArgumentParser
+from functools import partial
+from inspect import signature
+from timeit import Timer
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from module_utilities import cached
+from module_utilities._cache_keys import (  # ruff:ignore[import-private-name]
+    bind_key_builder,
+    key_builder,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from typing import Literal
+
+
+def _time(func: Callable[[], Any], repeat: int = 5) -> float:
+    """Best time per call in nanoseconds."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def _report(rows: Sequence[tuple[str, float, float]], labels: tuple[str, str]) -> None:
+    print(f"{'case':<30} {labels[0]:>12} {labels[1]:>12} {'speedup':>8}")
+    for name, before, after in rows:
+        print(f"{name:<30} {before:>10.0f}ns {after:>10.0f}ns {before / after:>7.1f}x")
+
+
+def _make_class() -> type[Any]:
+    class Example:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth
+        def positional(self, x: int, y: int = 2) -> int:
+            return x + y
+
+        @cached.meth
+        def keyword(self, x: int, *, scale: float = 1.0) -> float:
+            return x * scale
+
+        @cached.meth
+        def variadic(self, /, *args: int, **kwargs: int) -> int:
+            return sum(args) + sum(kwargs.values())
+
+    return Example
+
+
+def bench_keys() -> None:
+    """Hit path of ``cached.meth`` with generated versus ``Signature.bind`` keys."""
+
+    def meth(self: Any, x: int, y: int = 2) -> None: ...
+
+    sig = signature(meth)
+    bind_make_key, fast_make_key = bind_key_builder(sig), key_builder(sig, "meth")
+    rows = [
+        (
+            "make_key(self, 1)",
+            _time(lambda: bind_make_key(None, 1)),
+            _time(lambda: fast_make_key(None, 1)),
+        )
+    ]
+
+    fast = _make_class()()
+    with patch.object(cached, "key_builder", lambda sig, _: bind_key_builder(sig)):
+        slow = _make_class()()
+        # key builders are created on first call
+        _ = (slow.positional(0), slow.keyword(0), slow.variadic())
+
+    def compare(name: str, call: Callable[[Any], Any]) -> None:
+        # warm the caches
+        call(slow)
+        call(fast)
+        rows.append((name, _time(lambda: call(slow)), _time(lambda: call(fast))))
+
+    compare("meth(1)", lambda x: x.positional(1))
+    compare("meth(1, y=3)", lambda x: x.positional(1, y=3))
+    compare("meth(1, scale=2.0)", lambda x: x.keyword(1, scale=2.0))
+    compare("meth(1, 2, a=3)", lambda x: x.variadic(1, 2, a=3))
+
+    _report(rows, ("bind", "generated"))
+
+
+def _slot_classes() -> dict[str, type[Any]]:
+    class Dict:
+        def __init__(self, x: float) -> None:
+            self._cache: dict[str, Any] = {}
+            self.x = x
+
+        @cached.prop
+        def a(self) -> float:
+            return self.x + 1
+
+        @cached.prop
+        def b(self) -> float:
+            return self.x + 2
+
+    class DictSlots:
+        __slots__ = ("_cache", "x")
+
+        def __init__(self, x: float) -> None:
+            self._cache: dict[str, Any] = {}
+            self.x = x
+
+        @cached.prop
+        def a(self) -> float:
+            return self.x + 1
+
+        @cached.prop
+        def b(self) -> float:
+            return self.x + 2
+
+    class Slots:
+        __slots__ = ("_cached_a", "_cached_b", "x")
+
+        def __init__(self, x: float) -> None:
+            self.x = x
+
+        @cached.slot_prop
+        def a(self) -> float:
+            return self.x + 1
+
+        @cached.slot_prop
+        def b(self) -> float:
+            return self.x + 2
+
+    return {"dict": Dict, "dict (__slots__)": DictSlots, "slot_prop": Slots}
+
+
+def _bytes_per_instance(cls: type[Any], n: int = 100_000) -> float:
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    objs = [cls(float(i)) for i in range(n)]
+    for obj in objs:
+        _ = (obj.a, obj.b)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (end - start) / n
+
+
+def _construct_and_get(cls: type[Any]) -> Any:
+    return cls(1.0).a
+
+
+def bench_slots() -> None:
+    """Cached property hit latency and memory with ``_cache`` versus slots."""
+    print(f"{'class':<20} {'hit':>10} {'miss':>10} {'bytes/instance':>15}")
+    for name, cls in _slot_classes().items():
+        obj = cls(1.0)
+        _ = obj.a
+        hit = _time(partial(getattr, obj, "a"))
+        # includes construction of instance
+        miss = _time(partial(_construct_and_get, cls))
+        print(
+            f"{name:<20} {hit:>8.0f}ns {miss:>8.0f}ns {_bytes_per_instance(cls):>15.0f}"
+        )
+
+
+def _batch_class(numpy: Any) -> type[Any]:
+    class Example:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth
+        def scalar(self, t: float) -> float:
+            return float(numpy.exp(-1.0 / t))
+
+        @cached.batch_meth
+        def vector(self, t: Any) -> Any:
+            return numpy.exp(-1.0 / t)
+
+    return Example
+
+
+def _batch_scalar(cls: type[Any], values: Any) -> Any:
+    obj = cls()
+    _ = [obj.scalar(t) for t in values[::2].tolist()]
+    return [obj.scalar(t) for t in values.tolist()]
+
+
+def _batch_vector(cls: type[Any], values: Any) -> Any:
+    obj = cls()
+    _ = obj.vector(values[::2])
+    return obj.vector(values)
+
+
+def bench_batch() -> None:
+    """Per element ``meth`` calls versus ``batch_meth`` with half of values cached."""
+    import numpy as np
+
+    cls = _batch_class(np)
+    rows = [
+        (
+            f"{n} values",
+            _time(partial(_batch_scalar, cls, values)),
+            _time(partial(_batch_vector, cls, values)),
+        )
+        for n in (10, 1_000, 100_000)
+        for values in [np.linspace(1.0, 2.0, n)]
+    ]
+    _report(rows, ("meth", "batch_meth"))
+
+
+def _zipf_trace(n: int, keys: int, rng: random.Random) -> list[int]:
+    weights = [1.0 / (k + 1) for k in range(keys)]
+    return rng.choices(range(keys), weights=weights, k=n)
+
+
+def _scan_trace(n: int, keys: int, rng: random.Random, block: int = 500) -> list[int]:
+    """Zipf keys interleaved with blocks of keys used once (negative)."""
+    zipf = iter(_zipf_trace(n // 2, keys, rng))
+    out: list[int] = []
+    unique = 0
+    while len(out) < n:
+        for _ in range(block):
+            unique -= 1
+            out.append(unique)
+        out.extend(next(zipf) for _ in range(block))
+    return out[:n]
+
+
+def _hit_rate(
+    policy: Literal["lru", "tinylfu"], trace: Sequence[int], maxsize: int
+) -> float:
+    class Example:
+        def __init__(self) -> None:
+            self._cache: dict[str, Any] = {}
+
+        @cached.meth(maxsize=maxsize, policy=policy, stats=True)
+        def get(self, key: int) -> int:
+            return key
+
+    obj = Example()
+    for key in trace:
+        _ = obj.get(key)
+    info = cached.info(obj)["get"]
+    return info.hits / (info.hits + info.misses)
+
+
+def bench_policy() -> None:
+    """Hit rate of ``cached.meth(maxsize=100)`` eviction policies on synthetic traces."""
+    rng = random.Random(42)  # ruff:ignore[suspicious-non-cryptographic-random-usage]
+    n, keys, maxsize = 200_000, 10_000, 100
+    traces = {
+        "zipf": _zipf_trace(n, keys, rng),
+        "zipf + scans (50%)": _scan_trace(n, keys, rng),
+    }
+    policies: tuple[Literal["lru", "tinylfu"], ...] = ("lru", "tinylfu")
+    print(f"{'trace':<30}" + "".join(f"{policy:>10}" for policy in policies))
+    for name, trace in traces.items():
+        rates = [_hit_rate(policy, trace, maxsize) for policy in policies]
+        print(f"{name:<30}" + "".join(f"{rate:>10.3f}" for rate in rates))
+
+
+def bench_decorate() -> None:
+    """Cost of applying ``cached.meth``, with eager versus first call signature analysis."""
+
+    def no_args(self: Any) -> None: ...
+
+    def args(self: Any, x: int, y: int = 2) -> None: ...
+
+    def eager(func: Any) -> None:
+        # signature analysis previously done when decorating
+        sig = signature(func)
+        if len(sig.parameters) > 1:
+            _ = key_builder(sig, func.__name__)
+        _ = cached.meth(func)
+
+    def lazy(func: Any) -> None:
+        _ = cached.meth(func)
+
+    funcs: dict[str, Any] = {"self": no_args, "self, x, y=2": args}
+    rows = [
+        (f"meth({name})", _time(partial(eager, func)), _time(partial(lazy, func)))
+        for name, func in funcs.items()
+    ]
+    _report(rows, ("eager", "lazy"))
+
+
+BENCHMARKS: dict[str, Callable[[], None]] = {
+    "keys": bench_keys,
+    "slots": bench_slots,
+    "batch": bench_batch,
+    "policy": bench_policy,
+    "decorate": bench_decorate,
+}
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """Run benchmarks."""
+    parser = ArgumentParser(description=__doc__)
+    _ = parser.add_argument(
+        "names", nargs="*", help=f"Benchmarks to run.  Options {list(BENCHMARKS)}"
+    )
+    options = parser.parse_args(args)
+    if unknown := set(options.names).difference(BENCHMARKS):
+        parser.error(f"Unknown benchmarks {sorted(unknown)}")
+    for name in options.names or BENCHMARKS:
+        print(f"# {name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == "__main__":
+    main()